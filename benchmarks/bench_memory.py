@@ -0,0 +1,96 @@
+"""
+Memory used per result object, measured with tracemalloc.
+
+    python benchmarks/bench_memory.py --parts 2000 --vendors 30
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pypartpicker.types import Part, Price, Rating, Review, User, Vendor
+
+
+def make_price(i: int) -> Price:
+    return Price(
+        base=100.0 + i,
+        discounts=0.0,
+        shipping=0.0,
+        tax=float(i),
+        total=100.0 + i * 2,
+        currency="$",
+    )
+
+
+def make_vendor(i: int) -> Vendor:
+    return Vendor(
+        name=f"Vendor {i}",
+        logo_url=f"https://cdna.pcpartpicker.com/static/forever/images/merchant/{i}.svg",
+        in_stock=i % 3 != 0,
+        price=make_price(i),
+        buy_url=f"/mr/vendor/{i:06d}",
+    )
+
+
+def make_review(i: int) -> Review:
+    return Review(
+        author=User(
+            f"user{i}",
+            f"https://cdn/avatar{i}.png",
+            f"https://pcpartpicker.com/user/user{i}",
+        ),
+        points=i,
+        stars=5,
+        created_at="1 month ago",
+        content="Works great.",
+    )
+
+
+def make_part(i: int, vendors: int, reviews: int) -> Part:
+    vendor_list = [make_vendor(v) for v in range(vendors)]
+    return Part(
+        name=f"Part {i}",
+        type="Memory",
+        image_urls=[f"https://cdn/{i}.1600.jpg"],
+        url=f"https://pcpartpicker.com/product/{i:06d}",
+        cheapest_price=vendor_list[0].price if vendors > 0 else None,
+        in_stock=vendors > 0,
+        vendors=vendor_list,
+        rating=Rating(4.5, 10, 4.5),
+        specs={"Speed": "DDR5-6000", "Modules": "2 x 16GB"},
+        reviews=[make_review(r) for r in range(reviews)],
+    )
+
+
+def measure(build, count: int) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    objects = [build(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # The list holding the objects isn't part of their cost
+    return (after - before - sys.getsizeof(objects)) / count
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    arg_parser.add_argument("--parts", type=int, default=2000)
+    arg_parser.add_argument("--vendors", type=int, default=30)
+    arg_parser.add_argument("--reviews", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    count = args.parts * args.vendors
+    print(f"Price   {measure(make_price, count):>10.1f} bytes")
+    print(f"Vendor  {measure(make_vendor, count):>10.1f} bytes (including its Price)")
+    print(
+        f"Part    {measure(lambda i: make_part(i, args.vendors, args.reviews), args.parts):>10.1f} bytes "
+        f"({args.vendors} vendors, {args.reviews} reviews)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Parser benchmarks over recorded PCPartPicker pages.
+
+Fixtures live in benchmarks/fixtures, described by fixtures/index.json which maps
+each HTML file to the page kind and the URL it was recorded from. The committed pages
+are synthetic, built to match the markup of each page kind: product-0.html is the
+large page (40 vendors, 30 reviews) and product-1.html a small one with no rating.
+Record real ones with:
+
+    python benchmarks/bench_parsers.py record product https://pcpartpicker.com/product/fN88TW
+
+Run the suite and compare against the stored baseline. It exits non-zero on a
+regression, and when the fixtures or a page's baseline are missing:
+
+    python benchmarks/bench_parsers.py run
+    python benchmarks/bench_parsers.py run --update-baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from requests_html import HTML, HTMLSession
+from pypartpicker.parsers import PARSERS
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+INDEX_PATH = os.path.join(FIXTURES_DIR, "index.json")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+PARSE_METHODS = {
+    "product": "parse_part",
+    "part_list": "parse_part_list",
+    "search": "parse_part_search",
+    "reviews": "parse_reviews",
+    "parts": "parse_parts",
+}
+
+
+class FixtureResponse:
+    def __init__(self, url: str, raw: bytes):
+        self.url = url
+        self.content = raw
+        self.html = HTML(url=url, html=raw)
+
+
+def load_index() -> dict:
+    if not os.path.exists(INDEX_PATH):
+        return {}
+    with open(INDEX_PATH) as f:
+        return json.load(f)
+
+
+def record(kind: str, url: str, name: str = None):
+    if kind not in PARSE_METHODS:
+        raise ValueError(f"Invalid page kind: {kind}")
+
+    res = HTMLSession().get(url)
+    res.raise_for_status()
+
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    index = load_index()
+    name = (
+        name or f"{kind}-{len([v for v in index.values() if v['kind'] == kind])}.html"
+    )
+    with open(os.path.join(FIXTURES_DIR, name), "wb") as f:
+        f.write(res.content)
+
+    index[name] = {"kind": kind, "url": res.url}
+    with open(INDEX_PATH, "w") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+
+    print(f"Recorded {url} to {name}")
+
+
+def bench_page(parser: str, kind: str, url: str, raw: bytes, rounds: int) -> dict:
+    scraper = PARSERS[parser]()
+    parse = getattr(scraper, PARSE_METHODS[kind])
+
+    # Warm up once, then time fresh responses so no parsed tree is reused between rounds
+    parse(FixtureResponse(url, raw))
+
+    timings = []
+    for _ in range(rounds):
+        res = FixtureResponse(url, raw)
+        start = time.perf_counter()
+        parse(res)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(FixtureResponse(url, raw))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "pages_per_sec": 1 / statistics.mean(timings),
+        "peak_kib": peak / 1024,
+    }
+
+
+def run(parsers: list[str], rounds: int) -> dict:
+    index = load_index()
+    if len(index) == 0:
+        raise SystemExit(
+            f"No fixtures found in {FIXTURES_DIR}, record some with the record command."
+        )
+
+    results = {}
+    for name, fixture in sorted(index.items()):
+        with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+            raw = f.read()
+
+        for parser in parsers:
+            key = f"{parser}:{name}"
+            results[key] = bench_page(
+                parser, fixture["kind"], fixture["url"], raw, rounds
+            )
+            r = results[key]
+            print(
+                f"{key:<50} {r['median_ms']:>9.2f} ms {r['pages_per_sec']:>9.1f} pages/s {r['peak_kib']:>10.1f} KiB peak"
+            )
+
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            regressions.append(f"{key}: no baseline, run with --update-baseline")
+            continue
+
+        for metric in ("median_ms", "peak_kib"):
+            limit = baseline[key][metric] * (1 + tolerance)
+            if result[metric] > limit:
+                regressions.append(
+                    f"{key} {metric}: {result[metric]:.2f} > {baseline[key][metric]:.2f} (+{tolerance:.0%})"
+                )
+
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    record_cmd = commands.add_parser("record", help="Record a page as a fixture.")
+    record_cmd.add_argument("kind", choices=PARSE_METHODS)
+    record_cmd.add_argument("url")
+    record_cmd.add_argument("--name")
+
+    run_cmd = commands.add_parser("run", help="Benchmark the parsers.")
+    run_cmd.add_argument(
+        "--parser", action="append", choices=PARSERS, help="Defaults to all parsers."
+    )
+    run_cmd.add_argument("--rounds", type=int, default=20)
+    run_cmd.add_argument("--tolerance", type=float, default=0.25)
+    run_cmd.add_argument("--update-baseline", action="store_true")
+
+    args = arg_parser.parse_args()
+
+    if args.command == "record":
+        record(args.kind, args.url, args.name)
+        return
+
+    results = run(args.parser or list(PARSERS), args.rounds)
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {BASELINE_PATH}")
+        return
+
+    if not os.path.exists(BASELINE_PATH):
+        raise SystemExit(
+            f"No baseline found at {BASELINE_PATH}, run with --update-baseline to create one."
+        )
+
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if len(regressions) > 0:
+        print("\nRegressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+    print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
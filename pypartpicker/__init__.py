@@ -1,6 +1,32 @@
 from .types import *
 from .client import *
 from .urls import *
+from .errors import (
+    CloudflareException,
+    RateLimitException,
+    CircuitOpenException,
+    ServerErrorException,
+)
+from .cache import ResponseCache
+from .ratelimit import RateLimiter
+from .renderer import Renderer
+from .clearance import ClearanceStore
+from .events import Event, MetricsCollector
+from .retry import RetryPolicy, RetryRule, CircuitBreaker
+from .crawler import CatalogCheckpoint
+from .catalog import PartCatalog
+from .search import SearchIndex
+from .history import PriceHistory
+from .fingerprint import ParseCache
+from .replay import (
+    Archive,
+    RecordingAdapter,
+    ReplayAdapter,
+    ReplayRetriever,
+    AsyncReplayRetriever,
+    ReplayServer,
+)
+from .serialization import dumps, loads, ResultWriter, ResultReader
 
 
 class Scraper:
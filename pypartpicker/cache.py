@@ -0,0 +1,305 @@
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+from .urls import *
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+ENDPOINT_PRODUCT = "product"
+ENDPOINT_PART_LIST = "part_list"
+ENDPOINT_SEARCH = "search"
+ENDPOINT_REVIEWS = "reviews"
+ENDPOINT_PRODUCTS = "products"
+ENDPOINT_OTHER = "other"
+
+DEFAULT_TTLS = {
+    ENDPOINT_PRODUCT: 60 * 60,
+    ENDPOINT_PART_LIST: 10 * 60,
+    ENDPOINT_SEARCH: 30 * 60,
+    ENDPOINT_REVIEWS: 6 * 60 * 60,
+    ENDPOINT_PRODUCTS: 30 * 60,
+    ENDPOINT_OTHER: 10 * 60,
+}
+
+
+def get_endpoint(url: str) -> str:
+    path = urllib.parse.urlparse(url).path
+
+    if PART_REVIEWS_PATH in path:
+        return ENDPOINT_REVIEWS
+    if path.startswith(PRODUCT_PATH):
+        return ENDPOINT_PRODUCT
+    if path.startswith(PART_LIST_PATH):
+        return ENDPOINT_PART_LIST
+    if path.startswith(SEARCH_PATH):
+        return ENDPOINT_SEARCH
+    if path.startswith(PRODUCTS_PATH):
+        return ENDPOINT_PRODUCTS
+    return ENDPOINT_OTHER
+
+
+class CachedResponse:
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: dict[str, str],
+        content: bytes,
+        expires_at: float,
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def validators(self) -> dict[str, str]:
+        headers = {}
+        for key, value in self.headers.items():
+            match key.lower():
+                case "etag":
+                    headers["If-None-Match"] = value
+                case "last-modified":
+                    headers["If-Modified-Since"] = value
+        return headers
+
+    def __repr__(self):
+        return f"<CachedResponse url={self.url} fresh={self.fresh}>"
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttls: Optional[dict[str, float]] = None,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+    ):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.__bytes = 0
+
+        self.__db = None
+        self.__disk_bytes = 0
+        # Reads of stored rows, written with the next write rather than committing on every read
+        self.__accessed: dict[str, float] = {}
+        if path is not None:
+            self.__db = sqlite3.connect(path, check_same_thread=False)
+            self.__db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    status_code INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """
+            )
+            self.__db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+            )
+            self.__db.commit()
+            self.__disk_bytes = self.__db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+
+    def get_ttl(self, url: str) -> float:
+        return self.ttls[get_endpoint(url)]
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        # Returns stale entries too so they can be revalidated with a conditional request
+        with self.__lock:
+            entry = self.__entries.get(url)
+            if entry is not None:
+                self.__entries.move_to_end(url)
+                return entry
+
+            if self.__db is None:
+                return None
+
+            row = self.__db.execute(
+                "SELECT status_code, headers, content, expires_at FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self.__accessed[url] = time.time()
+            entry = CachedResponse(url, row[0], json.loads(row[1]), row[2], row[3])
+            self.__remember(entry)
+            return entry
+
+    def set(
+        self, url: str, status_code: int, headers: dict[str, str], content: bytes
+    ) -> CachedResponse:
+        entry = CachedResponse(
+            url, status_code, dict(headers), content, time.time() + self.get_ttl(url)
+        )
+
+        with self.__lock:
+            self.__forget(url)
+            self.__remember(entry)
+            self.__persist(entry)
+
+        return entry
+
+    async def aget(self, url: str) -> Optional[CachedResponse]:
+        return await self.__arun(self.get, url)
+
+    async def aset(
+        self, url: str, status_code: int, headers: dict[str, str], content: bytes
+    ) -> CachedResponse:
+        return await self.__arun(self.set, url, status_code, headers, content)
+
+    def refresh(self, url: str) -> Optional[CachedResponse]:
+        # Called after a 304 Not Modified, the stored body is still valid for another TTL
+        with self.__lock:
+            entry = self.__entries.get(url)
+            if entry is None:
+                return None
+
+            entry.expires_at = time.time() + self.get_ttl(url)
+            if self.__db is not None:
+                self.__accessed.pop(url, None)
+                self.__db.execute(
+                    "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE url = ?",
+                    (entry.expires_at, time.time(), url),
+                )
+                self.__db.commit()
+
+            return entry
+
+    async def arefresh(self, url: str) -> Optional[CachedResponse]:
+        return await self.__arun(self.refresh, url)
+
+    def invalidate(self, url: str):
+        with self.__lock:
+            self.__forget(url)
+            if self.__db is not None:
+                self.__delete_rows([url])
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__bytes = 0
+            self.__accessed.clear()
+            if self.__db is not None:
+                self.__db.execute("DELETE FROM responses")
+                self.__db.commit()
+                self.__disk_bytes = 0
+
+    def close(self):
+        with self.__lock:
+            if self.__db is not None:
+                self.__write_accessed()
+                self.__db.commit()
+                self.__db.close()
+                self.__db = None
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    async def __arun(self, method: Callable, *args) -> Any:
+        if self.__db is None:
+            return method(*args)
+
+        # SQLite reads and writes would block the event loop, so a disk backed cache is used from a thread
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+    def __remember(self, entry: CachedResponse):
+        if entry.size > self.max_bytes:
+            return
+
+        self.__entries[entry.url] = entry
+        self.__bytes += entry.size
+
+        while len(self.__entries) > self.max_entries or self.__bytes > self.max_bytes:
+            _, evicted = self.__entries.popitem(last=False)
+            self.__bytes -= evicted.size
+
+    def __forget(self, url: str):
+        entry = self.__entries.pop(url, None)
+        if entry is not None:
+            self.__bytes -= entry.size
+
+    def __persist(self, entry: CachedResponse):
+        if self.__db is None:
+            return
+
+        row = self.__db.execute(
+            "SELECT size FROM responses WHERE url = ?", (entry.url,)
+        ).fetchone()
+        if row is not None:
+            self.__disk_bytes -= row[0]
+
+        # Eviction goes by accessed_at, so pending reads are written first
+        self.__write_accessed()
+        self.__db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                entry.url,
+                entry.status_code,
+                json.dumps(entry.headers),
+                entry.content,
+                entry.expires_at,
+                time.time(),
+                entry.size,
+            ),
+        )
+        self.__disk_bytes += entry.size
+
+        # Evict least recently accessed rows until the store fits again, and no more than that
+        excess = self.__disk_bytes - self.max_disk_bytes
+        if excess > 0:
+            urls = []
+            for url, size in self.__db.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at"
+            ):
+                if excess <= 0:
+                    break
+                urls.append(url)
+                excess -= size
+            for i in range(0, len(urls), 64):
+                self.__delete_rows(urls[i : i + 64])
+
+        self.__db.commit()
+
+    def __write_accessed(self):
+        if len(self.__accessed) == 0:
+            return
+
+        self.__db.executemany(
+            "UPDATE responses SET accessed_at = ? WHERE url = ?",
+            [(accessed_at, url) for url, accessed_at in self.__accessed.items()],
+        )
+        self.__accessed.clear()
+
+    def __delete_rows(self, urls: list[str]):
+        placeholders = ", ".join("?" * len(urls))
+        freed = self.__db.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM responses WHERE url IN ({placeholders})",
+            urls,
+        ).fetchone()[0]
+        self.__db.execute(f"DELETE FROM responses WHERE url IN ({placeholders})", urls)
+        self.__db.commit()
+        self.__disk_bytes -= freed
@@ -0,0 +1,364 @@
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterable, Iterator, Optional, Union
+from itertools import chain
+from operator import ge, gt, itemgetter, le, lt
+from .types import Part
+import json
+import re
+import sqlite3
+import threading
+
+NUMBER_RE = re.compile(r"\d+(?:,\d{3})*(?:\.\d+)?")
+
+OPERATORS = ("==", ">", ">=", "<", "<=")
+COMPARISONS = {
+    ">": gt,
+    ">=": ge,
+    "<": lt,
+    "<=": le,
+}
+
+SpecCondition = Union[str, tuple[str, str]]
+
+
+def spec_terms(value: str) -> list[str]:
+    # Specs with several values, such as supported memory types, have one value per line
+    return [line.strip().casefold() for line in value.split("\n") if line.strip()]
+
+
+def spec_key(term: str) -> tuple[str, tuple[float, ...]]:
+    # "ddr5-6000" becomes ("ddr#-#", (5.0, 6000.0)), so values with the same shape can compare by their numbers
+    numbers = tuple(
+        float(number.replace(",", "")) for number in NUMBER_RE.findall(term)
+    )
+    return NUMBER_RE.sub("#", term), numbers
+
+
+def part_key(part: Part) -> str:
+    return part.name if part.url is None else part.url
+
+
+def part_price(part: Part) -> Optional[float]:
+    if part.cheapest_price is None:
+        return None
+    return part.cheapest_price.total
+
+
+def discard(index: dict, index_key, key: str):
+    keys = index.get(index_key)
+    if keys is not None:
+        keys.discard(key)
+        if len(keys) == 0:
+            del index[index_key]
+
+
+class PartCatalog:
+    def __init__(self, path: Optional[str] = None):
+        self.__lock = threading.Lock()
+        self.__parts: dict[str, Part] = {}
+        self.__types: dict[str, set[str]] = {}
+        self.__terms: dict[tuple[str, str], set[str]] = {}
+        self.__ranges: dict[tuple[str, str], dict[str, list[tuple[float, ...]]]] = {}
+        self.__prices: dict[str, dict[str, float]] = {}
+        # Sort keys putting query results cheapest first, with unpriced parts at the end
+        self.__order: dict[str, tuple[bool, float, str]] = {}
+
+        # Sorted views of the range and price indexes, rebuilt on the first query after they change
+        self.__sorted_ranges: dict[tuple[str, str], list] = {}
+        self.__sorted_prices: dict[str, list] = {}
+
+        self.__db = None
+        if path is not None:
+            self.__db = sqlite3.connect(path, check_same_thread=False)
+            self.__db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS parts (
+                    key TEXT PRIMARY KEY,
+                    data TEXT NOT NULL
+                )
+                """
+            )
+            self.__db.commit()
+
+            for (data,) in self.__db.execute("SELECT data FROM parts"):
+                self.__index(Part.from_dict(json.loads(data)))
+
+    def add(self, part: Part):
+        self.add_all([part])
+
+    def add_all(self, parts: Iterable[Part]) -> int:
+        with self.__lock:
+            rows = []
+            for part in parts:
+                self.__index(part)
+                rows.append((part_key(part), json.dumps(part.to_dict())))
+
+            if self.__db is not None and len(rows) > 0:
+                self.__db.executemany(
+                    "INSERT OR REPLACE INTO parts VALUES (?, ?)", rows
+                )
+                self.__db.commit()
+
+            return len(rows)
+
+    def get(self, key: str) -> Optional[Part]:
+        return self.__parts.get(key)
+
+    def remove(self, key: str):
+        with self.__lock:
+            self.__unindex(key)
+            if self.__db is not None:
+                self.__db.execute("DELETE FROM parts WHERE key = ?", (key,))
+                self.__db.commit()
+
+    def clear(self):
+        with self.__lock:
+            self.__parts.clear()
+            self.__types.clear()
+            self.__terms.clear()
+            self.__ranges.clear()
+            self.__prices.clear()
+            self.__order.clear()
+            self.__sorted_ranges.clear()
+            self.__sorted_prices.clear()
+            if self.__db is not None:
+                self.__db.execute("DELETE FROM parts")
+                self.__db.commit()
+
+    def close(self):
+        if self.__db is not None:
+            self.__db.close()
+            self.__db = None
+
+    def query(
+        self,
+        type: Optional[str] = None,
+        specs: Optional[dict[str, SpecCondition]] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        limit: Optional[int] = None,
+    ) -> list[Part]:
+        with self.__lock:
+            filters = []
+            if type is not None:
+                keys = self.__types.get(type, set())
+                filters.append((len(keys), keys, None))
+            if min_price is not None or max_price is not None:
+                filters.append(self.__price_filter(type, min_price, max_price))
+            for name, condition in (specs or {}).items():
+                filters.append(self.__spec_filter(name, condition))
+
+            if len(filters) == 0:
+                keys = list(self.__parts)
+            else:
+                # Start from the most selective filter so the candidates only shrink from there
+                filters.sort(key=lambda filter: filter[0])
+                keys = set(filters[0][1])
+                for size, filter_keys, matches in filters[1:]:
+                    if len(keys) == 0:
+                        break
+                    # Checking a handful of candidates directly beats collecting a large range of keys
+                    if matches is not None and len(keys) * 8 < size:
+                        keys = {key for key in keys if matches(key)}
+                    else:
+                        keys.intersection_update(filter_keys)
+
+            keys = sorted(keys, key=self.__order.__getitem__)
+            parts = [self.__parts[key] for key in keys]
+
+        if in_stock is not None:
+            parts = [part for part in parts if part.in_stock == in_stock]
+
+        return parts if limit is None else parts[:limit]
+
+    def types(self) -> list[str]:
+        # Search results can't always tell a part's type
+        return sorted(type for type in self.__types if type is not None)
+
+    def __len__(self) -> int:
+        return len(self.__parts)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__parts
+
+    def __iter__(self) -> Iterator[Part]:
+        return iter(list(self.__parts.values()))
+
+    def __repr__(self):
+        return f"<PartCatalog parts={len(self.__parts)}>"
+
+    def __index(self, part: Part):
+        key = part_key(part)
+        self.__unindex(key)
+
+        self.__parts[key] = part
+        self.__types.setdefault(part.type, set()).add(key)
+
+        price = part_price(part)
+        self.__order[key] = (price is None, price or 0, key)
+        if price is not None:
+            self.__prices.setdefault(part.type, {})[key] = price
+            self.__sorted_prices.pop(part.type, None)
+
+        for name, value in (part.specs or {}).items():
+            for term in spec_terms(value):
+                self.__terms.setdefault((name, term), set()).add(key)
+
+                shape, numbers = spec_key(term)
+                if len(numbers) > 0:
+                    self.__ranges.setdefault((name, shape), {}).setdefault(
+                        key, []
+                    ).append(numbers)
+                    self.__sorted_ranges.pop((name, shape), None)
+
+    def __unindex(self, key: str):
+        part = self.__parts.pop(key, None)
+        if part is None:
+            return
+
+        discard(self.__types, part.type, key)
+        del self.__order[key]
+
+        prices = self.__prices.get(part.type)
+        if prices is not None and prices.pop(key, None) is not None:
+            self.__sorted_prices.pop(part.type, None)
+            if len(prices) == 0:
+                del self.__prices[part.type]
+
+        for name, value in (part.specs or {}).items():
+            for term in spec_terms(value):
+                discard(self.__terms, (name, term), key)
+
+                shape, numbers = spec_key(term)
+                ranges = self.__ranges.get((name, shape))
+                if ranges is not None and ranges.pop(key, None) is not None:
+                    self.__sorted_ranges.pop((name, shape), None)
+                    if len(ranges) == 0:
+                        del self.__ranges[(name, shape)]
+
+    def __price_filter(
+        self,
+        type: Optional[str],
+        min_price: Optional[float],
+        max_price: Optional[float],
+    ) -> tuple[int, Iterable[str], Optional[Callable[[str], bool]]]:
+        slices = []
+        for part_type in self.__prices if type is None else [type]:
+            prices = self.__sorted_prices.get(part_type)
+            if prices is None:
+                prices = self.__sorted_prices[part_type] = sorted(
+                    (price, key)
+                    for key, price in self.__prices.get(part_type, {}).items()
+                )
+
+            start = (
+                0
+                if min_price is None
+                else bisect_left(prices, min_price, key=lambda entry: entry[0])
+            )
+            end = (
+                len(prices)
+                if max_price is None
+                else bisect_right(prices, max_price, key=lambda entry: entry[0])
+            )
+            slices.append((prices, start, end))
+
+        def matches(key: str) -> bool:
+            price = part_price(self.__parts[key])
+            return (
+                price is not None
+                and (min_price is None or price >= min_price)
+                and (max_price is None or price <= max_price)
+            )
+
+        return (
+            sum(end - start for _, start, end in slices),
+            chain.from_iterable(
+                map(itemgetter(1), prices[start:end]) for prices, start, end in slices
+            ),
+            matches,
+        )
+
+    def __spec_filter(
+        self, name: str, condition: SpecCondition
+    ) -> tuple[int, Iterable[str], Optional[Callable[[str], bool]]]:
+        if isinstance(condition, str):
+            condition = ("==", condition)
+
+        operator, value = condition
+        if operator not in OPERATORS:
+            raise ValueError(
+                f"Invalid operator: {operator}, must be one of {', '.join(OPERATORS)}."
+            )
+
+        term = value.strip().casefold()
+        if operator == "==":
+            keys = self.__terms.get((name, term), set())
+            return len(keys), keys, None
+
+        shape, numbers = spec_key(term)
+        if len(numbers) == 0:
+            raise ValueError(f"Cannot compare {name} with {value}, it has no numbers.")
+
+        # Leading numbers have to match and the last one is compared, so DDR5-5600 is below DDR5-6000 but DDR4-3600 is neither
+        count = len(numbers)
+        prefix = numbers[:-1]
+        compare = COMPARISONS[operator]
+        prefix_key = lambda entry: entry[0][: count - 1]
+        index_key = lambda entry: entry[0][:count]
+
+        # Values compare against the query when their shape starts with its shape, so "32 GB" matches "32 GB (2 x 16 GB)"
+        shapes = []
+        slices = []
+        for (spec_name, spec_shape), ranges in self.__ranges.items():
+            if spec_name != name or not spec_shape.startswith(shape):
+                continue
+            shapes.append(ranges)
+
+            entries = self.__sorted_ranges.get((spec_name, spec_shape))
+            if entries is None:
+                entries = self.__sorted_ranges[(spec_name, spec_shape)] = sorted(
+                    (key_numbers, key)
+                    for key, all_numbers in ranges.items()
+                    for key_numbers in all_numbers
+                )
+
+            # Values sharing the query's leading numbers sit next to each other, sorted by the number after them
+            first = bisect_left(entries, prefix, key=prefix_key)
+            last = bisect_right(entries, prefix, key=prefix_key)
+            if operator == ">=":
+                start, end = (
+                    bisect_left(entries, numbers, first, last, key=index_key),
+                    last,
+                )
+            elif operator == ">":
+                start, end = (
+                    bisect_right(entries, numbers, first, last, key=index_key),
+                    last,
+                )
+            elif operator == "<=":
+                start, end = first, bisect_right(
+                    entries, numbers, first, last, key=index_key
+                )
+            else:
+                start, end = first, bisect_left(
+                    entries, numbers, first, last, key=index_key
+                )
+            slices.append((entries, start, end))
+
+        def matches(key: str) -> bool:
+            return any(
+                key_numbers[: count - 1] == prefix
+                and compare(key_numbers[count - 1], numbers[-1])
+                for ranges in shapes
+                for key_numbers in ranges.get(key, ())
+            )
+
+        return (
+            sum(end - start for _, start, end in slices),
+            chain.from_iterable(
+                map(itemgetter(1), entries[start:end]) for entries, start, end in slices
+            ),
+            matches,
+        )
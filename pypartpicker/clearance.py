@@ -0,0 +1,149 @@
+from typing import Optional
+import json
+import sqlite3
+import threading
+import time
+
+CLEARANCE_COOKIE = "cf_clearance"
+
+
+class Clearance:
+    def __init__(
+        self, host: str, cookies: dict[str, str], user_agent: str, expires_at: float
+    ):
+        self.host = host
+        self.cookies = cookies
+        self.user_agent = user_agent
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def __repr__(self):
+        return f"<Clearance host={self.host} fresh={self.fresh}>"
+
+
+class ClearanceStore:
+    def __init__(self, path: Optional[str] = None, default_ttl: float = 30 * 60):
+        self.default_ttl = default_ttl
+
+        self.__lock = threading.Lock()
+        self.__clearances: dict[str, Clearance] = {}
+        # Hosts known to have no stored clearance, so requests to them don't query the file every time
+        self.__missing: set[str] = set()
+
+        self.__db = None
+        if path is not None:
+            self.__db = sqlite3.connect(path, check_same_thread=False)
+            self.__db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS clearances (
+                    host TEXT PRIMARY KEY,
+                    cookies TEXT NOT NULL,
+                    user_agent TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            self.__db.commit()
+
+    def get(self, host: str) -> Optional[Clearance]:
+        with self.__lock:
+            clearance = self.__clearances.get(host)
+            if (
+                clearance is None
+                and self.__db is not None
+                and host not in self.__missing
+            ):
+                row = self.__db.execute(
+                    "SELECT cookies, user_agent, expires_at FROM clearances WHERE host = ?",
+                    (host,),
+                ).fetchone()
+                if row is None:
+                    self.__missing.add(host)
+                else:
+                    clearance = Clearance(host, json.loads(row[0]), row[1], row[2])
+                    self.__clearances[host] = clearance
+
+            if clearance is None:
+                return None
+
+            if not clearance.fresh:
+                self.__forget(host)
+                return None
+
+            return clearance
+
+    def set(
+        self,
+        host: str,
+        cookies: dict[str, str],
+        user_agent: str,
+        expires_at: Optional[float] = None,
+    ) -> Clearance:
+        if expires_at is None:
+            expires_at = time.time() + self.default_ttl
+
+        clearance = Clearance(host, dict(cookies), user_agent, expires_at)
+
+        with self.__lock:
+            self.__clearances[host] = clearance
+            self.__missing.discard(host)
+            if self.__db is not None:
+                self.__db.execute(
+                    "INSERT OR REPLACE INTO clearances VALUES (?, ?, ?, ?)",
+                    (host, json.dumps(clearance.cookies), user_agent, expires_at),
+                )
+                self.__db.commit()
+
+        return clearance
+
+    def set_from_browser(
+        self, host: str, cookies: list[dict], user_agent: str
+    ) -> Optional[Clearance]:
+        # Only worth keeping once Cloudflare has actually issued a clearance cookie
+        clearance_cookie = next(
+            (cookie for cookie in cookies if cookie["name"] == CLEARANCE_COOKIE), None
+        )
+        if clearance_cookie is None:
+            return None
+
+        # Session cookies report an expiry of -1, fall back to the default TTL for those
+        expires_at = time.time() + self.default_ttl
+        if clearance_cookie.get("expires", -1) > 0:
+            expires_at = min(expires_at, clearance_cookie["expires"])
+
+        return self.set(
+            host,
+            {cookie["name"]: cookie["value"] for cookie in cookies},
+            user_agent,
+            expires_at,
+        )
+
+    def invalidate(self, host: str):
+        with self.__lock:
+            self.__forget(host)
+
+    def clear(self):
+        with self.__lock:
+            self.__clearances.clear()
+            self.__missing.clear()
+            if self.__db is not None:
+                self.__db.execute("DELETE FROM clearances")
+                self.__db.commit()
+
+    def close(self):
+        if self.__db is not None:
+            self.__db.close()
+            self.__db = None
+
+    def __len__(self) -> int:
+        return len(self.__clearances)
+
+    def __forget(self, host: str):
+        self.__clearances.pop(host, None)
+        if self.__db is not None:
+            self.__missing.add(host)
+            self.__db.execute("DELETE FROM clearances WHERE host = ?", (host,))
+            self.__db.commit()
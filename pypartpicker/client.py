@@ -1,11 +1,136 @@
 import asyncio
-from .scraper import Scraper
-from .types import Part, PartList, PartSearchResult, PartReviewsResult
-from .errors import CloudflareException, RateLimitException
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from .parsers import get_scraper, parse_raw
+from .scraper import PRICES_REGION_FIELDS
+from .urls import REGIONS, PRODUCT_PATHS
+from .crawler import CatalogCheckpoint
+from .types import Part, PartList, PartSearchResult, PartReviewsResult, Review
+from .errors import (
+    CloudflareException,
+    RateLimitException,
+    CircuitOpenException,
+    ServerErrorException,
+)
+from .cache import ResponseCache, CachedResponse
+from .responses import build_response, apply_rendered_html
+from .sessions import ThreadHTMLSession
+from .ratelimit import RateLimiter
+from .renderer import Renderer
+from .clearance import ClearanceStore
+from .search import SearchIndex
+from .fingerprint import ParseCache, fingerprint
+from .events import (
+    EVENT_CACHE_HIT,
+    EVENT_CACHE_MISS,
+    EVENT_CACHE_REVALIDATED,
+    EVENT_THROTTLE,
+    EVENT_REQUEST,
+    EVENT_CLOUDFLARE_CHECK,
+    EVENT_RENDER,
+    EVENT_RATE_LIMIT,
+    EVENT_RETRY,
+    EVENT_CIRCUIT_OPEN,
+    EVENT_PARSE,
+    Event,
+    EventEmitter,
+)
+from .retry import (
+    ERROR_CLOUDFLARE,
+    ERROR_RATE_LIMIT,
+    ERROR_SERVER,
+    ERROR_TIMEOUT,
+    TIMEOUT_EXCEPTIONS,
+    RetryPolicy,
+    CircuitBreaker,
+    default_retry_policy,
+)
 from requests import Response
-from requests_html import HTMLSession, AsyncHTMLSession
-from typing import Coroutine, Optional
+from requests.adapters import BaseAdapter
+from requests_html import HTMLSession, AsyncHTMLSession, BaseSession
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
+import copy
+import threading
 import time
+import urllib.parse
+
+__all__ = ["Client", "AsyncClient"]
+
+
+def part_list_urls(part_list: PartList) -> list[str]:
+    # Each product is fetched once however many times it appears, custom parts have no product page
+    return list(
+        dict.fromkeys(part.url for part in part_list.parts if part.url is not None)
+    )
+
+
+def expand_part_list(
+    part_list: PartList, parts: dict[str, Union[Part, Exception]]
+) -> PartList:
+    for part in parts.values():
+        if isinstance(part, Exception):
+            raise part
+
+    # A new list rather than updating in place, the thin one may be shared with other callers
+    return PartList(
+        parts=[
+            part if part.url is None else parts[part.url] for part in part_list.parts
+        ],
+        url=part_list.url,
+        estimated_wattage=part_list.estimated_wattage,
+        total_price=part_list.total_price,
+        currency=part_list.currency,
+    )
+
+
+def fetch_key(method: str, url: str, kwargs: dict) -> tuple:
+    # fields can be given as a list or set, only which fields were asked for matters
+    return (
+        method,
+        url,
+        *(
+            (name, frozenset(value) if isinstance(value, (list, set)) else value)
+            for name, value in sorted(kwargs.items())
+        ),
+    )
+
+
+def search_indexed(
+    search_index: Optional[SearchIndex],
+    query: str,
+    page: int,
+    region: Optional[str],
+) -> Optional[PartSearchResult]:
+    # Only misses go out to the live search, and the index only answers for the region it holds
+    if search_index is None or search_index.region != (region or "us"):
+        return None
+
+    result = search_index.search(query, page)
+    return result if len(result.parts) > 0 else None
+
+
+def index_search_result(
+    search_index: Optional[SearchIndex],
+    result: Union[PartSearchResult, list[Part]],
+    region: Optional[str],
+):
+    if search_index is None or search_index.region != (region or "us"):
+        return
+
+    # Searches that redirect straight to a product page return a list with just that part
+    search_index.add_all(result if isinstance(result, list) else result.parts)
 
 
 class Client:
@@ -16,13 +141,41 @@ class Client:
         response_retriever=None,
         no_js=False,
         cookies=None,
+        parser="requests_html",
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        renderer: Optional[Renderer] = None,
+        clearance_store: Optional[ClearanceStore] = None,
+        event_hooks: Optional[Iterable[Callable[[Event], None]]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        adapter: Optional[BaseAdapter] = None,
+        search_index: Optional[SearchIndex] = None,
+        parse_cache: Optional[ParseCache] = None,
     ):
-        self.__scraper = Scraper()
-        self.__session = HTMLSession()
+        self.__scraper = get_scraper(parser)
+        self.__local = threading.local()
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.cookies = cookies
         self.no_js = no_js
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.renderer = renderer
+        self.clearance_store = clearance_store
+        self.events = EventEmitter(event_hooks)
+        self.retry_policy = (
+            retry_policy
+            if retry_policy is not None
+            else default_retry_policy(
+                max_retries, retry_delay, rate_limiter is not None
+            )
+        )
+        self.circuit_breaker = circuit_breaker
+        self.adapter = adapter
+        self.search_index = search_index
+        self.parse_cache = parse_cache
+        self.__session = self.__mount(HTMLSession())
 
         self.__get_response = (
             response_retriever
@@ -32,64 +185,480 @@ class Client:
         if not callable(self.__get_response):
             raise ValueError("response_retriever must be callable.")
 
-    def __default_response_retriever(self, url: str, retries=0) -> Response:
-        if retries >= self.max_retries:
-            raise CloudflareException(f"Request to {url} failed, max retries exceeded.")
+    def __default_response_retriever(self, url: str) -> Response:
+        cached = None if self.cache is None else self.cache.get(url)
+        if cached is not None and cached.fresh:
+            self.events.emit(EVENT_CACHE_HIT, url)
+            return self.__from_cache(cached)
+        if self.cache is not None:
+            self.events.emit(EVENT_CACHE_MISS, url, stale=cached is not None)
+
+        host = urllib.parse.urlparse(url).netloc
+        attempt = 0
+        # Each kind of failure has its own budget, so earlier failures of another kind don't use it up
+        failures: dict[str, int] = {}
+        while True:
+            if self.circuit_breaker is not None:
+                try:
+                    self.circuit_breaker.check(host)
+                except CircuitOpenException:
+                    self.events.emit(EVENT_CIRCUIT_OPEN, url)
+                    raise
+
+            exception = None
+            try:
+                res, error = self.__attempt(url, host, cached, attempt)
+            except TIMEOUT_EXCEPTIONS as e:
+                res, error, exception = None, ERROR_TIMEOUT, e
+
+            if self.circuit_breaker is not None:
+                if error is None:
+                    self.circuit_breaker.record_success(host)
+                else:
+                    self.circuit_breaker.record_failure(host)
+
+            if error is None:
+                return res
+
+            delay = self.retry_policy.get_delay(error, failures.get(error, 0))
+            failures[error] = failures.get(error, 0) + 1
+            if delay is None:
+                if error == ERROR_CLOUDFLARE:
+                    raise CloudflareException(
+                        f"Request to {url} failed, max retries exceeded."
+                    )
+                if error == ERROR_RATE_LIMIT:
+                    raise RateLimitException(f"PCPP rate limit encountered: {url}")
+                if exception is not None:
+                    raise exception
+                raise ServerErrorException(
+                    f"Request to {url} failed with status {res.status_code}, max retries exceeded."
+                )
+
+            attempt += 1
+            self.events.emit(
+                EVENT_RETRY, url, reason=error, retries=attempt, delay=delay
+            )
+            if delay > 0:
+                time.sleep(delay)
+
+    def __attempt(
+        self, url: str, host: str, cached: Optional[CachedResponse], attempt: int
+    ) -> tuple[Response, Optional[str]]:
+        if self.rate_limiter is not None:
+            with self.events.timed(EVENT_THROTTLE, url):
+                self.rate_limiter.acquire(host)
+
+        headers = {} if cached is None else cached.validators()
+        cookies = self.cookies
+
+        # Reuse a previous render's clearance, Cloudflare ties it to the browser's user agent
+        clearance = (
+            None if self.clearance_store is None else self.clearance_store.get(host)
+        )
+        if clearance is not None:
+            cookies = {**(self.cookies or {}), **clearance.cookies}
+            headers["User-Agent"] = clearance.user_agent
 
-        res = self.__session.get(url, cookies=self.cookies)
+        with self.events.timed(EVENT_REQUEST, url, retries=attempt) as request:
+            res = self.__get_session().get(url, cookies=cookies, headers=headers)
+            request["status_code"] = res.status_code
+            request["size"] = len(res.content)
+
+        # Stale entry is still current, no need to parse a new body
+        if cached is not None and res.status_code == 304:
+            self.events.emit(EVENT_CACHE_REVALIDATED, url)
+            return self.__from_cache(self.cache.refresh(url) or cached), None
 
         # Check if we are being Cloudflare checked
-        if self.__scraper.is_cloudflare(res):
+        with self.events.timed(EVENT_CLOUDFLARE_CHECK, url) as check:
+            check["challenged"] = self.__scraper.is_cloudflare(res)
+
+        if check["challenged"]:
+            # The stored clearance has been revoked or has expired early
+            if clearance is not None:
+                self.clearance_store.invalidate(host)
+
+            # Without rendering the challenge is a failed attempt like any other
             if self.no_js:
-                return self.__default_response_retriever(url, self.max_retries)
+                return res, ERROR_CLOUDFLARE
 
-            res.html.render()
+            with self.events.timed(
+                EVENT_RENDER, url, pooled=self.renderer is not None
+            ) as render:
+                self.__render(url, res)
+
+                render["challenged"] = self.__scraper.is_cloudflare(res)
 
-            if self.__scraper.is_cloudflare(res):
-                time.sleep(self.retry_delay)
-                return self.__default_response_retriever(url, retries + 1)
+            if render["challenged"]:
+                return res, ERROR_CLOUDFLARE
         elif self.__scraper.is_rate_limit(res):
-            raise RateLimitException(f"PCPP rate limit encountered: {url}")
+            self.events.emit(EVENT_RATE_LIMIT, url, retries=attempt)
+            if self.rate_limiter is not None:
+                self.rate_limiter.penalize(host)
+            return res, ERROR_RATE_LIMIT
+        elif res.status_code >= 500:
+            return res, ERROR_SERVER
 
-        return res
+        if self.rate_limiter is not None:
+            self.rate_limiter.reward(host)
 
-    def get_part(self, id_url: str, region: str = None) -> Part:
-        url = self.__scraper.prepare_part_url(id_url, region)
+        if self.cache is not None and res.status_code == 200:
+            self.cache.set(url, res.status_code, res.headers, res.html.raw_html)
+
+        return res, None
+
+    def __render(self, url: str, res: Response):
+        if self.renderer is None:
+            res.html.render()
+            return
+
+        rendered = self.renderer.render(url, cookies=self.cookies)
+        apply_rendered_html(res, rendered.content)
+
+        if self.clearance_store is not None:
+            self.clearance_store.set_from_browser(
+                urllib.parse.urlparse(url).netloc, rendered.cookies, rendered.user_agent
+            )
+
+    def __from_cache(self, cached: CachedResponse) -> Response:
+        return build_response(
+            cached.url,
+            cached.status_code,
+            cached.headers,
+            cached.content,
+            self.__get_session(),
+        )
+
+    def __fetch(self, method: str, url: str, **kwargs) -> Any:
+        return self.__fetch_changed(method, url, **kwargs)[0]
+
+    def __fetch_changed(self, method: str, url: str, **kwargs) -> tuple[Any, bool]:
         res = self.__get_response(url)
-        return self.__scraper.parse_part(res)
+        with self.events.timed(EVENT_PARSE, url, method=method) as data:
+            if self.parse_cache is None:
+                return getattr(self.__scraper, method)(res, **kwargs), True
+
+            # Pages whose content hasn't changed skip the parse and reuse the last result
+            key = fetch_key(method, url, kwargs)
+            page_fingerprint = fingerprint(res.html.raw_html)
+            page = self.parse_cache.get(key, page_fingerprint)
+            data["changed"] = page is None
+            # Lazy parts only remember the fingerprint and are parsed again, copying one would run all of its loaders
+            if kwargs.get("lazy"):
+                if page is None:
+                    self.parse_cache.set(key, page_fingerprint, None)
+                return getattr(self.__scraper, method)(res, **kwargs), page is None
+
+            # Callers each get their own copy, so changing a result doesn't change what later hits return
+            if page is not None:
+                return copy.deepcopy(page.result), False
+
+            result = getattr(self.__scraper, method)(res, **kwargs)
+            self.parse_cache.set(key, page_fingerprint, copy.deepcopy(result))
+            return result, True
 
-    def get_part_list(self, id_url: str, region: str = None) -> PartList:
+    def __mount(self, session: BaseSession) -> BaseSession:
+        if self.adapter is not None:
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+        return session
+
+    def __get_session(self) -> HTMLSession:
+        # Batch workers each get their own session, see __map
+        return getattr(self.__local, "session", self.__session)
+
+    def get_part(
+        self,
+        id_url: str,
+        region: str = None,
+        lazy: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Part:
+        url = self.__scraper.prepare_part_url(id_url, region)
+        return self.__fetch("parse_part", url, lazy=lazy, fields=fields)
+
+    def get_part_if_changed(
+        self,
+        id_url: str,
+        region: str = None,
+        lazy: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Optional[Part]:
+        if self.parse_cache is None:
+            raise ValueError("get_part_if_changed requires a parse_cache.")
+
+        url = self.__scraper.prepare_part_url(id_url, region)
+        part, changed = self.__fetch_changed(
+            "parse_part", url, lazy=lazy, fields=fields
+        )
+        return part if changed else None
+
+    def get_part_list(
+        self,
+        id_url: str,
+        region: str = None,
+        expand: bool = False,
+        max_workers: int = 8,
+    ) -> PartList:
         url = self.__scraper.prepare_part_list_url(id_url, region)
-        res = self.__get_response(url)
-        return self.__scraper.parse_part_list(res)
+        part_list = self.__fetch("parse_part_list", url)
+        if not expand:
+            return part_list
+
+        urls = part_list_urls(part_list)
+        return expand_part_list(
+            part_list,
+            dict(
+                zip(
+                    urls,
+                    self.__map(self.get_part, [(url,) for url in urls], max_workers),
+                )
+            ),
+        )
 
     def get_part_search(
         self, query: str, page: int = 1, region: Optional[str] = None
     ) -> PartSearchResult:
+        indexed = search_indexed(self.search_index, query, page, region)
+        if indexed is not None:
+            return indexed
+
         url = self.__scraper.prepare_search_url(query, page, region)
-        res = self.__get_response(url)
-        return self.__scraper.parse_part_search(res)
+        result = self.__fetch("parse_part_search", url)
+        index_search_result(self.search_index, result, region)
+        return result
 
     def get_part_reviews(
         self, id_url: str, page: int = 1, rating: Optional[int] = None
     ) -> PartReviewsResult:
         url = self.__scraper.prepare_part_reviews_url(id_url, page, rating)
+        return self.__fetch("parse_reviews", url)
+
+    def get_part_all_regions(
+        self,
+        id_url: str,
+        regions: Iterable[str] = REGIONS,
+        deadline: Optional[float] = None,
+        max_workers: int = 8,
+    ) -> dict[str, Union[Part, Exception]]:
+        regions = list(regions)
+        results = {
+            region: TimeoutError(f"Deadline expired before {region} was fetched.")
+            for region in regions
+        }
+
+        # Only the prices section is parsed, see PRICES_REGION_FIELDS
+        args = [(id_url, region, False, PRICES_REGION_FIELDS) for region in regions]
+        for index, result in self.__iter_completed(
+            self.get_part, args, max_workers, deadline
+        ):
+            results[regions[index]] = result
+
+        return results
+
+    def iter_part_search(
+        self, query: str, region: Optional[str] = None, prefetch: int = 2
+    ) -> Iterator[Part]:
+        for result in self.__iter_pages(
+            lambda page: self.get_part_search(query, page, region), prefetch
+        ):
+            yield from result if isinstance(result, list) else result.parts
+
+    def iter_part_reviews(
+        self, id_url: str, rating: Optional[int] = None, prefetch: int = 2
+    ) -> Iterator[Review]:
+        for result in self.__iter_pages(
+            lambda page: self.get_part_reviews(id_url, page, rating), prefetch
+        ):
+            yield from result.reviews
+
+    def get_parts_many(
+        self, id_urls: Iterable[str], region: str = None, max_workers: int = 8
+    ) -> list[Union[Part, Exception]]:
+        return self.__map(
+            self.get_part, [(id_url, region) for id_url in id_urls], max_workers
+        )
+
+    def get_part_lists_many(
+        self, id_urls: Iterable[str], region: str = None, max_workers: int = 8
+    ) -> list[Union[PartList, Exception]]:
+        return self.__map(
+            self.get_part_list, [(id_url, region) for id_url in id_urls], max_workers
+        )
+
+    def get_part_reviews_many(
+        self,
+        id_urls: Iterable[str],
+        page: int = 1,
+        rating: Optional[int] = None,
+        max_workers: int = 8,
+    ) -> list[Union[PartReviewsResult, Exception]]:
+        return self.__map(
+            self.get_part_reviews,
+            [(id_url, page, rating) for id_url in id_urls],
+            max_workers,
+        )
+
+    def iter_parts_many(
+        self, id_urls: Iterable[str], region: str = None, max_workers: int = 8
+    ) -> Iterator[tuple[int, Union[Part, Exception]]]:
+        return self.__iter_completed(
+            self.get_part, [(id_url, region) for id_url in id_urls], max_workers
+        )
+
+    def iter_part_lists_many(
+        self, id_urls: Iterable[str], region: str = None, max_workers: int = 8
+    ) -> Iterator[tuple[int, Union[PartList, Exception]]]:
+        return self.__iter_completed(
+            self.get_part_list, [(id_url, region) for id_url in id_urls], max_workers
+        )
+
+    def __map(self, fetch: Callable, args: list[tuple], max_workers: int) -> list[Any]:
+        results = [None] * len(args)
+        for index, result in self.__iter_completed(fetch, args, max_workers):
+            results[index] = result
+        return results
+
+    def __iter_completed(
+        self,
+        fetch: Callable,
+        args: list[tuple],
+        max_workers: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[tuple[int, Any]]:
+        def run(index, fetch_args):
+            try:
+                return index, fetch(*fetch_args)
+            except Exception as e:
+                return index, e
+
+        with self.__thread_pool(max_workers, wait=timeout is None) as executor:
+            futures = [
+                executor.submit(run, index, fetch_args)
+                for index, fetch_args in enumerate(args)
+            ]
+            try:
+                for future in as_completed(futures, timeout):
+                    yield future.result()
+            except FuturesTimeoutError:
+                return
+
+    def __iter_pages(
+        self, fetch: Callable, prefetch: int, start: int = 1
+    ) -> Iterator[Any]:
+        first = fetch(start)
+        yield first
+
+        # Searches that redirect to a product page have no further pages
+        if isinstance(first, list) or first.total_pages <= start:
+            return
+
+        if prefetch <= 0:
+            for page in range(start + 1, first.total_pages + 1):
+                yield fetch(page)
+            return
+
+        with self.__thread_pool(prefetch) as executor:
+            pending = deque()
+            next_page = start + 1
+            while True:
+                while next_page <= first.total_pages and len(pending) < prefetch:
+                    pending.append(executor.submit(fetch, next_page))
+                    next_page += 1
+
+                if len(pending) == 0:
+                    break
+                yield pending.popleft().result()
+
+    @contextmanager
+    def __thread_pool(
+        self, max_workers: int, wait: bool = True
+    ) -> Iterator[ThreadPoolExecutor]:
+        sessions = []
+
+        def init_worker():
+            session = self.__mount(ThreadHTMLSession())
+            sessions.append(session)
+            self.__local.session = session
+
+        def shutdown():
+            executor.shutdown(cancel_futures=True)
+            for session in sessions:
+                session.close()
+
+        executor = ThreadPoolExecutor(max_workers, initializer=init_worker)
+        try:
+            yield executor
+        finally:
+            # Without waiting, requests still running are left to finish in the background
+            if wait:
+                shutdown()
+            else:
+                threading.Thread(target=shutdown, daemon=True).start()
+
+    def get_parts(
+        self,
+        product_path: str,
+        page: int = 1,
+        region: Optional[str] = None,
+        compatible_with: Optional[str] = None,
+    ) -> PartSearchResult:
+        url = self.__scraper.prepare_parts_url(
+            product_path, page, region, compatible_with
+        )
         res = self.__get_response(url)
-        return self.__scraper.parse_reviews(res)
-
-    # def get_parts(
-    #     self,
-    #     product_path: str,
-    #     page: int = 1,
-    #     region: Optional[str] = None,
-    #     compatible_with: Optional[str] = None,
-    # ) -> PartSearchResult:
-    #     url = self.__scraper.prepare_parts_url(
-    #         product_path, page, region, compatible_with
-    #     )
-    #     res = self.__get_response(url)
-    #     res.html.render()
-    #     return self.__scraper.parse_parts(res)
+        with self.events.timed(EVENT_PARSE, url, method="parse_parts"):
+            result = self.__scraper.parse_parts(res)
+
+        # Listings are filled in by JavaScript, render when the page was served without them
+        if len(result.parts) == 0 and not self.no_js:
+            with self.events.timed(EVENT_RENDER, url, pooled=self.renderer is not None):
+                self.__render(url, res)
+            with self.events.timed(EVENT_PARSE, url, method="parse_parts"):
+                result = self.__scraper.parse_parts(res)
+
+        return result
+
+    def iter_parts(
+        self,
+        product_path: str,
+        region: Optional[str] = None,
+        compatible_with: Optional[str] = None,
+        prefetch: int = 2,
+    ) -> Iterator[Part]:
+        for result in self.__iter_pages(
+            lambda page: self.get_parts(product_path, page, region, compatible_with),
+            prefetch,
+        ):
+            yield from result.parts
+
+    def crawl_catalog(
+        self,
+        checkpoint: Union[str, CatalogCheckpoint],
+        product_paths: Iterable[str] = PRODUCT_PATHS,
+        region: Optional[str] = None,
+        prefetch: int = 2,
+    ) -> Iterator[Part]:
+        if not isinstance(checkpoint, CatalogCheckpoint):
+            checkpoint = CatalogCheckpoint(checkpoint)
+
+        for product_path in product_paths:
+            if checkpoint.is_done(product_path):
+                continue
+
+            start = checkpoint.get_next_page(product_path)
+            for page, result in enumerate(
+                self.__iter_pages(
+                    lambda page: self.get_parts(product_path, page, region),
+                    prefetch,
+                    start,
+                ),
+                start,
+            ):
+                yield from result.parts
+                # Only recorded once the caller has taken every part, so a crash repeats the page rather than skip it
+                checkpoint.complete_page(product_path, page, result.total_pages)
 
 
 class AsyncClient:
@@ -100,13 +669,46 @@ class AsyncClient:
         response_retriever=None,
         cookies=None,
         no_js=False,
+        parser="requests_html",
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        renderer: Optional[Renderer] = None,
+        clearance_store: Optional[ClearanceStore] = None,
+        event_hooks: Optional[Iterable[Callable[[Event], None]]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        adapter: Optional[BaseAdapter] = None,
+        search_index: Optional[SearchIndex] = None,
+        parse_cache: Optional[ParseCache] = None,
+        parse_executor: Optional[Executor] = None,
+        coalesce: bool = False,
     ):
-        self.__scraper = Scraper()
+        self.__scraper = get_scraper(parser)
+        self.__parser = parser
         self.__session = None
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.cookies = cookies
         self.no_js = no_js
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.renderer = renderer
+        self.clearance_store = clearance_store
+        self.events = EventEmitter(event_hooks)
+        self.retry_policy = (
+            retry_policy
+            if retry_policy is not None
+            else default_retry_policy(
+                max_retries, retry_delay, rate_limiter is not None
+            )
+        )
+        self.circuit_breaker = circuit_breaker
+        self.adapter = adapter
+        self.search_index = search_index
+        self.parse_cache = parse_cache
+        self.parse_executor = parse_executor
+        self.coalesce = coalesce
+        self.__in_flight: dict[tuple, asyncio.Task] = {}
 
         self.__get_response = (
             response_retriever
@@ -118,58 +720,527 @@ class AsyncClient:
 
     async def __aenter__(self):
         self.__session = AsyncHTMLSession()
+        if self.adapter is not None:
+            self.__session.mount("https://", self.adapter)
+            self.__session.mount("http://", self.adapter)
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
         await self.__session.close()
 
     async def __default_response_retriever(
-        self, url: str, retries=0
+        self, url: str
     ) -> Coroutine[None, None, Response]:
-        if retries >= self.max_retries:
-            raise CloudflareException(f"Request to {url} failed, max retries exceeded.")
+        cached = None if self.cache is None else await self.cache.aget(url)
+        if cached is not None and cached.fresh:
+            self.events.emit(EVENT_CACHE_HIT, url)
+            return self.__from_cache(cached)
+        if self.cache is not None:
+            self.events.emit(EVENT_CACHE_MISS, url, stale=cached is not None)
+
+        host = urllib.parse.urlparse(url).netloc
+        attempt = 0
+        # Each kind of failure has its own budget, so earlier failures of another kind don't use it up
+        failures: dict[str, int] = {}
+        while True:
+            if self.circuit_breaker is not None:
+                try:
+                    self.circuit_breaker.check(host)
+                except CircuitOpenException:
+                    self.events.emit(EVENT_CIRCUIT_OPEN, url)
+                    raise
+
+            exception = None
+            try:
+                res, error = await self.__attempt(url, host, cached, attempt)
+            except TIMEOUT_EXCEPTIONS as e:
+                res, error, exception = None, ERROR_TIMEOUT, e
+
+            if self.circuit_breaker is not None:
+                if error is None:
+                    self.circuit_breaker.record_success(host)
+                else:
+                    self.circuit_breaker.record_failure(host)
+
+            if error is None:
+                return res
+
+            delay = self.retry_policy.get_delay(error, failures.get(error, 0))
+            failures[error] = failures.get(error, 0) + 1
+            if delay is None:
+                if error == ERROR_CLOUDFLARE:
+                    raise CloudflareException(
+                        f"Request to {url} failed, max retries exceeded."
+                    )
+                if error == ERROR_RATE_LIMIT:
+                    raise RateLimitException(f"PCPP rate limit encountered: {url}")
+                if exception is not None:
+                    raise exception
+                raise ServerErrorException(
+                    f"Request to {url} failed with status {res.status_code}, max retries exceeded."
+                )
+
+            attempt += 1
+            self.events.emit(
+                EVENT_RETRY, url, reason=error, retries=attempt, delay=delay
+            )
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def __attempt(
+        self, url: str, host: str, cached: Optional[CachedResponse], attempt: int
+    ) -> tuple[Response, Optional[str]]:
+        if self.rate_limiter is not None:
+            with self.events.timed(EVENT_THROTTLE, url):
+                await self.rate_limiter.aacquire(host)
 
-        res = await self.__session.get(url, cookies=self.cookies)
+        headers = {} if cached is None else cached.validators()
+        cookies = self.cookies
+
+        # Reuse a previous render's clearance, Cloudflare ties it to the browser's user agent
+        clearance = (
+            None if self.clearance_store is None else self.clearance_store.get(host)
+        )
+        if clearance is not None:
+            cookies = {**(self.cookies or {}), **clearance.cookies}
+            headers["User-Agent"] = clearance.user_agent
+
+        with self.events.timed(EVENT_REQUEST, url, retries=attempt) as request:
+            res = await self.__session.get(url, cookies=cookies, headers=headers)
+            request["status_code"] = res.status_code
+            request["size"] = len(res.content)
+
+        # Stale entry is still current, no need to parse a new body
+        if cached is not None and res.status_code == 304:
+            self.events.emit(EVENT_CACHE_REVALIDATED, url)
+            return self.__from_cache(await self.cache.arefresh(url) or cached), None
 
         # Check if we are being Cloudflare checked
-        if self.__scraper.is_cloudflare(res):
+        with self.events.timed(EVENT_CLOUDFLARE_CHECK, url) as check:
+            check["challenged"] = self.__scraper.is_cloudflare(res)
+
+        if check["challenged"]:
+            # The stored clearance has been revoked or has expired early
+            if clearance is not None:
+                self.clearance_store.invalidate(host)
+
+            # Without rendering the challenge is a failed attempt like any other
             if self.no_js:
-                return await self.__default_response_retriever(url, self.max_retries)
+                return res, ERROR_CLOUDFLARE
 
-            await res.html.arender()
+            with self.events.timed(
+                EVENT_RENDER, url, pooled=self.renderer is not None
+            ) as render:
+                await self.__render(url, res)
+
+                render["challenged"] = self.__scraper.is_cloudflare(res)
 
-            if self.__scraper.is_cloudflare(res):
-                asyncio.sleep(self.retry_delay)
-                return await self.__default_response_retriever(url, retries + 1)
+            if render["challenged"]:
+                return res, ERROR_CLOUDFLARE
         elif self.__scraper.is_rate_limit(res):
-            raise RateLimitException(f"PCPP rate limit encountered: {url}")
+            self.events.emit(EVENT_RATE_LIMIT, url, retries=attempt)
+            if self.rate_limiter is not None:
+                await self.rate_limiter.apenalize(host)
+            return res, ERROR_RATE_LIMIT
+        elif res.status_code >= 500:
+            return res, ERROR_SERVER
+
+        if self.rate_limiter is not None:
+            await self.rate_limiter.areward(host)
+
+        if self.cache is not None and res.status_code == 200:
+            await self.cache.aset(url, res.status_code, res.headers, res.html.raw_html)
+
+        return res, None
+
+    async def __parse(self, method: str, res: Response, **kwargs) -> Any:
+        if self.parse_executor is None:
+            return getattr(self.__scraper, method)(res, **kwargs)
 
-        return res
+        # Only the raw markup crosses into the executor, keeping the event loop free while it parses
+        return await asyncio.get_running_loop().run_in_executor(
+            self.parse_executor,
+            partial(
+                parse_raw,
+                self.__parser,
+                method,
+                res.url,
+                res.html.raw_html,
+                res.html.encoding,
+                **kwargs,
+            ),
+        )
+
+    async def __fetch(self, method: str, url: str, **kwargs) -> Any:
+        return (await self.__fetch_changed(method, url, **kwargs))[0]
+
+    async def __fetch_changed(
+        self, method: str, url: str, **kwargs
+    ) -> tuple[Any, bool]:
+        if not self.coalesce:
+            return await self.__fetch_page(method, url, **kwargs)
+
+        # Concurrent callers for the same page share one request and one parse
+        key = fetch_key(method, url, kwargs)
+        task = self.__in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.__fetch_page(method, url, **kwargs))
+            self.__in_flight[key] = task
+            task.add_done_callback(lambda task: self.__finish_in_flight(key, task))
+
+        # Shielded so a cancelled caller doesn't cancel the fetch for everyone else
+        return await asyncio.shield(task)
+
+    async def __fetch_page(self, method: str, url: str, **kwargs) -> tuple[Any, bool]:
+        res = await self.__get_response(url)
+        with self.events.timed(EVENT_PARSE, url, method=method) as data:
+            if self.parse_cache is None:
+                return await self.__parse(method, res, **kwargs), True
+
+            # Pages whose content hasn't changed skip the parse and reuse the last result
+            key = fetch_key(method, url, kwargs)
+            page_fingerprint = fingerprint(res.html.raw_html)
+            page = self.parse_cache.get(key, page_fingerprint)
+            data["changed"] = page is None
+            # Lazy parts only remember the fingerprint and are parsed again, copying one would run all of its loaders
+            if kwargs.get("lazy"):
+                if page is None:
+                    self.parse_cache.set(key, page_fingerprint, None)
+                return await self.__parse(method, res, **kwargs), page is None
+
+            # Callers each get their own copy, so changing a result doesn't change what later hits return
+            if page is not None:
+                return copy.deepcopy(page.result), False
+
+            result = await self.__parse(method, res, **kwargs)
+            self.parse_cache.set(key, page_fingerprint, copy.deepcopy(result))
+            return result, True
+
+    def __finish_in_flight(self, key: tuple, task: asyncio.Task):
+        self.__in_flight.pop(key, None)
+        # Marks the exception as retrieved when every caller was cancelled before it finished
+        if not task.cancelled():
+            task.exception()
+
+    async def __render(self, url: str, res: Response):
+        if self.renderer is None:
+            await res.html.arender()
+            return
+
+        rendered = await self.renderer.arender(url, cookies=self.cookies)
+        apply_rendered_html(res, rendered.content)
+
+        if self.clearance_store is not None:
+            self.clearance_store.set_from_browser(
+                urllib.parse.urlparse(url).netloc, rendered.cookies, rendered.user_agent
+            )
+
+    def __from_cache(self, cached: CachedResponse) -> Response:
+        return build_response(
+            cached.url,
+            cached.status_code,
+            cached.headers,
+            cached.content,
+            self.__session,
+        )
 
     async def get_part(
-        self, id_url: str, region: str = None
+        self,
+        id_url: str,
+        region: str = None,
+        lazy: bool = False,
+        fields: Optional[Iterable[str]] = None,
     ) -> Coroutine[None, None, Part]:
         url = self.__scraper.prepare_part_url(id_url, region)
-        res = await self.__get_response(url)
-        return self.__scraper.parse_part(res)
+        return await self.__fetch(
+            "parse_part",
+            url,
+            lazy=lazy,
+            fields=None if fields is None else frozenset(fields),
+        )
+
+    async def get_part_if_changed(
+        self,
+        id_url: str,
+        region: str = None,
+        lazy: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Coroutine[None, None, Optional[Part]]:
+        if self.parse_cache is None:
+            raise ValueError("get_part_if_changed requires a parse_cache.")
+
+        url = self.__scraper.prepare_part_url(id_url, region)
+        part, changed = await self.__fetch_changed(
+            "parse_part",
+            url,
+            lazy=lazy,
+            fields=None if fields is None else frozenset(fields),
+        )
+        return part if changed else None
 
     async def get_part_list(
-        self, id_url: str, region: str = None
+        self,
+        id_url: str,
+        region: str = None,
+        expand: bool = False,
+        concurrency: int = 10,
     ) -> Coroutine[None, None, PartList]:
         url = self.__scraper.prepare_part_list_url(id_url, region)
-        res = await self.__get_response(url)
-        return self.__scraper.parse_part_list(res)
+        part_list = await self.__fetch("parse_part_list", url)
+        if not expand:
+            return part_list
+
+        urls = part_list_urls(part_list)
+        return expand_part_list(
+            part_list,
+            dict(
+                zip(
+                    urls,
+                    await self.__gather(
+                        self.get_part, [(url,) for url in urls], concurrency
+                    ),
+                )
+            ),
+        )
 
     async def get_part_search(
         self, query: str, page: int = 1, region: Optional[str] = None
     ) -> Coroutine[None, None, PartSearchResult]:
+        indexed = search_indexed(self.search_index, query, page, region)
+        if indexed is not None:
+            return indexed
+
         url = self.__scraper.prepare_search_url(query, page, region)
-        res = await self.__get_response(url)
-        return self.__scraper.parse_part_search(res)
+        result = await self.__fetch("parse_part_search", url)
+        index_search_result(self.search_index, result, region)
+        return result
 
     async def get_part_reviews(
         self, id_url: str, page: int = 1, rating: Optional[int] = None
     ) -> Coroutine[None, None, PartReviewsResult]:
         url = self.__scraper.prepare_part_reviews_url(id_url, page, rating)
+        return await self.__fetch("parse_reviews", url)
+
+    async def get_parts(
+        self,
+        product_path: str,
+        page: int = 1,
+        region: Optional[str] = None,
+        compatible_with: Optional[str] = None,
+    ) -> Coroutine[None, None, PartSearchResult]:
+        url = self.__scraper.prepare_parts_url(
+            product_path, page, region, compatible_with
+        )
         res = await self.__get_response(url)
-        return self.__scraper.parse_reviews(res)
+        with self.events.timed(EVENT_PARSE, url, method="parse_parts"):
+            result = await self.__parse("parse_parts", res)
+
+        # Listings are filled in by JavaScript, render when the page was served without them
+        if len(result.parts) == 0 and not self.no_js:
+            with self.events.timed(EVENT_RENDER, url, pooled=self.renderer is not None):
+                await self.__render(url, res)
+            with self.events.timed(EVENT_PARSE, url, method="parse_parts"):
+                result = await self.__parse("parse_parts", res)
+
+        return result
+
+    async def iter_parts(
+        self,
+        product_path: str,
+        region: Optional[str] = None,
+        compatible_with: Optional[str] = None,
+        prefetch: int = 2,
+    ) -> AsyncIterator[Part]:
+        async for result in self.__iter_pages(
+            lambda page: self.get_parts(product_path, page, region, compatible_with),
+            prefetch,
+        ):
+            for part in result.parts:
+                yield part
+
+    async def crawl_catalog(
+        self,
+        checkpoint: Union[str, CatalogCheckpoint],
+        product_paths: Iterable[str] = PRODUCT_PATHS,
+        region: Optional[str] = None,
+        prefetch: int = 2,
+    ) -> AsyncIterator[Part]:
+        if not isinstance(checkpoint, CatalogCheckpoint):
+            checkpoint = CatalogCheckpoint(checkpoint)
+
+        for product_path in product_paths:
+            if checkpoint.is_done(product_path):
+                continue
+
+            page = checkpoint.get_next_page(product_path)
+            async for result in self.__iter_pages(
+                lambda page: self.get_parts(product_path, page, region),
+                prefetch,
+                page,
+            ):
+                for part in result.parts:
+                    yield part
+                # Only recorded once the caller has taken every part, so a crash repeats the page rather than skip it
+                checkpoint.complete_page(product_path, page, result.total_pages)
+                page += 1
+
+    async def get_part_all_regions(
+        self,
+        id_url: str,
+        regions: Iterable[str] = REGIONS,
+        deadline: Optional[float] = None,
+        concurrency: int = 10,
+    ) -> Coroutine[None, None, dict[str, Union[Part, Exception]]]:
+        regions = list(regions)
+        results = {
+            region: TimeoutError(f"Deadline expired before {region} was fetched.")
+            for region in regions
+        }
+
+        async def collect():
+            # Only the prices section is parsed, see PRICES_REGION_FIELDS
+            async for index, result in self.__as_completed(
+                self.get_part,
+                [(id_url, region, False, PRICES_REGION_FIELDS) for region in regions],
+                concurrency,
+            ):
+                results[regions[index]] = result
+
+        try:
+            await asyncio.wait_for(collect(), deadline)
+        except asyncio.TimeoutError:
+            pass
+
+        return results
+
+    async def iter_part_search(
+        self, query: str, region: Optional[str] = None, prefetch: int = 2
+    ) -> AsyncIterator[Part]:
+        async for result in self.__iter_pages(
+            lambda page: self.get_part_search(query, page, region), prefetch
+        ):
+            for part in result if isinstance(result, list) else result.parts:
+                yield part
+
+    async def iter_part_reviews(
+        self, id_url: str, rating: Optional[int] = None, prefetch: int = 2
+    ) -> AsyncIterator[Review]:
+        async for result in self.__iter_pages(
+            lambda page: self.get_part_reviews(id_url, page, rating), prefetch
+        ):
+            for review in result.reviews:
+                yield review
+
+    async def get_parts_many(
+        self, id_urls: Iterable[str], region: str = None, concurrency: int = 10
+    ) -> Coroutine[None, None, list[Union[Part, Exception]]]:
+        return await self.__gather(
+            self.get_part, [(id_url, region) for id_url in id_urls], concurrency
+        )
+
+    async def get_part_lists_many(
+        self, id_urls: Iterable[str], region: str = None, concurrency: int = 10
+    ) -> Coroutine[None, None, list[Union[PartList, Exception]]]:
+        return await self.__gather(
+            self.get_part_list, [(id_url, region) for id_url in id_urls], concurrency
+        )
+
+    async def get_part_reviews_many(
+        self,
+        id_urls: Iterable[str],
+        page: int = 1,
+        rating: Optional[int] = None,
+        concurrency: int = 10,
+    ) -> Coroutine[None, None, list[Union[PartReviewsResult, Exception]]]:
+        return await self.__gather(
+            self.get_part_reviews,
+            [(id_url, page, rating) for id_url in id_urls],
+            concurrency,
+        )
+
+    async def iter_parts_many(
+        self, id_urls: Iterable[str], region: str = None, concurrency: int = 10
+    ) -> AsyncIterator[tuple[int, Union[Part, Exception]]]:
+        async for result in self.__as_completed(
+            self.get_part, [(id_url, region) for id_url in id_urls], concurrency
+        ):
+            yield result
+
+    async def iter_part_lists_many(
+        self, id_urls: Iterable[str], region: str = None, concurrency: int = 10
+    ) -> AsyncIterator[tuple[int, Union[PartList, Exception]]]:
+        async for result in self.__as_completed(
+            self.get_part_list, [(id_url, region) for id_url in id_urls], concurrency
+        ):
+            yield result
+
+    async def __gather(
+        self, fetch: Callable, args: list[tuple], concurrency: int
+    ) -> list[Any]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(fetch_args):
+            async with semaphore:
+                return await fetch(*fetch_args)
+
+        # Failed items are returned in place so one bad ID doesn't abort the batch
+        return await asyncio.gather(
+            *(run(fetch_args) for fetch_args in args), return_exceptions=True
+        )
+
+    async def __as_completed(
+        self, fetch: Callable, args: list[tuple], concurrency: int
+    ) -> AsyncIterator[tuple[int, Any]]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(index, fetch_args):
+            async with semaphore:
+                try:
+                    return index, await fetch(*fetch_args)
+                except Exception as e:
+                    return index, e
+
+        tasks = [
+            asyncio.ensure_future(run(index, fetch_args))
+            for index, fetch_args in enumerate(args)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def __iter_pages(
+        self, fetch: Callable, prefetch: int, start: int = 1
+    ) -> AsyncIterator[Any]:
+        first = await fetch(start)
+        yield first
+
+        # Searches that redirect to a product page have no further pages
+        if isinstance(first, list) or first.total_pages <= start:
+            return
+
+        pending = deque()
+        next_page = start + 1
+        try:
+            while True:
+                while next_page <= first.total_pages and len(pending) < max(
+                    prefetch, 1
+                ):
+                    pending.append(asyncio.ensure_future(fetch(next_page)))
+                    next_page += 1
+
+                if len(pending) == 0:
+                    break
+                result = await pending.popleft()
+
+                # Keep the next pages loading while the caller works through this one
+                while next_page <= first.total_pages and len(pending) < prefetch:
+                    pending.append(asyncio.ensure_future(fetch(next_page)))
+                    next_page += 1
+
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
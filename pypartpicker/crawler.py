@@ -0,0 +1,48 @@
+from typing import Optional
+import json
+import os
+
+
+class CatalogCheckpoint:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.__categories: dict[str, dict] = {}
+
+        if path is not None and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.__categories = json.load(f)["categories"]
+
+    def get_next_page(self, product_path: str) -> int:
+        category = self.__categories.get(product_path)
+        return 1 if category is None else category["page"] + 1
+
+    def is_done(self, product_path: str) -> bool:
+        category = self.__categories.get(product_path)
+        # Listings without pagination report 0 pages but still have their first page
+        return category is not None and category["page"] >= max(
+            category["total_pages"], 1
+        )
+
+    def complete_page(self, product_path: str, page: int, total_pages: int):
+        self.__categories[product_path] = {"page": page, "total_pages": total_pages}
+        self.__save()
+
+    def reset(self, product_path: Optional[str] = None):
+        if product_path is None:
+            self.__categories.clear()
+        else:
+            self.__categories.pop(product_path, None)
+        self.__save()
+
+    def __save(self):
+        if self.path is None:
+            return
+
+        # Written to a temporary file first so a crash mid-write never corrupts the checkpoint
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"categories": self.__categories}, f)
+        os.replace(temp_path, self.path)
+
+    def __repr__(self):
+        return f"<CatalogCheckpoint path={self.path}>"
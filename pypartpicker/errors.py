@@ -4,3 +4,11 @@ class CloudflareException(Exception):
 
 class RateLimitException(Exception):
     pass
+
+
+class CircuitOpenException(Exception):
+    pass
+
+
+class ServerErrorException(Exception):
+    pass
@@ -0,0 +1,141 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional
+import threading
+import time
+
+EVENT_CACHE_HIT = "cache_hit"
+EVENT_CACHE_MISS = "cache_miss"
+EVENT_CACHE_REVALIDATED = "cache_revalidated"
+EVENT_THROTTLE = "throttle"
+EVENT_REQUEST = "request"
+EVENT_CLOUDFLARE_CHECK = "cloudflare_check"
+EVENT_RENDER = "render"
+EVENT_RATE_LIMIT = "rate_limit"
+EVENT_RETRY = "retry"
+EVENT_CIRCUIT_OPEN = "circuit_open"
+EVENT_PARSE = "parse"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Event:
+    def __init__(self, name: str, url: str, duration: Optional[float] = None, **data):
+        self.name = name
+        self.url = url
+        self.duration = duration
+        self.data = data
+
+    def __repr__(self):
+        return f"<Event name={self.name} url={self.url} duration={self.duration}>"
+
+
+class EventEmitter:
+    def __init__(self, hooks: Optional[Iterable[Callable[[Event], None]]] = None):
+        self.hooks = list(hooks or [])
+
+    def emit(self, name: str, url: str, duration: Optional[float] = None, **data):
+        if len(self.hooks) == 0:
+            return
+
+        event = Event(name, url, duration, **data)
+        for hook in self.hooks:
+            hook(event)
+
+    @contextmanager
+    def timed(self, name: str, url: str, **data) -> Iterator[dict]:
+        # The yielded dict can be filled in with results before the event is emitted
+        if len(self.hooks) == 0:
+            yield data
+            return
+
+        start = time.perf_counter()
+        try:
+            yield data
+        except Exception as e:
+            data["error"] = type(e).__name__
+            raise
+        finally:
+            self.emit(name, url, time.perf_counter() - start, **data)
+
+
+class Histogram:
+    def __init__(self, bucket_count: int):
+        # One extra slot for observations above the largest bucket
+        self.counts = [0] * (bucket_count + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, index: int, value: float):
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsCollector:
+    def __init__(
+        self, buckets: tuple[float, ...] = DEFAULT_BUCKETS, prefix="pypartpicker"
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+
+        self.__lock = threading.Lock()
+        self.__events: dict[tuple[str, str], int] = {}
+        self.__durations: dict[str, Histogram] = {}
+        self.__response_bytes = 0
+
+    def __call__(self, event: Event):
+        with self.__lock:
+            key = (event.name, event.data.get("error", ""))
+            self.__events[key] = self.__events.get(key, 0) + 1
+
+            if event.duration is not None:
+                histogram = self.__durations.get(event.name)
+                if histogram is None:
+                    histogram = self.__durations[event.name] = Histogram(
+                        len(self.buckets)
+                    )
+                histogram.observe(
+                    bisect_left(self.buckets, event.duration), event.duration
+                )
+
+            if event.name == EVENT_REQUEST:
+                self.__response_bytes += event.data.get("size", 0)
+
+    def render(self) -> str:
+        events = f"{self.prefix}_events_total"
+        durations = f"{self.prefix}_duration_seconds"
+        response_bytes = f"{self.prefix}_response_bytes_total"
+
+        with self.__lock:
+            lines = [
+                f"# HELP {events} Number of client events by event name.",
+                f"# TYPE {events} counter",
+            ]
+            for (name, error), count in sorted(self.__events.items()):
+                lines.append(f'{events}{{event="{name}",error="{error}"}} {count}')
+
+            lines += [
+                f"# HELP {durations} Time spent in each client phase.",
+                f"# TYPE {durations} histogram",
+            ]
+            for name, histogram in sorted(self.__durations.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{durations}_bucket{{event="{name}",le="{bound}"}} {cumulative}'
+                    )
+                lines += [
+                    f'{durations}_bucket{{event="{name}",le="+Inf"}} {histogram.count}',
+                    f'{durations}_sum{{event="{name}"}} {histogram.sum}',
+                    f'{durations}_count{{event="{name}"}} {histogram.count}',
+                ]
+
+            lines += [
+                f"# HELP {response_bytes} Bytes of response bodies received.",
+                f"# TYPE {response_bytes} counter",
+                f"{response_bytes} {self.__response_bytes}",
+            ]
+
+        return "\n".join(lines) + "\n"
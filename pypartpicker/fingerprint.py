@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from typing import Any, Optional
+import hashlib
+import re
+import threading
+
+# Markup that differs between requests for the same page, such as nonces, CSRF tokens and analytics scripts
+VOLATILE_RE = re.compile(
+    rb"<script\b.*?</script>"
+    rb"|<style\b.*?</style>"
+    rb"|\snonce=\"[^\"]*\""
+    rb"|name=\"csrfmiddlewaretoken\"\s+value=\"[^\"]*\"",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def fingerprint(html: bytes) -> str:
+    # Only the body up to the footer holds parsed data, the head and footer carry per request noise
+    start = html.find(b"<body")
+    start = 0 if start == -1 else start
+    end = html.rfind(b"<footer")
+    end = len(html) if end < start else end
+
+    hasher = hashlib.blake2b(digest_size=16)
+    view = memoryview(html)
+    position = start
+    for match in VOLATILE_RE.finditer(html, start, end):
+        hasher.update(view[position : match.start()])
+        position = match.end()
+    hasher.update(view[position:end])
+    return hasher.hexdigest()
+
+
+class ParsedPage:
+    def __init__(self, fingerprint: str, result: Any):
+        self.fingerprint = fingerprint
+        self.result = result
+
+    def __repr__(self):
+        return f"<ParsedPage fingerprint={self.fingerprint}>"
+
+
+class ParseCache:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+
+        self.__lock = threading.Lock()
+        self.__pages: OrderedDict[tuple, ParsedPage] = OrderedDict()
+
+    def get(self, key: tuple, fingerprint: str) -> Optional[ParsedPage]:
+        with self.__lock:
+            page = self.__pages.get(key)
+            if page is None or page.fingerprint != fingerprint:
+                return None
+
+            self.__pages.move_to_end(key)
+            return page
+
+    def set(self, key: tuple, fingerprint: str, result: Any) -> ParsedPage:
+        page = ParsedPage(fingerprint, result)
+
+        with self.__lock:
+            self.__pages[key] = page
+            self.__pages.move_to_end(key)
+            while len(self.__pages) > self.max_entries:
+                self.__pages.popitem(last=False)
+
+        return page
+
+    def clear(self):
+        with self.__lock:
+            self.__pages.clear()
+
+    def __len__(self) -> int:
+        return len(self.__pages)
+
+    def __repr__(self):
+        return f"<ParseCache entries={len(self.__pages)}>"
@@ -0,0 +1,264 @@
+from collections import OrderedDict
+from typing import Optional
+from .types import Part, Price, Vendor
+import sqlite3
+import threading
+import time
+
+PRICE_COLUMNS = "base, discounts, shipping, tax, total, currency, in_stock"
+
+
+class PricePoint:
+    def __init__(
+        self,
+        vendor: str,
+        observed_at: float,
+        price: Optional[Price],
+        in_stock: bool,
+    ):
+        self.vendor = vendor
+        self.observed_at = observed_at
+        self.price = price
+        self.in_stock = in_stock
+
+    def __repr__(self):
+        return f"<PricePoint vendor={self.vendor} observed_at={self.observed_at} price={self.price!r}>"
+
+
+class PriceStats:
+    def __init__(
+        self,
+        min: Optional[float],
+        max: Optional[float],
+        last: Optional[PricePoint],
+        changes: int,
+    ):
+        self.min = min
+        self.max = max
+        self.last = last
+        self.changes = changes
+
+    def __repr__(self):
+        return f"<PriceStats min={self.min} max={self.max} changes={self.changes}>"
+
+
+def vendor_state(vendor: Optional[Vendor]) -> tuple:
+    # A vendor that stops listing a part is stored as a run with no price
+    if vendor is None:
+        return (None, None, None, None, None, None, False)
+
+    price = vendor.price
+    return (
+        price.base,
+        price.discounts,
+        price.shipping,
+        price.tax,
+        price.total,
+        price.currency,
+        vendor.in_stock,
+    )
+
+
+def row_point(vendor: str, observed_at: float, state: tuple) -> PricePoint:
+    base, discounts, shipping, tax, total, currency, in_stock = state
+    price = None
+    if total is not None:
+        price = Price(
+            base=base,
+            discounts=discounts,
+            shipping=shipping,
+            tax=tax,
+            total=total,
+            currency=currency,
+        )
+    return PricePoint(vendor, observed_at, price, bool(in_stock))
+
+
+class PriceHistory:
+    def __init__(self, path: Optional[str] = None, max_series: int = 4096):
+        self.path = path
+        self.max_series = max_series
+
+        self.__lock = threading.Lock()
+        # The latest state of each (url, region, vendor) series, observations matching it aren't stored. Only recently
+        # recorded parts are kept, the rest are read back from SQLite when they are next recorded
+        self.__states: OrderedDict[tuple[str, str], dict[str, tuple]] = OrderedDict()
+
+        self.__db = sqlite3.connect(
+            ":memory:" if path is None else path, check_same_thread=False
+        )
+        self.__db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS prices (
+                url TEXT NOT NULL,
+                region TEXT NOT NULL,
+                vendor TEXT NOT NULL,
+                observed_at REAL NOT NULL,
+                base REAL,
+                discounts REAL,
+                shipping REAL,
+                tax REAL,
+                total REAL,
+                currency TEXT,
+                in_stock INTEGER NOT NULL
+            )
+            """
+        )
+        self.__db.execute(
+            "CREATE INDEX IF NOT EXISTS prices_series ON prices (url, region, vendor, observed_at)"
+        )
+        self.__db.commit()
+
+    def record(
+        self, part: Part, region: str = "us", observed_at: Optional[float] = None
+    ) -> int:
+        if part.url is None:
+            raise ValueError("Only parts with a product URL can be recorded.")
+        if part.vendors is None:
+            raise ValueError(f"{part.url} was fetched without its vendors.")
+
+        if observed_at is None:
+            observed_at = time.time()
+
+        with self.__lock:
+            states = self.__get_states(part.url, region)
+            vendors = {vendor.name: vendor for vendor in part.vendors}
+
+            rows = []
+            for name in set(states) | set(vendors):
+                state = vendor_state(vendors.get(name))
+                if states.get(name) != state:
+                    states[name] = state
+                    rows.append((part.url, region, name, observed_at, *state))
+
+            if len(rows) > 0:
+                self.__db.executemany(
+                    f"INSERT INTO prices (url, region, vendor, observed_at, {PRICE_COLUMNS}) VALUES ({', '.join('?' * 11)})",
+                    rows,
+                )
+                self.__db.commit()
+
+            return len(rows)
+
+    def get_history(
+        self,
+        url: str,
+        region: str = "us",
+        vendor: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> list[PricePoint]:
+        # Each point is a change, the price holds until the vendor's next point
+        query = f"SELECT vendor, observed_at, {PRICE_COLUMNS} FROM prices WHERE url = ? AND region = ?"
+        params = [url, region]
+        if vendor is not None:
+            query += " AND vendor = ?"
+            params.append(vendor)
+        if start is not None:
+            query += " AND observed_at >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND observed_at <= ?"
+            params.append(end)
+
+        with self.__lock:
+            rows = self.__db.execute(query + " ORDER BY observed_at", params)
+            return [row_point(row[0], row[1], row[2:]) for row in rows]
+
+    def get_stats(
+        self,
+        url: str,
+        region: str = "us",
+        vendor: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> PriceStats:
+        start = float("-inf") if start is None else start
+        end = float("inf") if end is None else end
+
+        with self.__lock:
+            vendors = (
+                [vendor]
+                if vendor is not None
+                else [
+                    row[0]
+                    for row in self.__db.execute(
+                        "SELECT DISTINCT vendor FROM prices WHERE url = ? AND region = ?",
+                        (url, region),
+                    )
+                ]
+            )
+
+            totals = []
+            changes = 0
+            last = None
+            for name in vendors:
+                series = (url, region, name)
+
+                # The run in progress when the window opens counts towards it too
+                current = self.__point_at(series, start)
+                if current is not None and current.price is not None:
+                    totals.append(current.price.total)
+
+                low, high, count = self.__db.execute(
+                    "SELECT MIN(total), MAX(total), COUNT(*) FROM prices WHERE url = ? AND region = ? AND vendor = ? AND observed_at > ? AND observed_at <= ?",
+                    (*series, start, end),
+                ).fetchone()
+                totals += [total for total in (low, high) if total is not None]
+                changes += count
+
+                # The last point is the cheapest price any vendor had when the window closed
+                point = self.__point_at(series, end)
+                if point is not None and point.price is not None:
+                    if last is None or point.price.total < last.price.total:
+                        last = point
+
+        return PriceStats(
+            min=min(totals, default=None),
+            max=max(totals, default=None),
+            last=last,
+            changes=changes,
+        )
+
+    def clear(self):
+        with self.__lock:
+            self.__states.clear()
+            self.__db.execute("DELETE FROM prices")
+            self.__db.commit()
+
+    def close(self):
+        if self.__db is not None:
+            self.__db.close()
+            self.__db = None
+
+    def __point_at(
+        self, series: tuple[str, str, str], at: float
+    ) -> Optional[PricePoint]:
+        row = self.__db.execute(
+            f"SELECT observed_at, {PRICE_COLUMNS} FROM prices WHERE url = ? AND region = ? AND vendor = ? AND observed_at <= ? ORDER BY observed_at DESC LIMIT 1",
+            (*series, at),
+        ).fetchone()
+        return None if row is None else row_point(series[2], row[0], row[1:])
+
+    def __get_states(self, url: str, region: str) -> dict[str, tuple]:
+        states = self.__states.get((url, region))
+        if states is not None:
+            self.__states.move_to_end((url, region))
+            return states
+
+        # Only the latest point of each vendor is read back, not the whole history
+        states = self.__states[(url, region)] = {}
+        while len(self.__states) > self.max_series:
+            self.__states.popitem(last=False)
+        for row in self.__db.execute(
+            f"""
+            SELECT vendor, {PRICE_COLUMNS} FROM prices AS p
+            WHERE url = ? AND region = ? AND observed_at = (
+                SELECT MAX(observed_at) FROM prices
+                WHERE url = p.url AND region = p.region AND vendor = p.vendor
+            )
+            """,
+            (url, region),
+        ):
+            states[row[0]] = tuple(row[1:])
+        return states
@@ -0,0 +1,86 @@
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+from pyquery.text import extract_text
+from functools import lru_cache
+import re
+from .scraper import Scraper
+from requests import Response
+
+PAGE_TITLE_CLASS_RE = re.compile(rb'class="(?:[^"]*\s)?pageTitle(?:\s[^"]*)?"')
+
+# Selectors cssselect translates differently from requests_html, written as XPath instead
+XPATH_SELECTORS = {
+    "section div:has(ul)": "descendant-or-self::section//div[descendant::ul]",
+}
+
+
+# Selectors are compiled to XPath once rather than on every lookup
+@lru_cache
+def selector(css: str):
+    xpath = XPATH_SELECTORS.get(css)
+    if xpath is not None:
+        return etree.XPath(xpath)
+    return CSSSelector(css)
+
+
+@lru_cache
+def html_parser(encoding: str) -> lxml_html.HTMLParser:
+    return lxml_html.HTMLParser(encoding=encoding)
+
+
+# Parses responses straight into an lxml tree, skipping requests_html's PyQuery wrappers
+class LxmlScraper(Scraper):
+    def get_root(self, res: Response):
+        html = res.html
+        raw = html.raw_html
+        cached = getattr(res, "_pypartpicker_tree", None)
+        # Rendering a response replaces its HTML, so only reuse a tree built from the current markup
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+
+        tree = lxml_html.document_fromstring(raw, parser=html_parser(html.encoding))
+        res._pypartpicker_tree = (raw, tree)
+        return tree
+
+    def get_head_root(self, res: Response):
+        html = res.html
+        raw = html.raw_html
+        for attr in ("_pypartpicker_tree", "_pypartpicker_head_tree"):
+            cached = getattr(res, attr, None)
+            if cached is not None and cached[0] is raw:
+                return cached[1]
+
+        # Only parse as far as <title> and the first .pageTitle, which is all the page checks need
+        end = raw.find(b"</title>")
+        if end == -1:
+            return self.get_root(res)
+        end += len(b"</title>")
+
+        match = PAGE_TITLE_CLASS_RE.search(raw, end)
+        if match is not None:
+            close = raw.find(b"</", match.end())
+            end = raw.find(b">", close) + 1
+            if close == -1 or end == 0:
+                return self.get_root(res)
+
+        tree = lxml_html.document_fromstring(
+            raw[:end], parser=html_parser(html.encoding)
+        )
+        res._pypartpicker_head_tree = (raw, tree)
+        return tree
+
+    def get_partial_root(self, res: Response, raw: bytes):
+        return lxml_html.document_fromstring(raw, parser=html_parser(res.html.encoding))
+
+    def find(self, element, css: str):
+        results = selector(css)(element)
+        return results[0] if len(results) > 0 else None
+
+    def find_all(self, element, css: str) -> list:
+        return selector(css)(element)
+
+    def text(self, element) -> str:
+        return extract_text(element)
+
+    def attr(self, element, name: str) -> str:
+        return element.attrib[name]
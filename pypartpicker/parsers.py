@@ -0,0 +1,53 @@
+from typing import Any, Optional
+from requests_html import HTML, HTMLSession, DEFAULT_ENCODING
+from .scraper import Scraper
+from .lxml_scraper import LxmlScraper
+
+PARSERS = {
+    "requests_html": Scraper,
+    "lxml": LxmlScraper,
+}
+
+
+def get_scraper(parser: str) -> Scraper:
+    if parser not in PARSERS:
+        raise ValueError(
+            f"Invalid parser: {parser}, must be one of {', '.join(PARSERS)}."
+        )
+    return PARSERS[parser]()
+
+
+class RawResponse:
+    def __init__(self, url: str, html: HTML):
+        self.url = url
+        self.html = html
+
+
+# Per process state for parse_raw, so executor workers don't rebuild them for every page
+scrapers: dict[str, Scraper] = {}
+session: Optional[HTMLSession] = None
+
+
+def parse_raw(
+    parser: str,
+    method: str,
+    url: str,
+    raw: bytes,
+    encoding: Optional[str] = None,
+    **kwargs,
+) -> Any:
+    # Module level and taking only bytes and strings so it can be sent to a process pool
+    global session
+    if session is None:
+        session = HTMLSession()
+
+    if parser not in scrapers:
+        scrapers[parser] = get_scraper(parser)
+
+    html = HTML(
+        session=session,
+        url=url,
+        html=raw,
+        default_encoding=encoding or DEFAULT_ENCODING,
+    )
+    return getattr(scrapers[parser], method)(RawResponse(url, html), **kwargs)
@@ -0,0 +1,159 @@
+from typing import Callable, Optional
+import asyncio
+import sqlite3
+import threading
+import time
+
+
+class Bucket:
+    def __init__(self, tokens: float, rate: float, updated: float):
+        self.tokens = tokens
+        self.rate = rate
+        self.updated = updated
+
+    def __repr__(self):
+        return f"<Bucket tokens={self.tokens:.2f} rate={self.rate:.3f}>"
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 5,
+        min_rate: float = 0.05,
+        max_rate: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        increase: float = 0.05,
+        path: Optional[str] = None,
+    ):
+        if rate <= 0 or min_rate <= 0:
+            raise ValueError("rate and min_rate must be positive.")
+
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = rate if max_rate is None else max_rate
+        self.decrease_factor = decrease_factor
+        self.increase = increase
+
+        self.__lock = threading.Lock()
+        self.__buckets: dict[str, Bucket] = {}
+
+        # Bucket state lives in SQLite when shared between processes, the write lock taken by
+        # BEGIN IMMEDIATE serialises updates across all of them
+        self.__db = None
+        if path is not None:
+            self.__db = sqlite3.connect(
+                path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            self.__db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS buckets (
+                    host TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    rate REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+                """
+            )
+
+    def acquire(self, host: str):
+        delay = self.__update(host, self.__reserve)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self, host: str):
+        delay = await self.__aupdate(host, self.__reserve)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def penalize(self, host: str) -> float:
+        return self.__update(host, self.__decrease)
+
+    async def apenalize(self, host: str) -> float:
+        return await self.__aupdate(host, self.__decrease)
+
+    def reward(self, host: str) -> float:
+        return self.__update(host, self.__increase)
+
+    async def areward(self, host: str) -> float:
+        return await self.__aupdate(host, self.__increase)
+
+    def get_rate(self, host: str) -> float:
+        return self.__update(host, lambda bucket: bucket.rate)
+
+    def close(self):
+        if self.__db is not None:
+            self.__db.close()
+            self.__db = None
+
+    def __reserve(self, bucket: Bucket) -> float:
+        # Tokens may go negative, each caller sleeps until its own token has refilled
+        bucket.tokens -= 1
+        if bucket.tokens >= 0:
+            return 0
+        return -bucket.tokens / bucket.rate
+
+    def __decrease(self, bucket: Bucket) -> float:
+        bucket.rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+        bucket.tokens = min(bucket.tokens, 0)
+        return bucket.rate
+
+    def __increase(self, bucket: Bucket) -> float:
+        bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+        return bucket.rate
+
+    def __refill(self, bucket: Bucket, now: float):
+        bucket.tokens = min(
+            self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate
+        )
+        bucket.updated = now
+
+    def __update(self, host: str, update: Callable[[Bucket], float]) -> float:
+        with self.__lock:
+            if self.__db is None:
+                return self.__update_memory(host, update)
+            return self.__update_shared(host, update)
+
+    async def __aupdate(self, host: str, update: Callable[[Bucket], float]) -> float:
+        if self.__db is None:
+            return self.__update(host, update)
+
+        # Waiting on SQLite's write lock would block the event loop, so shared updates run in a thread
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.__update, host, update
+        )
+
+    def __update_memory(self, host: str, update: Callable[[Bucket], float]) -> float:
+        now = time.monotonic()
+        bucket = self.__buckets.get(host)
+        if bucket is None:
+            bucket = self.__buckets[host] = Bucket(self.burst, self.rate, now)
+
+        self.__refill(bucket, now)
+        return update(bucket)
+
+    def __update_shared(self, host: str, update: Callable[[Bucket], float]) -> float:
+        # Wall clock time since monotonic clocks aren't comparable between processes
+        now = time.time()
+
+        self.__db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.__db.execute(
+                "SELECT tokens, rate, updated FROM buckets WHERE host = ?", (host,)
+            ).fetchone()
+            bucket = Bucket(self.burst, self.rate, now) if row is None else Bucket(*row)
+
+            self.__refill(bucket, now)
+            result = update(bucket)
+
+            self.__db.execute(
+                "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)",
+                (host, bucket.tokens, bucket.rate, bucket.updated),
+            )
+            self.__db.execute("COMMIT")
+        except BaseException:
+            self.__db.execute("ROLLBACK")
+            raise
+
+        return result
@@ -6,6 +6,8 @@ ID_RE = re.compile("(\w{6})")
 PRODUCT_URL_RE = re.compile(PCPP_BASE_RE.pattern + PRODUCT_PATH + ID_RE.pattern)
 PRODUCT_RATINGS_RE = re.compile("\(([0-9]+) Ratings?, ([0-9]\.[0-9]) Average\)")
 DECIMAL_RE = re.compile("[0-9]+\.[0-9]+")
+LISTING_TITLE_RE = re.compile("^Choose (an? )?", re.IGNORECASE)
+RATING_COUNT_RE = re.compile("\(([0-9]+)\)")
 PART_LIST_URL_RE = re.compile(
     PCPP_BASE_RE.pattern + PART_LIST_PATH + ID_RE.pattern
 )
@@ -0,0 +1,175 @@
+from typing import Optional
+import asyncio
+import threading
+import pyppeteer
+from pyppeteer.errors import PyppeteerError, TimeoutError as PyppeteerTimeoutError
+
+CLOUDFLARE_TITLE = "Just a moment..."
+
+
+class RenderResult:
+    def __init__(self, url: str, content: str, cookies: list[dict], user_agent: str):
+        self.url = url
+        self.content = content
+        self.cookies = cookies
+        self.user_agent = user_agent
+
+    def __repr__(self):
+        return f"<RenderResult url={self.url}>"
+
+
+class Renderer:
+    def __init__(
+        self,
+        max_pages: int = 2,
+        max_uses: int = 50,
+        timeout: float = 30,
+        launch_options: Optional[dict] = None,
+    ):
+        self.max_pages = max_pages
+        self.max_uses = max_uses
+        self.timeout = timeout
+        self.launch_options = launch_options or {}
+
+        self.__lock = threading.Lock()
+        self.__loop = None
+        self.__thread = None
+        self.__browser = None
+        self.__semaphore = None
+        self.__launch_lock = None
+        self.__idle_pages = []
+        self.__page_uses = {}
+
+    def render(self, url: str, cookies: Optional[dict] = None) -> RenderResult:
+        return self.__submit(url, cookies).result()
+
+    async def arender(self, url: str, cookies: Optional[dict] = None) -> RenderResult:
+        return await asyncio.wrap_future(self.__submit(url, cookies))
+
+    def close(self):
+        with self.__lock:
+            if self.__loop is None:
+                return
+
+            asyncio.run_coroutine_threadsafe(
+                self.__close_browser(), self.__loop
+            ).result()
+            self.__loop.call_soon_threadsafe(self.__loop.stop)
+            self.__thread.join()
+            self.__loop.close()
+            self.__loop = None
+            self.__thread = None
+            # Bound to the closed loop, a later render starts a new one
+            self.__semaphore = None
+            self.__launch_lock = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __submit(self, url: str, cookies: Optional[dict]):
+        # The browser lives on its own loop thread so sync clients, batch workers and async clients can all share it
+        with self.__lock:
+            if self.__loop is None:
+                self.__loop = asyncio.new_event_loop()
+                self.__thread = threading.Thread(
+                    target=self.__loop.run_forever,
+                    name="pypartpicker-renderer",
+                    daemon=True,
+                )
+                self.__thread.start()
+
+            return asyncio.run_coroutine_threadsafe(
+                self.__render(url, cookies), self.__loop
+            )
+
+    async def __render(self, url: str, cookies: Optional[dict]) -> RenderResult:
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.max_pages)
+            self.__launch_lock = asyncio.Lock()
+
+        # Renders beyond max_pages wait here in arrival order
+        async with self.__semaphore:
+            page = await self.__acquire_page()
+            try:
+                if cookies:
+                    await page.setCookie(
+                        *(
+                            {"name": name, "value": value, "url": url}
+                            for name, value in cookies.items()
+                        )
+                    )
+
+                await page.goto(url, {"timeout": int(self.timeout * 1000)})
+                try:
+                    await page.waitForFunction(
+                        f"document.title !== {CLOUDFLARE_TITLE!r}",
+                        {"timeout": int(self.timeout * 1000)},
+                    )
+                except PyppeteerTimeoutError:
+                    # Still challenged, the client sees the challenge page and retries
+                    pass
+
+                result = RenderResult(
+                    url=url,
+                    content=await page.content(),
+                    cookies=await page.cookies(),
+                    user_agent=await self.__browser.userAgent(),
+                )
+            except BaseException:
+                await self.__discard_page(page)
+                raise
+
+            await self.__release_page(page)
+            return result
+
+    async def __acquire_page(self):
+        # Concurrent first renders wait for the one browser rather than each launching their own
+        async with self.__launch_lock:
+            if self.__browser is None:
+                self.__browser = await pyppeteer.launch(
+                    **{
+                        "headless": True,
+                        "args": ["--no-sandbox"],
+                        **self.launch_options,
+                        # Signal handlers can only be installed from the main thread
+                        "handleSIGINT": False,
+                        "handleSIGTERM": False,
+                        "handleSIGHUP": False,
+                    }
+                )
+
+        if len(self.__idle_pages) > 0:
+            return self.__idle_pages.pop()
+
+        page = await self.__browser.newPage()
+        self.__page_uses[page] = 0
+        return page
+
+    async def __release_page(self, page):
+        self.__page_uses[page] += 1
+
+        # Recycle pages after a number of renders so their memory doesn't grow without bound
+        if self.__page_uses[page] >= self.max_uses:
+            await self.__discard_page(page)
+            return
+
+        self.__idle_pages.append(page)
+
+    async def __discard_page(self, page):
+        self.__page_uses.pop(page, None)
+        try:
+            await page.close()
+        except PyppeteerError:
+            pass
+
+    async def __close_browser(self):
+        for page in self.__idle_pages:
+            await self.__discard_page(page)
+        self.__idle_pages = []
+
+        if self.__browser is not None:
+            await self.__browser.close()
+            self.__browser = None
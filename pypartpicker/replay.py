@@ -0,0 +1,294 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from requests_html import HTMLResponse, HTMLSession
+from typing import Optional
+from .responses import build_response
+import asyncio
+import base64
+import gzip
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+
+CLOUDFLARE_PAGE = (
+    b"<html><head><title>Just a moment...</title></head><body></body></html>"
+)
+RATE_LIMIT_PAGE = (
+    b"<html><head><title>Unavailable</title></head>"
+    b'<body><h1 class="pageTitle">Verification</h1></body></html>'
+)
+
+# Bodies are stored decoded, so headers describing the original transfer no longer apply
+DROPPED_HEADERS = {
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+    "connection",
+}
+
+
+class ArchivedResponse:
+    def __init__(
+        self, url: str, status_code: int, headers: dict[str, str], content: bytes
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "content": base64.b64encode(self.content).decode(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ArchivedResponse":
+        return cls(
+            data["url"],
+            data["status_code"],
+            data["headers"],
+            base64.b64decode(data["content"]),
+        )
+
+    def __repr__(self):
+        return f"<ArchivedResponse url={self.url} status_code={self.status_code}>"
+
+
+class Archive:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+
+        self.__lock = threading.Lock()
+        self.__responses: dict[str, ArchivedResponse] = {}
+
+        if path is not None and os.path.exists(path):
+            # Later lines win, so re-recording a URL replaces its earlier response
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        response = ArchivedResponse.from_dict(json.loads(line))
+                        self.__responses[response.url] = response
+
+    def add(
+        self, url: str, status_code: int, headers: dict[str, str], content: bytes
+    ) -> ArchivedResponse:
+        response = ArchivedResponse(
+            url,
+            status_code,
+            {
+                key: value
+                for key, value in headers.items()
+                if key.lower() not in DROPPED_HEADERS
+            },
+            content,
+        )
+
+        with self.__lock:
+            self.__responses[url] = response
+            if self.path is not None:
+                # Each append is its own gzip member, so a crash never loses earlier recordings
+                with gzip.open(self.path, "at", encoding="utf-8") as f:
+                    f.write(json.dumps(response.to_dict()) + "\n")
+
+        return response
+
+    def get(self, url: str) -> Optional[ArchivedResponse]:
+        return self.__responses.get(url)
+
+    def urls(self) -> list[str]:
+        return list(self.__responses)
+
+    def __len__(self) -> int:
+        return len(self.__responses)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.__responses
+
+
+class RecordingAdapter(HTTPAdapter):
+    def __init__(self, archive: Archive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        res = super().send(request, **kwargs)
+        self.archive.add(request.url, res.status_code, res.headers, res.content)
+        return res
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, archive: Archive, latency: float = 0):
+        super().__init__()
+        self.archive = archive
+        self.latency = latency
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        archived = self.archive.get(request.url)
+        if archived is None:
+            raise LookupError(f"{request.url} is not in the archive.")
+
+        res = Response()
+        res.url = request.url
+        res.request = request
+        res.status_code = archived.status_code
+        res.headers = CaseInsensitiveDict(archived.headers)
+        res._content = archived.content
+        res.encoding = get_encoding_from_headers(res.headers)
+        return res
+
+    def close(self):
+        pass
+
+
+class ReplayRetriever:
+    def __init__(self, archive: Archive, latency: float = 0):
+        self.archive = archive
+        self.latency = latency
+        self.session = HTMLSession()
+
+    def __call__(self, url: str) -> HTMLResponse:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return self.build(url)
+
+    def build(self, url: str) -> HTMLResponse:
+        archived = self.archive.get(url)
+        if archived is None:
+            raise LookupError(f"{url} is not in the archive.")
+        return build_response(
+            url,
+            archived.status_code,
+            archived.headers,
+            archived.content,
+            self.session,
+        )
+
+
+class AsyncReplayRetriever(ReplayRetriever):
+    async def __call__(self, url: str) -> HTMLResponse:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return self.build(url)
+
+
+class ForwardingAdapter(HTTPAdapter):
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        # Sends the request to the replay server, which reads the original host back from X-Forwarded-Host
+        url = urllib.parse.urlparse(request.url)
+        forwarded = request.copy()
+        forwarded.url = self.base_url + request.path_url
+        forwarded.headers["X-Forwarded-Host"] = url.netloc
+
+        res = super().send(forwarded, **kwargs)
+        res.url = request.url
+        res.request = request
+        return res
+
+
+class ReplayServer:
+    def __init__(
+        self,
+        archive: Archive,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0,
+        cloudflare_rate: float = 0,
+        rate_limit_rate: float = 0,
+        seed: Optional[int] = None,
+    ):
+        self.archive = archive
+        self.latency = latency
+        self.cloudflare_rate = cloudflare_rate
+        self.rate_limit_rate = rate_limit_rate
+
+        self.__random = random.Random(seed)
+        self.__random_lock = threading.Lock()
+        self.__server = ThreadingHTTPServer((host, port), self.__handler())
+        self.__server.daemon_threads = True
+        self.__thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def adapter(self) -> ForwardingAdapter:
+        return ForwardingAdapter(self.url)
+
+    def start(self) -> "ReplayServer":
+        if self.__thread is None:
+            self.__thread = threading.Thread(
+                target=self.__server.serve_forever,
+                name="pypartpicker-replay",
+                daemon=True,
+            )
+            self.__thread.start()
+        return self
+
+    def close(self):
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __respond(self, host: str, path: str) -> tuple[int, dict[str, str], bytes]:
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        with self.__random_lock:
+            roll = self.__random.random()
+
+        if roll < self.cloudflare_rate:
+            return 403, {"Content-Type": "text/html"}, CLOUDFLARE_PAGE
+        if roll < self.cloudflare_rate + self.rate_limit_rate:
+            return 429, {"Content-Type": "text/html"}, RATE_LIMIT_PAGE
+
+        archived = self.archive.get(f"https://{host}{path}")
+        if archived is None:
+            return 404, {"Content-Type": "text/plain"}, b"Not in archive"
+        return archived.status_code, archived.headers, archived.content
+
+    def __handler(self) -> type[BaseHTTPRequestHandler]:
+        respond = self.__respond
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status_code, headers, content = respond(
+                    self.headers.get("X-Forwarded-Host", "pcpartpicker.com"), self.path
+                )
+                self.send_response(status_code)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,31 @@
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from requests_html import HTML, HTMLResponse, BaseSession, DEFAULT_ENCODING
+
+
+def build_response(
+    url: str,
+    status_code: int,
+    headers: dict,
+    content: bytes,
+    session: BaseSession,
+) -> HTMLResponse:
+    res = Response()
+    res.url = url
+    res.status_code = status_code
+    res.headers = CaseInsensitiveDict(headers)
+    res.encoding = get_encoding_from_headers(res.headers)
+    res._content = content
+    return HTMLResponse._from_response(res, session)
+
+
+def apply_rendered_html(res: HTMLResponse, content: str):
+    # Swaps in the rendered markup the same way requests_html's own render() does
+    html = HTML(
+        session=res.html.session,
+        url=res.url,
+        html=content.encode(DEFAULT_ENCODING),
+        default_encoding=DEFAULT_ENCODING,
+    )
+    res.html.__dict__.update(html.__dict__)
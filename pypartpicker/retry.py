@@ -0,0 +1,129 @@
+from typing import Optional
+from .errors import CircuitOpenException
+from requests.exceptions import ConnectionError, Timeout
+import random
+import threading
+import time
+
+ERROR_CLOUDFLARE = "cloudflare"
+ERROR_RATE_LIMIT = "rate_limit"
+ERROR_SERVER = "server_error"
+ERROR_TIMEOUT = "timeout"
+
+TIMEOUT_EXCEPTIONS = (Timeout, ConnectionError)
+
+
+class RetryRule:
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        delay: float = 1,
+        backoff: float = 2,
+        max_delay: float = 60,
+        jitter: float = 0.5,
+    ):
+        self.max_attempts = max_attempts
+        self.delay = delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def get_delay(self, attempt: int) -> Optional[float]:
+        # None once the attempt that just failed was the last one allowed
+        if attempt + 1 >= self.max_attempts:
+            return None
+
+        delay = min(self.max_delay, self.delay * self.backoff**attempt)
+        # Jitter spreads out clients that failed at the same moment
+        return delay - random.uniform(0, delay * self.jitter)
+
+    def __repr__(self):
+        return f"<RetryRule max_attempts={self.max_attempts} delay={self.delay}>"
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        cloudflare: Optional[RetryRule] = None,
+        rate_limit: Optional[RetryRule] = None,
+        server_error: Optional[RetryRule] = None,
+        timeout: Optional[RetryRule] = None,
+    ):
+        self.rules = {
+            ERROR_CLOUDFLARE: cloudflare or RetryRule(),
+            ERROR_RATE_LIMIT: rate_limit or RetryRule(5, delay=5, max_delay=120),
+            ERROR_SERVER: server_error or RetryRule(),
+            ERROR_TIMEOUT: timeout or RetryRule(),
+        }
+
+    def get_delay(self, error: str, attempt: int) -> Optional[float]:
+        return self.rules[error].get_delay(attempt)
+
+
+def default_retry_policy(
+    max_retries: int, retry_delay: float, retry_rate_limits: bool
+) -> RetryPolicy:
+    # Matches the behaviour from before retry policies existed: a fixed delay between Cloudflare retries, rate limit
+    # pages only retried when a rate limiter is slowing requests down, and everything else raised straight away
+    return RetryPolicy(
+        cloudflare=RetryRule(max_retries, retry_delay, backoff=1, jitter=0),
+        rate_limit=RetryRule(max_retries if retry_rate_limits else 1, 0, jitter=0),
+        server_error=RetryRule(1),
+        timeout=RetryRule(1),
+    )
+
+
+class Circuit:
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.__lock = threading.Lock()
+        self.__circuits: dict[str, Circuit] = {}
+
+    def check(self, host: str):
+        with self.__lock:
+            circuit = self.__circuits.get(host)
+            if circuit is None or circuit.opened_at is None:
+                return
+
+            remaining = circuit.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenException(
+                    f"Requests to {host} are failing, retrying in {remaining:.1f}s."
+                )
+
+            # Half open, this request is let through as a trial and the rest keep failing fast until it finishes
+            circuit.opened_at = time.monotonic()
+
+    def is_open(self, host: str) -> bool:
+        with self.__lock:
+            circuit = self.__circuits.get(host)
+            return circuit is not None and circuit.opened_at is not None
+
+    def record_success(self, host: str):
+        with self.__lock:
+            self.__circuits.pop(host, None)
+
+    def record_failure(self, host: str):
+        with self.__lock:
+            circuit = self.__circuits.get(host)
+            if circuit is None:
+                circuit = self.__circuits[host] = Circuit()
+
+            circuit.failures += 1
+            if circuit.failures >= self.failure_threshold:
+                circuit.opened_at = time.monotonic()
+
+    def reset(self, host: Optional[str] = None):
+        with self.__lock:
+            if host is None:
+                self.__circuits.clear()
+            else:
+                self.__circuits.pop(host, None)
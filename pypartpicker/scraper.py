@@ -1,8 +1,10 @@
-from typing import Optional
+from typing import Any, Callable, Iterable, Optional
+from functools import cache
 from requests_html import HTML
 import urllib.parse
 from .types import (
     Part,
+    LazyPart,
     Rating,
     Vendor,
     Price,
@@ -17,6 +19,182 @@ from .regex import *
 from requests import Response
 
 
+def search_result_type(name: str) -> Optional[str]:
+    type = None
+
+    match "(".join(name.split("(")[:-1]).split(" ")[-4:-1]:
+        case [*_, "Processor"]:
+            type = "CPU"
+        case [_, "Fan", "Controller"]:
+            type = "Fan Controller"
+        case [_, "Network", "Adapter"]:
+            type = "Wired Network Adapter"
+        case [_, "Wi-Fi", "Adapter"]:
+            type = "Wireless Network Adapter"
+        case [_, "Video", "Card"]:
+            type = "Video Card"
+        case [_, "CPU", "Cooler"]:
+            type = "CPU Cooler"
+        case [_, "Power", "Supply"]:
+            type = "Power Supply"
+        case [_, "Thermal", "Paste"]:
+            type = "Thermal Compound"
+        case [_, "Sound", "Card"]:
+            type = "Sound Card"
+        case [_, "Fans", _] | [*_, "Fan"]:
+            type = "Case Fan"
+        case ["External", _, _] | [_, "External", _]:
+            type = "External Storage"
+        case [*_, "Writer"]:
+            type = "Optical Drive"
+        case [*_, "Headset"] | [*_, "Headphones"]:
+            type = "Headphones"
+        case ["Solid", "State", "Drive"] | [_, "Hard", "Drive"]:
+            type = "Storage"
+        case [*_, a]:
+            type = a
+    if "Windows" in name:
+        type = "Operating System"
+
+    return type
+
+
+def cheapest_vendor_price(vendors: list[Vendor]) -> tuple[Optional[Price], bool]:
+    available_vendors = list(filter(lambda v: v.in_stock, vendors))
+    if len(available_vendors) == 0:
+        return None, False
+
+    return sorted(available_vendors, key=lambda v: v.price.total)[0].price, True
+
+
+def listing_type(title: str) -> str:
+    # Category pages are titled "Choose A CPU", "Choose An Operating System" and so on
+    return LISTING_TITLE_RE.sub("", title.strip())
+
+
+def listing_image_url(src: str) -> str:
+    return "https:" + src if src.startswith("//") else src
+
+
+def listing_price(raw: str) -> Optional[Price]:
+    # Price cells end with an "Add" button and are otherwise empty for parts nobody sells
+    raw = raw.strip().removesuffix("Add").strip()
+    total = DECIMAL_RE.search(raw.replace(",", ""))
+    if total is None:
+        return None
+
+    return Price(
+        base=None,
+        discounts=None,
+        shipping=None,
+        tax=None,
+        total=float(total.group()),
+        currency=DECIMAL_RE.sub("", raw.replace(",", "")).strip(),
+    )
+
+
+PART_FIELDS = (
+    "name",
+    "type",
+    "image_urls",
+    "url",
+    "cheapest_price",
+    "in_stock",
+    "vendors",
+    "rating",
+    "specs",
+    "reviews",
+)
+
+# Fields found in the page title or the prices table, which sit ahead of specs and reviews in the markup
+PRICES_REGION_FIELDS = frozenset(
+    ("name", "type", "url", "rating", "cheapest_price", "in_stock", "vendors")
+)
+
+
+def check_part_fields(fields: Optional[Iterable[str]]) -> Optional[frozenset[str]]:
+    if fields is None:
+        return None
+
+    fields = frozenset(fields)
+    invalid = fields.difference(PART_FIELDS)
+    if len(invalid) > 0:
+        raise ValueError(f"Invalid part fields: {', '.join(sorted(invalid))}")
+    return fields
+
+
+def truncate_after_prices(raw: bytes) -> Optional[bytes]:
+    start = raw.find(b'id="prices"')
+    if start == -1:
+        return None
+
+    end = raw.find(b"</table>", start)
+    if end == -1:
+        return None
+
+    return raw[: end + len(b"</table>")]
+
+
+def build_part(
+    name: str,
+    type: str,
+    url: str,
+    loaders: dict[str, Callable[[], Any]],
+    lazy: bool = False,
+    fields: Optional[frozenset[str]] = None,
+) -> Part:
+    def wanted(field: str) -> bool:
+        return fields is None or field in fields
+
+    rating = loaders["rating"]() if wanted("rating") else None
+
+    if lazy:
+        part = LazyPart(
+            name=name,
+            type=type,
+            url=url,
+            rating=rating,
+            loaders={
+                field: loader
+                for field, loader in loaders.items()
+                if field != "rating" and wanted(field)
+            },
+        )
+
+        # Stock and cheapest price come from the vendor table, so they only parse it when first needed
+        vendors = cache(
+            lambda: part.vendors if wanted("vendors") else loaders["vendors"]()
+        )
+        if wanted("cheapest_price"):
+            part.add_loader(
+                "cheapest_price", lambda: cheapest_vendor_price(vendors())[0]
+            )
+        if wanted("in_stock"):
+            part.add_loader("in_stock", lambda: cheapest_vendor_price(vendors())[1])
+        return part
+
+    vendors = None
+    cheapest_price = None
+    in_stock = None
+    if wanted("vendors") or wanted("cheapest_price") or wanted("in_stock"):
+        vendors = loaders["vendors"]()
+        cheapest_price, in_stock = cheapest_vendor_price(vendors)
+
+    return Part(
+        name=name,
+        type=type,
+        image_urls=loaders["image_urls"]() if wanted("image_urls") else None,
+        url=url,
+        cheapest_price=cheapest_price if wanted("cheapest_price") else None,
+        in_stock=in_stock if wanted("in_stock") else None,
+        vendors=vendors if wanted("vendors") else None,
+        rating=rating,
+        specs=loaders["specs"]() if wanted("specs") else None,
+        reviews=loaders["reviews"]() if wanted("reviews") else None,
+    )
+
+
+# Parsing is written once against find, find_all, text and attr, so a backend only has to provide those
 class Scraper:
     def __init__(self):
         pass
@@ -27,17 +205,55 @@ class Scraper:
 
         return f"https://{region}.pcpartpicker.com"
 
+    def get_root(self, res: Response) -> Any:
+        return res.html
+
+    def get_head_root(self, res: Response) -> Any:
+        # Enough of the page for the Cloudflare and rate limit checks
+        return self.get_root(res)
+
+    def get_partial_root(self, res: Response, raw: bytes) -> Any:
+        return HTML(
+            session=res.html.session,
+            url=res.url,
+            html=raw,
+            default_encoding=res.html.encoding,
+        )
+
+    def get_part_root(self, res: Response, fields: Optional[frozenset[str]]) -> Any:
+        if fields is not None and fields <= PRICES_REGION_FIELDS:
+            # Only build a DOM for the page up to the end of the prices table
+            truncated = truncate_after_prices(res.html.raw_html)
+            if truncated is not None:
+                return self.get_partial_root(res, truncated)
+        return self.get_root(res)
+
+    def find(self, element: HTML, selector: str) -> Optional[HTML]:
+        return element.find(selector, first=True)
+
+    def find_all(self, element: HTML, selector: str) -> list[HTML]:
+        return element.find(selector)
+
+    def text(self, element: HTML) -> str:
+        return element.text
+
+    def attr(self, element: HTML, name: str) -> str:
+        return element.attrs[name]
+
     def is_cloudflare(self, res: Response) -> bool:
-        return res.html.find("title", first=True).text == "Just a moment..."
+        head = self.get_head_root(res)
+        return self.text(self.find(head, "title")) == "Just a moment..."
 
     def is_rate_limit(self, res: Response) -> bool:
-        title = res.html.find(".pageTitle", first=True)
+        head = self.get_head_root(res)
+        title = self.find(head, ".pageTitle")
         if title is None:
-            return res.html.find("title", first=True).text == "Unavailable"
-        return title.text == "Verification"
+            return self.text(self.find(head, "title")) == "Unavailable"
+        return self.text(title) == "Verification"
 
     def prepare_part_url(self, id_url: str, region: str = None) -> str:
         match = PRODUCT_URL_RE.match(id_url)
+        override_region = region
         if match is None:
             url = ID_RE.match(id_url)
             if url is None:
@@ -49,93 +265,127 @@ class Scraper:
             region = "us" if match.group(2) is None else match.group(2)[:-1]
             id_url = match.group(3)
 
+        if override_region is not None:
+            region = override_region
+
         if id_url is None:
             raise ValueError("Invalid pcpartpicker product URL or ID.")
 
         return self.__get_base_url(region) + PRODUCT_PATH + id_url
 
-    def parse_part(self, res: Response) -> Part:
-        html: HTML = res.html
-        title_container = html.find(".wrapper__pageTitle", first=True)
-        sidebar = html.find(".sidebar-content", first=True)
+    def parse_part(
+        self,
+        res: Response,
+        lazy: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Part:
+        fields = check_part_fields(fields)
+        html = self.get_part_root(res, fields)
+        title_container = self.find(html, ".wrapper__pageTitle")
+        sidebar = self.find(html, ".sidebar-content")
 
         # Part name and type
-        type = title_container.find(".breadcrumb", first=True).text
-        name = title_container.find(".pageTitle", first=True).text
-
-        # Rating
-        rating = None
-        star_container = title_container.find(".product--rating", first=True)
-        if star_container is not None:
-            stars = (
-                len(star_container.find(".shape-star-full"))
-                + len(star_container.find(".shape-star-half")) * 0.5
-            )
-            rating_info = PRODUCT_RATINGS_RE.match(
-                title_container.find("section div:has(ul)", first=True).text
-            )
-            count = rating_info.group(1)
-            average = rating_info.group(2)
-            rating = Rating(stars, int(count), float(average))
+        type = self.text(self.find(title_container, ".breadcrumb"))
+        name = self.text(self.find(title_container, ".pageTitle"))
+
+        base_url = "https://" + urllib.parse.urlparse(res.url).netloc
+
+        return build_part(
+            name=name,
+            type=type,
+            url=res.url,
+            loaders={
+                "rating": lambda: self.__parse_part_rating(title_container),
+                "specs": lambda: self.__parse_part_specs(sidebar),
+                "image_urls": lambda: self.__parse_part_images(sidebar),
+                "vendors": lambda: self.__parse_part_vendors(html),
+                "reviews": lambda: self.__parse_part_reviews(html, base_url),
+            },
+            lazy=lazy,
+            fields=fields,
+        )
+
+    def __parse_part_rating(self, title_container: HTML) -> Optional[Rating]:
+        star_container = self.find(title_container, ".product--rating")
+        if star_container is None:
+            return None
+
+        stars = (
+            len(self.find_all(star_container, ".shape-star-full"))
+            + len(self.find_all(star_container, ".shape-star-half")) * 0.5
+        )
+        rating_info = PRODUCT_RATINGS_RE.match(
+            self.text(self.find(title_container, "section div:has(ul)"))
+        )
+        count = rating_info.group(1)
+        average = rating_info.group(2)
+        return Rating(stars, int(count), float(average))
 
-        # Specs
+    def __parse_part_specs(self, sidebar: HTML) -> dict[str, str]:
         specs = {}
-        specs_block = sidebar.find(".specs", first=True)
-        for spec in specs_block.find(".group--spec"):
-            spec_title = spec.find(".group__title", first=True).text
-            spec_value = spec.find(".group__content", first=True).text
+        specs_block = self.find(sidebar, ".specs")
+        for spec in self.find_all(specs_block, ".group--spec"):
+            spec_title = self.text(self.find(spec, ".group__title"))
+            spec_value = self.text(self.find(spec, ".group__content"))
             specs[spec_title] = spec_value
+        return specs
 
-        # Images
+    def __parse_part_images(self, sidebar: HTML) -> list[str]:
         image_urls = []
-        thumbnails = sidebar.find(".product__image-2024-thumbnails", first=True)
+        thumbnails = self.find(sidebar, ".product__image-2024-thumbnails")
         if thumbnails is None:
             image_urls.append(
                 "https:"
-                + sidebar.find(".product__image-2024 img", first=True).attrs["src"]
+                + self.attr(self.find(sidebar, ".product__image-2024 img"), "src")
             )
         else:
-            for image in thumbnails.find("img"):
-                image_base_url = "https:" + image.attrs["src"].split(".256p.jpg")[0]
+            for image in self.find_all(thumbnails, "img"):
+                image_base_url = (
+                    "https:" + self.attr(image, "src").split(".256p.jpg")[0]
+                )
                 image_urls.append(image_base_url + ".1600.jpg")
+        return image_urls
 
-        # Vendors
+    def __parse_part_vendors(self, html: HTML) -> list[Vendor]:
         vendors = []
-        for row in html.find("#prices table tbody tr:not(.tr--noBorder)"):
-            vendor_image = row.find(".td__logo img", first=True)
-            logo_url = "https:" + vendor_image.attrs["src"]
-            vendor_name = vendor_image.attrs["alt"]
+        for row in self.find_all(html, "#prices table tbody tr:not(.tr--noBorder)"):
+            vendor_image = self.find(row, ".td__logo img")
+            logo_url = "https:" + self.attr(vendor_image, "src")
+            vendor_name = self.attr(vendor_image, "alt")
 
             # Vendor price
-            base_price_raw = row.find(".td__base", first=True).text
+            base_price_raw = self.text(self.find(row, ".td__base"))
             base_price = DECIMAL_RE.search(base_price_raw).group()
             currency = base_price_raw.replace(base_price, "").strip()
 
             # Discounts, shipping, tax and total price
             promo = (
-                row.find(".td__promo", first=True).text.replace(currency, "").strip()
+                self.text(self.find(row, ".td__promo")).replace(currency, "").strip()
             )
             if promo == "":
                 promo = "0"
 
-            shipping_raw = row.find(".td__shipping", first=True)
+            shipping_raw = self.find(row, ".td__shipping")
+            shipping_text = self.text(shipping_raw)
             shipping = (
                 0
-                if "FREE" in shipping_raw.text
-                or shipping_raw.text.strip() == ""
-                or shipping_raw.find("img", first=True) is not None
-                else DECIMAL_RE.search(shipping_raw.text).group()
+                if "FREE" in shipping_text
+                or shipping_text.strip() == ""
+                or self.find(shipping_raw, "img") is not None
+                else DECIMAL_RE.search(shipping_text).group()
             )
-            tax = row.find(".td__tax", first=True).text.replace(currency, "").strip()
+            tax = self.text(self.find(row, ".td__tax")).replace(currency, "").strip()
             if tax == "":
                 tax = "0"
 
-            final = row.find(".td__finalPrice a", first=True)
-            total_price = final.text.replace(currency, "").strip().removesuffix("+")
+            final = self.find(row, ".td__finalPrice a")
+            total_price = (
+                self.text(final).replace(currency, "").strip().removesuffix("+")
+            )
 
             # Availability and buy url
-            in_stock = row.find(".td__availability--inStock", first=True) is not None
-            buy_url = final.attrs["href"]
+            in_stock = self.find(row, ".td__availability--inStock") is not None
+            buy_url = self.attr(final, "href")
 
             vendors.append(
                 Vendor(
@@ -153,63 +403,41 @@ class Scraper:
                     buy_url=buy_url,
                 )
             )
+        return vendors
 
-        cheapest_price = None
-        in_stock = False
-
-        available_vendors = list(filter(lambda v: v.in_stock, vendors))
-        if len(available_vendors) > 0:
-            in_stock = True
-            cheapest_price = sorted(available_vendors, key=lambda v: v.price.total)[
-                0
-            ].price
-
-        base_url = "https://" + urllib.parse.urlparse(res.url).netloc
-
+    def __parse_part_reviews(self, html: HTML, base_url: str) -> list[Review]:
         reviews = []
-        for review in html.find(".partReviews .partReviews__review"):
+        for review in self.find_all(html, ".partReviews .partReviews__review"):
             reviews.append(self.parse_review(review, base_url))
-
-        return Part(
-            name=name,
-            type=type,
-            image_urls=image_urls,
-            url=res.url,
-            cheapest_price=cheapest_price,
-            in_stock=in_stock,
-            vendors=vendors,
-            rating=rating,
-            specs=specs,
-            reviews=reviews,
-        )
+        return reviews
 
     def parse_review(self, review: HTML, base_url: str) -> Review:
-        user_details = review.find(".userDetails", first=True)
-        avatar_url = user_details.find("img", first=True).attrs["src"]
+        user_details = self.find(review, ".userDetails")
+        avatar_url = self.attr(self.find(user_details, "img"), "src")
         if avatar_url.startswith("//"):
             avatar_url = "https:" + avatar_url
         else:
             avatar_url = base_url + avatar_url
 
-        name_container = user_details.find(".userDetails__userName a", first=True)
-        profile_url = base_url + name_container.attrs["href"]
-        username = name_container.text
+        name_container = self.find(user_details, ".userDetails__userName a")
+        profile_url = base_url + self.attr(name_container, "href")
+        username = self.text(name_container)
 
-        user_data = user_details.find(".userDetails__userData", first=True)
-        points = int(user_data.find("li:first-child", first=True).text.split(" ")[0])
-        created_at = user_data.find("li:last-child", first=True).text
+        user_data = self.find(user_details, ".userDetails__userData")
+        points = int(self.text(self.find(user_data, "li:first-child")).split(" ")[0])
+        created_at = self.text(self.find(user_data, "li:last-child"))
 
-        review_name = review.find(".partReviews__name", first=True)
-        stars = len(review_name.find(".product--rating .shape-star-full"))
+        review_name = self.find(review, ".partReviews__name")
+        stars = len(self.find_all(review_name, ".product--rating .shape-star-full"))
 
         build_name = None
         build_url = None
-        build_a = review_name.find("a", first=True)
+        build_a = self.find(review_name, "a")
         if build_a is not None:
-            build_name = build_a.text
-            build_url = base_url + build_a.attrs["href"]
+            build_name = self.text(build_a)
+            build_url = base_url + self.attr(build_a, "href")
 
-        content = review.find(".partReviews__writeup", first=True).text
+        content = self.text(self.find(review, ".partReviews__writeup"))
 
         return Review(
             author=User(username, avatar_url, profile_url),
@@ -221,6 +449,18 @@ class Scraper:
             build_url=build_url,
         )
 
+    def parse_pagination(self, html: HTML) -> tuple[int, int]:
+        pagination = self.find(html, "#module-pagination")
+        if pagination is None:
+            return 0, 0
+
+        current_page = self.find(pagination, ".pagination--current")
+        last_page = self.find(pagination, "li:last-child")
+        if current_page is None or last_page is None:
+            return 0, 0
+
+        return int(self.text(current_page)), int(self.text(last_page))
+
     def prepare_part_reviews_url(
         self,
         id_url: str,
@@ -233,20 +473,13 @@ class Scraper:
         return f"{base}{PART_REVIEWS_PATH}?page={page}&rating={rating}"
 
     def parse_reviews(self, res: Response):
-        html: HTML = res.html
+        html = self.get_root(res)
         base_url = "https://" + urllib.parse.urlparse(res.url).netloc
         reviews = []
-        for review in html.find(".partReviews .partReviews__review"):
+        for review in self.find_all(html, ".partReviews .partReviews__review"):
             reviews.append(self.parse_review(review, base_url))
 
-        pagination = html.find("#module-pagination", first=True)
-
-        try:
-            current_page = int(pagination.find(".pagination--current", first=True).text)
-            total_pages = int(pagination.find("li:last-child", first=True).text)
-        except AttributeError:
-            current_page = 0
-            total_pages = 0
+        current_page, total_pages = self.parse_pagination(html)
 
         return PartReviewsResult(
             reviews=reviews, page=current_page, total_pages=total_pages
@@ -275,47 +508,44 @@ class Scraper:
         return self.__get_base_url(region) + PART_LIST_PATH + id_url
 
     def parse_part_list(self, res: Response) -> PartList:
-        html: HTML = res.html
-        wrapper = html.find(".partlist__wrapper", first=True)
-        part_list = html.find(".partlist", first=True)
+        html = self.get_root(res)
+        wrapper = self.find(html, ".partlist__wrapper")
+        part_list = self.find(html, ".partlist")
+        base_url = "https://" + urllib.parse.urlparse(res.url).netloc
 
         estimated_wattage = (
-            wrapper.find(".partlist__keyMetric", first=True)
-            .text.removeprefix("Estimated Wattage:")
+            self.text(self.find(wrapper, ".partlist__keyMetric"))
+            .removeprefix("Estimated Wattage:")
             .strip()
         )
 
         # Parts
         parts = []
-        for row in part_list.find("table tbody tr.tr__product"):
-            type = row.find(".td__component", first=True).text.strip()
+        for row in self.find_all(part_list, "table tbody tr.tr__product"):
+            type = self.text(self.find(row, ".td__component")).strip()
 
-            image = row.find(".td__image img", first=True)
+            image = self.find(row, ".td__image img")
             image_urls = []
             if image is not None:
-                image_urls = [image.attrs["src"]]
+                image_urls = [self.attr(image, "src")]
 
             name = "\n".join(
                 filter(
                     lambda s: len(s) > 0,
                     (
-                        row.find(".td__name", first=True)
-                        .text.replace("From parametric selection:", "")
+                        self.text(self.find(row, ".td__name"))
+                        .replace("From parametric selection:", "")
                         .strip()
                     ).split("\n"),
                 )
             )
-            part_link = row.find(".td__name a", first=True)
+            part_link = self.find(row, ".td__name a")
             url = None
             if part_link is not None:
-                url = (
-                    "https://"
-                    + urllib.parse.urlparse(res.url).netloc
-                    + part_link.attrs["href"]
-                )
+                url = base_url + self.attr(part_link, "href")
 
             base_price_raw = (
-                row.find(".td__base", first=True).text.replace("Base", "").strip()
+                self.text(self.find(row, ".td__base")).replace("Base", "").strip()
             )
             base_price = (
                 None
@@ -332,14 +562,14 @@ class Scraper:
 
             # Price parsing is painful... they're often missing or contain weird invisible text artefacts
             if base_price is not None:
-                promo_raw = row.find(".td__promo", first=True).text
+                promo_raw = self.text(self.find(row, ".td__promo"))
                 promo = float(
                     0
                     if currency not in promo_raw
                     else DECIMAL_RE.search(promo_raw).group()
                 )
 
-                shipping_raw = row.find(".td__shipping", first=True).text.strip()
+                shipping_raw = self.text(self.find(row, ".td__shipping")).strip()
                 shipping = float(
                     0
                     if "FREE" in shipping_raw
@@ -348,7 +578,7 @@ class Scraper:
                     else DECIMAL_RE.search(shipping_raw).group()
                 )
 
-                tax_raw = row.find(".td__tax", first=True).text.strip()
+                tax_raw = self.text(self.find(row, ".td__tax")).strip()
                 tax = float(
                     0
                     if tax_raw == "" or currency not in tax_raw
@@ -356,15 +586,15 @@ class Scraper:
                 )
 
                 total_price = float(
-                    DECIMAL_RE.search(row.find(".td__price", first=True).text).group()
+                    DECIMAL_RE.search(self.text(self.find(row, ".td__price"))).group()
                 )
                 in_stock = True
 
-                vendor = row.find(".td__where a", first=True)
-                buy_url = vendor.attrs["href"]
-                vendor_logo = vendor.find("img", first=True)
-                vendor_name = vendor_logo.attrs["alt"]
-                logo_url = "https:" + vendor_logo.attrs["src"]
+                vendor = self.find(row, ".td__where a")
+                buy_url = self.attr(vendor, "href")
+                vendor_logo = self.find(vendor, "img")
+                vendor_name = self.attr(vendor_logo, "alt")
+                logo_url = "https:" + self.attr(vendor_logo, "src")
 
                 vendors = [
                     Vendor(
@@ -383,7 +613,7 @@ class Scraper:
                     )
                 ]
             else:
-                total_price_raw = row.find(".td__price", first=True).text.strip()
+                total_price_raw = self.text(self.find(row, ".td__price")).strip()
                 if (
                     "No Prices Available" not in total_price_raw
                     and total_price_raw != ""
@@ -404,7 +634,7 @@ class Scraper:
                     url,
                     (
                         Price(
-                            base=base_price,
+                            base=None if base_price is None else float(base_price),
                             discounts=0,
                             shipping=0,
                             tax=0,
@@ -427,10 +657,11 @@ class Scraper:
 
         currency = None
         total_price = 0
-        total = part_list.find(".tr__total--final .td__price", first=True)
+        total = self.find(part_list, ".tr__total--final .td__price")
         if total is not None:
-            total_price = DECIMAL_RE.search(total.text).group()
-            currency = total.text.replace(total_price, "").strip()
+            total_text = self.text(total)
+            total_price = DECIMAL_RE.search(total_text).group()
+            currency = total_text.replace(total_price, "").strip()
 
         return PartList(
             parts=parts,
@@ -448,26 +679,25 @@ class Scraper:
         )
 
     def parse_part_search(self, res: Response) -> PartSearchResult:
-        html: HTML = res.html
+        html = self.get_root(res)
 
         # Case for which the search redirects to the product page
-        if html.find(".pageTitle", first=True).text != "Product Search":
+        if self.text(self.find(html, ".pageTitle")) != "Product Search":
             return [self.parse_part(res)]
 
+        base_url = "https://" + urllib.parse.urlparse(res.url).netloc
+
         results = []
-        for result in html.find(".search-results__pageContent li"):
-            image_url = (
-                "https:"
-                + result.find(".search_results--img img", first=True).attrs["src"]
+        for result in self.find_all(html, ".search-results__pageContent li"):
+            image_url = "https:" + self.attr(
+                self.find(result, ".search_results--img img"), "src"
             )
-            link = result.find(".search_results--link a", first=True)
+            link = self.find(result, ".search_results--link a")
 
-            url = (
-                "https://" + urllib.parse.urlparse(res.url).netloc + link.attrs["href"]
-            )
-            name = link.text
+            url = base_url + self.attr(link, "href")
+            name = self.text(link)
 
-            price = result.find(".search_results--price", first=True).text.strip()
+            price = self.text(self.find(result, ".search_results--price")).strip()
             cheapest_price = None
             if price != "":
                 total = DECIMAL_RE.search(price).group()
@@ -477,45 +707,11 @@ class Scraper:
                     discounts=None,
                     shipping=None,
                     tax=None,
-                    total=total,
+                    total=float(total),
                     currency=currency,
                 )
 
-            type = None
-
-            match "(".join(name.split("(")[:-1]).split(" ")[-4:-1]:
-                case [*_, "Processor"]:
-                    type = "CPU"
-                case [_, "Fan", "Controller"]:
-                    type = "Fan Controller"
-                case [_, "Network", "Adapter"]:
-                    type = "Wired Network Adapter"
-                case [_, "Wi-Fi", "Adapter"]:
-                    type = "Wireless Network Adapter"
-                case [_, "Video", "Card"]:
-                    type = "Video Card"
-                case [_, "CPU", "Cooler"]:
-                    type = "CPU Cooler"
-                case [_, "Power", "Supply"]:
-                    type = "Power Supply"
-                case [_, "Thermal", "Paste"]:
-                    type = "Thermal Compound"
-                case [_, "Sound", "Card"]:
-                    type = "Sound Card"
-                case [_, "Fans", _] | [*_, "Fan"]:
-                    type = "Case Fan"
-                case ["External", _, _] | [_, "External", _]:
-                    type = "External Storage"
-                case [*_, "Writer"]:
-                    type = "Optical Drive"
-                case [*_, "Headset"] | [*_, "Headphones"]:
-                    type = "Headphones"
-                case ["Solid", "State", "Drive"] | [_, "Hard", "Drive"]:
-                    type = "Storage"
-                case [*_, a]:
-                    type = a
-            if "Windows" in name:
-                type = "Operating System"
+            type = search_result_type(name)
 
             results.append(
                 Part(
@@ -531,104 +727,102 @@ class Scraper:
                 )
             )
 
-        pagination = html.find("#module-pagination", first=True)
-
-        try:
-            current_page = int(pagination.find(".pagination--current", first=True).text)
-            total_pages = int(pagination.find("li:last-child", first=True).text)
-        except AttributeError:
-            current_page = 0
-            total_pages = 0
+        current_page, total_pages = self.parse_pagination(html)
 
         return PartSearchResult(
             parts=results, page=current_page, total_pages=total_pages
         )
 
-    # def prepare_parts_url(
-    #     self,
-    #     product_path: str,
-    #     page: int = 1,
-    #     region: Optional[str] = "us",
-    #     compatible_with: Optional[str] = None,
-    # ):
-    #     if product_path not in PRODUCT_PATHS:
-    #         raise ValueError(f"Invalid product path: {product_path}")
-    #     region = "us" if region is None else region
-
-    #     if compatible_with is not None:
-    #         # Extract ID from part URL/ID
-    #         id = self.prepare_part_url(compatible_with).rsplit("/", 1)[-1]
-    #         return f"{self.__get_base_url(region)}{PRODUCTS_PATH}{product_path}?page={page}&compatible_with={id}"
-
-    #     return f"{self.__get_base_url(region)}{PRODUCTS_PATH}{product_path}?page={page}"
-
-    # def parse_parts(self, res: Response) -> PartSearchResult:
-    #     html: HTML = res.html
-    #     table = html.find("#paginated_table", first=True)
-    #     base_url = "https://" + urllib.parse.urlparse(res.url).netloc
-
-    #     type = html.find(".pageTitle", first=True).text.removeprefix("Choose A").strip()
-
-    #     spec_titles = []
-    #     for header in table.find("thead .th--sortable"):
-    #         if header.text in ("Name", "Rating"):
-    #             continue
-    #         spec_titles.append(header.text)
-
-    #     parts = []
-
-    #     for row in table.find("tbody tr"):
-    #         name_a = row.find(".td__name", first=True)
-    #         name = name_a.text
-    #         url = base_url + name_a.attrs["href"]
-    #         image_url = name_a.find("img", first=True).attrs["src"]
-
-    #         specs = {}
-    #         for spec_key, spec_val in zip(spec_titles, row.find(".td__spec")):
-    #             specs[spec_key] = spec_val.text
-
-    #         rating_container = row.find(".td__rating")
-    #         ratings_count = int(rating_container.text.strip("()"))
-    #         stars = (
-    #             len(rating_container.find(".shape-star-full"))
-    #             + len(rating_container.find(".shape-star-half")) * 0.5
-    #         )
-
-    #         rating = Rating(stars=stars, count=ratings_count, average=None)
-
-    #         cheapest_price = None
-    #         in_stock = False
-    #         total_price_raw = row.find(".td__price").text.removesuffix("Add").strip()
-    #         if total_price_raw is not None:
-    #             total_price = DECIMAL_RE.search(total_price_raw)
-    #             currency = total_price_raw.replace(total_price, "")
-    #             cheapest_price = Price(
-    #                 None, None, None, None, float(total_price), currency
-    #             )
-    #             in_stock = True
-
-    #         parts.append(
-    #             Part(
-    #                 name=name,
-    #                 type=type,
-    #                 image_urls=[image_url],
-    #                 url=url,
-    #                 cheapest_price=cheapest_price,
-    #                 in_stock=in_stock,
-    #                 vendors=None,
-    #                 rating=rating,
-    #                 specs=specs,
-    #                 reviews=None,
-    #             )
-    #         )
-
-    #     pagination = html.find("#module-pagination", first=True)
-
-    #     try:
-    #         current_page = int(pagination.find(".pagination--current", first=True).text)
-    #         total_pages = int(pagination.find("li:last-child", first=True).text)
-    #     except AttributeError:
-    #         current_page = 0
-    #         total_pages = 0
-
-    #     return PartSearchResult(parts=parts, page=current_page, total_pages=total_pages)
+    def prepare_parts_url(
+        self,
+        product_path: str,
+        page: int = 1,
+        region: Optional[str] = "us",
+        compatible_with: Optional[str] = None,
+    ) -> str:
+        if product_path not in PRODUCT_PATHS:
+            raise ValueError(f"Invalid product path: {product_path}")
+        region = "us" if region is None else region
+
+        url = f"{self.__get_base_url(region)}{PRODUCTS_PATH}{product_path}?page={page}"
+        if compatible_with is not None:
+            # Extract ID from part URL/ID
+            id = self.prepare_part_url(compatible_with).rsplit("/", 1)[-1]
+            url += f"&compatible_with={id}"
+
+        return url
+
+    def parse_parts(self, res: Response) -> PartSearchResult:
+        html = self.get_root(res)
+        base_url = "https://" + urllib.parse.urlparse(res.url).netloc
+
+        type = listing_type(self.text(self.find(html, ".pageTitle")))
+
+        table = self.find(html, "#paginated_table")
+        if table is None:
+            return PartSearchResult(parts=[], page=0, total_pages=0)
+
+        spec_titles = []
+        for header in self.find_all(table, "thead .th--sortable"):
+            header_text = self.text(header)
+            if header_text in ("Name", "Rating", "Price"):
+                continue
+            spec_titles.append(header_text)
+
+        parts = []
+        for row in self.find_all(table, "tbody tr"):
+            link = self.find(row, ".td__name a")
+            if link is None:
+                continue
+
+            name_container = self.find(link, ".td__nameWrapper p")
+            name = self.text(link if name_container is None else name_container)
+            url = base_url + self.attr(link, "href")
+
+            image = self.find(row, ".td__name img")
+            image_urls = (
+                None if image is None else [listing_image_url(self.attr(image, "src"))]
+            )
+
+            specs = {}
+            for spec_title, spec in zip(spec_titles, self.find_all(row, ".td__spec")):
+                # Each cell repeats its column title in a label for narrow layouts
+                label = self.find(spec, ".specLabel")
+                value = self.text(spec)
+                if label is not None:
+                    spec_title = self.text(label)
+                    value = value.removeprefix(spec_title).strip()
+                specs[spec_title] = value
+
+            rating = None
+            rating_container = self.find(row, ".td__rating")
+            if rating_container is not None:
+                count = RATING_COUNT_RE.search(self.text(rating_container))
+                rating = Rating(
+                    stars=len(self.find_all(rating_container, ".shape-star-full"))
+                    + len(self.find_all(rating_container, ".shape-star-half")) * 0.5,
+                    count=0 if count is None else int(count.group(1)),
+                    average=None,
+                )
+
+            price = self.find(row, ".td__price")
+            cheapest_price = None if price is None else listing_price(self.text(price))
+
+            parts.append(
+                Part(
+                    name=name,
+                    type=type,
+                    image_urls=image_urls,
+                    url=url,
+                    cheapest_price=cheapest_price,
+                    in_stock=cheapest_price is not None,
+                    vendors=None,
+                    rating=rating,
+                    specs=specs,
+                    reviews=None,
+                )
+            )
+
+        current_page, total_pages = self.parse_pagination(html)
+
+        return PartSearchResult(parts=parts, page=current_page, total_pages=total_pages)
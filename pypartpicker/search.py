@@ -0,0 +1,191 @@
+from collections import Counter, OrderedDict
+from itertools import chain, islice
+from typing import Iterable, Optional
+from .types import Part, PartSearchResult
+import math
+import re
+import threading
+
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+def name_words(name: str) -> list[str]:
+    return WORD_RE.findall(name.casefold())
+
+
+def trigrams(name: str, prefix: bool = False) -> frozenset[str]:
+    words = name_words(name)
+    grams = set()
+    for i, word in enumerate(words):
+        # Padding marks word boundaries, the last word of a prefix query may still be being typed
+        padded = "  " + word + ("" if prefix and i == len(words) - 1 else " ")
+        grams.update(padded[j : j + 3] for j in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class IndexedName:
+    def __init__(self, part: Part, grams: frozenset[str]):
+        self.part = part
+        self.grams = grams
+
+
+class SearchIndex:
+    def __init__(
+        self,
+        region: str = "us",
+        page_size: int = 20,
+        min_score: float = 0.5,
+        cache_size: int = 1024,
+    ):
+        self.region = region
+        self.page_size = page_size
+        self.min_score = min_score
+        self.cache_size = cache_size
+
+        self.__lock = threading.Lock()
+        self.__names: dict[int, IndexedName] = {}
+        self.__ids: dict[str, int] = {}
+        self.__next_id = 0
+        self.__postings: dict[str, set[int]] = {}
+        # Names rank shortest first, then alphabetically
+        self.__order: dict[int, tuple[int, str, int]] = {}
+        # Postings in rank order, rebuilt on the first search after they change
+        self.__ranked_postings: dict[str, list[int]] = {}
+        self.__results: OrderedDict[tuple[str, int], PartSearchResult] = OrderedDict()
+
+    def add(self, part: Part):
+        self.add_all([part])
+
+    def add_all(self, parts: Iterable[Part]) -> int:
+        count = 0
+        with self.__lock:
+            for part in parts:
+                count += 1
+                key = part.name if part.url is None else part.url
+                id = self.__ids.get(key)
+                if id is not None:
+                    if self.__names[id].part.name == part.name:
+                        # Same name, so the postings still hold and only the part needs replacing
+                        self.__names[id].part = part
+                        continue
+                    self.__forget(id)
+
+                id = self.__ids[key] = self.__next_id
+                self.__next_id += 1
+
+                grams = trigrams(part.name)
+                self.__names[id] = IndexedName(part, grams)
+                self.__order[id] = (len(grams), part.name.casefold(), id)
+                for gram in grams:
+                    self.__postings.setdefault(gram, set()).add(id)
+                    self.__ranked_postings.pop(gram, None)
+
+            self.__results.clear()
+        return count
+
+    def search(self, query: str, page: int = 1) -> PartSearchResult:
+        normalized = " ".join(name_words(query))
+        with self.__lock:
+            # Autocomplete sends the same prefixes over and over
+            result = self.__results.get((normalized, page))
+            if result is None:
+                result = self.__search(normalized, page)
+                self.__results[(normalized, page)] = result
+                if len(self.__results) > self.cache_size:
+                    self.__results.popitem(last=False)
+            else:
+                self.__results.move_to_end((normalized, page))
+
+        return PartSearchResult(
+            parts=list(result.parts), page=result.page, total_pages=result.total_pages
+        )
+
+    def clear(self):
+        with self.__lock:
+            self.__names.clear()
+            self.__ids.clear()
+            self.__postings.clear()
+            self.__order.clear()
+            self.__ranked_postings.clear()
+            self.__results.clear()
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def __repr__(self):
+        return f"<SearchIndex region={self.region} parts={len(self.__ids)}>"
+
+    def __forget(self, id: int):
+        name = self.__names.pop(id)
+        del self.__order[id]
+        for gram in name.grams:
+            postings = self.__postings[gram]
+            postings.discard(id)
+            if len(postings) == 0:
+                del self.__postings[gram]
+            self.__ranked_postings.pop(gram, None)
+
+    def __search(self, query: str, page: int) -> PartSearchResult:
+        grams = trigrams(query, prefix=True)
+        if len(grams) == 0:
+            return PartSearchResult(parts=[], page=0, total_pages=0)
+
+        start = (page - 1) * self.page_size
+        ids = self.__exact(grams, start + self.page_size)
+        if ids is None:
+            ids = self.__fuzzy(grams)
+            total = len(ids)
+            ids = ids[start : start + self.page_size]
+        else:
+            total, ids = ids
+            ids = ids[start:]
+
+        total_pages = math.ceil(total / self.page_size)
+        return PartSearchResult(
+            parts=[self.__names[id].part for id in ids],
+            page=page if total_pages > 0 else 0,
+            total_pages=total_pages,
+        )
+
+    def __exact(
+        self, grams: frozenset[str], count: int
+    ) -> Optional[tuple[int, list[int]]]:
+        postings = sorted(
+            ((gram, self.__postings.get(gram, set())) for gram in grams),
+            key=lambda posting: len(posting[1]),
+        )
+        rarest, matched = postings[0]
+        matched = matched.intersection(*(ids for _, ids in postings[1:]))
+
+        # Typo tolerance is only needed when no name contains the whole query
+        if len(matched) == 0:
+            return None
+
+        # The rarest trigram's postings hold every match, walking them in rank order finds the top matches first
+        ranked = self.__ranked_postings.get(rarest)
+        if ranked is None:
+            ranked = self.__ranked_postings[rarest] = sorted(
+                self.__postings[rarest], key=self.__order.__getitem__
+            )
+        return len(matched), list(islice((id for id in ranked if id in matched), count))
+
+    def __fuzzy(self, grams: frozenset[str]) -> list[int]:
+        needed = max(math.ceil(len(grams) * self.min_score), 1)
+        postings = sorted((self.__postings.get(gram, set()) for gram in grams), key=len)
+
+        # A name sharing at least `needed` trigrams must appear in one of the rarest len(grams) - needed + 1 postings,
+        # so only those names are counted against the common trigrams
+        rare = len(grams) - needed + 1
+        shared = Counter(chain.from_iterable(postings[:rare]))
+        candidates = shared.keys()
+        for posting in postings[rare:]:
+            shared.update(posting & candidates)
+
+        # Names covering more of the query rank first
+        ranked = [
+            (-count, self.__order[id])
+            for id, count in shared.items()
+            if count >= needed
+        ]
+        ranked.sort()
+        return [order[2] for _, order in ranked]
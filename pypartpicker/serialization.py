@@ -0,0 +1,182 @@
+from typing import Any, Iterable, Iterator, Optional
+from .types import Part
+import gzip
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FORMATS = ("json", "msgpack")
+
+# Fields from_dict fills in with None when missing, so they can be left out of records safely
+OPTIONAL_PART_FIELDS = (
+    "type",
+    "image_urls",
+    "url",
+    "cheapest_price",
+    "in_stock",
+    "vendors",
+    "rating",
+    "specs",
+    "reviews",
+)
+
+
+def check_format(format: str):
+    if format not in FORMATS:
+        raise ValueError(
+            f"Invalid format: {format}, must be one of {', '.join(FORMATS)}."
+        )
+    if format == "msgpack" and msgpack is None:
+        raise ImportError(
+            "The msgpack format requires the msgpack package, install it with pip install msgpack."
+        )
+
+
+def check_exclude(exclude: Optional[Iterable[str]]) -> frozenset[str]:
+    exclude = frozenset(exclude or ())
+    invalid = exclude.difference(OPTIONAL_PART_FIELDS)
+    if len(invalid) > 0:
+        raise ValueError(
+            f"Invalid excluded fields: {', '.join(sorted(invalid))}, must be any of {', '.join(OPTIONAL_PART_FIELDS)}."
+        )
+    return exclude
+
+
+def strip_none(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: strip_none(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [strip_none(v) for v in value]
+    return value
+
+
+def to_record(
+    obj: Any, omit_none: bool = False, exclude: frozenset[str] = frozenset()
+) -> dict:
+    data = obj.to_dict()
+
+    if len(exclude) > 0:
+        # Exclusions apply to parts, whether they're the record itself or listed inside it
+        parts = [data] if isinstance(obj, Part) else data.get("parts", [])
+        for part in parts:
+            for field in exclude:
+                part.pop(field, None)
+
+    if omit_none:
+        data = strip_none(data)
+
+    return data
+
+
+def encode_json(data: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def decode_json(data: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(
+    obj: Any,
+    format: str = "json",
+    omit_none: bool = False,
+    exclude: Optional[Iterable[str]] = None,
+) -> bytes:
+    check_format(format)
+    data = to_record(obj, omit_none, check_exclude(exclude))
+    if format == "msgpack":
+        return msgpack.packb(data, use_bin_type=True)
+    return encode_json(data)
+
+
+def loads(data: bytes, cls: type = Part, format: str = "json") -> Any:
+    check_format(format)
+    if format == "msgpack":
+        return cls.from_dict(msgpack.unpackb(data, raw=False))
+    return cls.from_dict(decode_json(data))
+
+
+def open_file(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+class ResultWriter:
+    def __init__(
+        self,
+        path: str,
+        format: str = "json",
+        omit_none: bool = False,
+        exclude: Optional[Iterable[str]] = None,
+        append: bool = False,
+    ):
+        check_format(format)
+
+        self.path = path
+        self.format = format
+        self.omit_none = omit_none
+        self.exclude = check_exclude(exclude)
+        self.count = 0
+
+        self.__file = open_file(path, "ab" if append else "wb")
+        self.__packer = (
+            msgpack.Packer(use_bin_type=True) if format == "msgpack" else None
+        )
+
+    def write(self, obj: Any):
+        data = to_record(obj, self.omit_none, self.exclude)
+        if self.__packer is not None:
+            self.__file.write(self.__packer.pack(data))
+        else:
+            self.__file.write(encode_json(data) + b"\n")
+        self.count += 1
+
+    def write_all(self, objs: Iterable[Any]) -> int:
+        written = self.count
+        for obj in objs:
+            self.write(obj)
+        return self.count - written
+
+    def close(self):
+        if not self.__file.closed:
+            self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ResultReader:
+    def __init__(self, path: str, cls: type = Part, format: str = "json"):
+        check_format(format)
+
+        self.path = path
+        self.cls = cls
+        self.format = format
+
+    def __iter__(self) -> Iterator[Any]:
+        # Records are decoded one at a time, so memory stays flat however large the file is
+        with open_file(self.path, "rb") as f:
+            if self.format == "msgpack":
+                for data in msgpack.Unpacker(f, raw=False):
+                    yield self.cls.from_dict(data)
+                return
+
+            for line in f:
+                if line.strip():
+                    yield self.cls.from_dict(decode_json(line))
@@ -0,0 +1,30 @@
+from requests_html import HTMLSession
+import asyncio
+import pyppeteer
+
+
+# HTMLSession borrows the thread's event loop and launches Chromium with signal handlers,
+# neither of which work outside the main thread. This session owns a private loop instead.
+class ThreadHTMLSession(HTMLSession):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.loop = asyncio.new_event_loop()
+
+    @property
+    def browser(self):
+        if not hasattr(self, "_browser"):
+            self._browser = self.loop.run_until_complete(
+                pyppeteer.launch(
+                    ignoreHTTPSErrors=not self.verify,
+                    headless=True,
+                    args=["--no-sandbox"],
+                    handleSIGINT=False,
+                    handleSIGTERM=False,
+                    handleSIGHUP=False,
+                )
+            )
+        return self._browser
+
+    def close(self):
+        super().close()
+        self.loop.close()
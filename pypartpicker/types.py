@@ -1,22 +1,16 @@
-from typing import Optional
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Optional
+import threading
 
 
+@dataclass(frozen=True, slots=True, repr=False)
 class Price:
-    def __init__(
-        self,
-        base: Optional[float] = None,
-        discounts: Optional[float] = None,
-        shipping: Optional[float] = None,
-        tax: Optional[float] = None,
-        total: Optional[float] = None,
-        currency: Optional[str] = None,
-    ):
-        self.base = base
-        self.discounts = discounts
-        self.shipping = shipping
-        self.tax = tax
-        self.total = total
-        self.currency = currency
+    base: Optional[float] = None
+    discounts: Optional[float] = None
+    shipping: Optional[float] = None
+    tax: Optional[float] = None
+    total: Optional[float] = None
+    currency: Optional[str] = None
 
     def __repr__(self):
         return f"<Price total={self.total} currency={self.currency}>"
@@ -26,58 +20,129 @@ class Price:
             return "<No Prices Available>"
         return f"{self.currency}{self.total:.02f}"
 
+    def to_dict(self) -> dict:
+        return {
+            "base": self.base,
+            "discounts": self.discounts,
+            "shipping": self.shipping,
+            "tax": self.tax,
+            "total": self.total,
+            "currency": self.currency,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Price":
+        return cls(
+            base=data.get("base"),
+            discounts=data.get("discounts"),
+            shipping=data.get("shipping"),
+            tax=data.get("tax"),
+            total=data.get("total"),
+            currency=data.get("currency"),
+        )
+
 
+@dataclass(frozen=True, slots=True)
 class Vendor:
-    def __init__(
-        self, name: str, logo_url: str, in_stock: bool, price: Price, buy_url: str
-    ):
-        self.name = name
-        self.logo_url = logo_url
-        self.in_stock = in_stock
-        self.price = price
-        self.buy_url = buy_url
+    name: str
+    logo_url: str
+    in_stock: bool
+    price: Price
+    buy_url: str
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "logo_url": self.logo_url,
+            "in_stock": self.in_stock,
+            "price": self.price.to_dict(),
+            "buy_url": self.buy_url,
+        }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "Vendor":
+        return cls(
+            name=data["name"],
+            logo_url=data["logo_url"],
+            in_stock=data["in_stock"],
+            price=Price.from_dict(data["price"]),
+            buy_url=data["buy_url"],
+        )
 
+
+@dataclass(frozen=True, slots=True, repr=False)
 class Rating:
-    def __init__(self, stars: int, count: int, average: float):
-        self.stars = stars
-        self.count = count
-        self.average = average
+    stars: int
+    count: int
+    average: Optional[float]
 
     def __repr__(self):
         return f"<Rating stars={self.stars} count={self.count} average={self.average}>"
 
+    def to_dict(self) -> dict:
+        return {"stars": self.stars, "count": self.count, "average": self.average}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Rating":
+        return cls(
+            stars=data["stars"], count=data["count"], average=data.get("average")
+        )
+
 
+@dataclass(frozen=True, slots=True)
 class User:
-    def __init__(
-        self,
-        username: str,
-        avatar_url: str,
-        profile_url: str,
-    ):
-        self.username = username
-        self.avatar_url = avatar_url
-        self.profile_url = profile_url
+    username: str
+    avatar_url: str
+    profile_url: str
 
+    def to_dict(self) -> dict:
+        return {
+            "username": self.username,
+            "avatar_url": self.avatar_url,
+            "profile_url": self.profile_url,
+        }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "User":
+        return cls(
+            username=data["username"],
+            avatar_url=data["avatar_url"],
+            profile_url=data["profile_url"],
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class Review:
-    def __init__(
-        self,
-        author: User,
-        points: int,
-        stars: int,
-        created_at: str,
-        content: str,
-        build_name: Optional[str] = None,
-        build_url: Optional[str] = None,
-    ):
-        self.author = author
-        self.points = points
-        self.stars = stars
-        self.created_at = created_at
-        self.content = content
-        self.build_name = build_name
-        self.build_url = build_url
+    author: User
+    points: int
+    stars: int
+    created_at: str
+    content: str
+    build_name: Optional[str] = None
+    build_url: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "author": self.author.to_dict(),
+            "points": self.points,
+            "stars": self.stars,
+            "created_at": self.created_at,
+            "content": self.content,
+            "build_name": self.build_name,
+            "build_url": self.build_url,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Review":
+        return cls(
+            author=User.from_dict(data["author"]),
+            points=data["points"],
+            stars=data["stars"],
+            created_at=data["created_at"],
+            content=data["content"],
+            build_name=data.get("build_name"),
+            build_url=data.get("build_url"),
+        )
 
 
 class PartReviewsResult:
@@ -86,34 +151,160 @@ class PartReviewsResult:
         self.page = page
         self.total_pages = total_pages
 
+    def to_dict(self) -> dict:
+        return {
+            "reviews": [review.to_dict() for review in self.reviews],
+            "page": self.page,
+            "total_pages": self.total_pages,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PartReviewsResult":
+        return cls(
+            reviews=[Review.from_dict(r) for r in data["reviews"]],
+            page=data["page"],
+            total_pages=data["total_pages"],
+        )
+
 
+@dataclass(slots=True, repr=False)
 class Part:
+    name: str
+    type: Optional[str]
+    image_urls: Optional[list[str]]
+    url: Optional[str]
+    cheapest_price: Optional[Price]
+    in_stock: Optional[bool]
+    vendors: Optional[list[Vendor]] = None
+    rating: Optional[Rating] = None
+    specs: Optional[dict[str, str]] = None
+    reviews: Optional[list[Review]] = None
+
+    def __repr__(self):
+        return f"<Part {self.name}>"
+
+    def __eq__(self, other):
+        # Compares the data rather than the class, so a LazyPart equals the Part it loads into
+        if not isinstance(other, Part):
+            return NotImplemented
+        return all(
+            getattr(self, field.name) == getattr(other, field.name)
+            for field in fields(Part)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "image_urls": self.image_urls,
+            "url": self.url,
+            "cheapest_price": (
+                None if self.cheapest_price is None else self.cheapest_price.to_dict()
+            ),
+            "in_stock": self.in_stock,
+            "vendors": (
+                None
+                if self.vendors is None
+                else [vendor.to_dict() for vendor in self.vendors]
+            ),
+            "rating": None if self.rating is None else self.rating.to_dict(),
+            "specs": self.specs,
+            "reviews": (
+                None
+                if self.reviews is None
+                else [review.to_dict() for review in self.reviews]
+            ),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Part":
+        cheapest_price = data.get("cheapest_price")
+        vendors = data.get("vendors")
+        rating = data.get("rating")
+        reviews = data.get("reviews")
+        return cls(
+            name=data["name"],
+            type=data.get("type"),
+            image_urls=data.get("image_urls"),
+            url=data.get("url"),
+            cheapest_price=(
+                None if cheapest_price is None else Price.from_dict(cheapest_price)
+            ),
+            in_stock=data.get("in_stock"),
+            vendors=None if vendors is None else [Vendor.from_dict(v) for v in vendors],
+            rating=None if rating is None else Rating.from_dict(rating),
+            specs=data.get("specs"),
+            reviews=None if reviews is None else [Review.from_dict(r) for r in reviews],
+        )
+
+
+def lazy_field(name: str) -> property:
+    slot = getattr(Part, name)
+
+    def get(self):
+        # The loader is only removed once its value is set, so a missing loader means the value is ready
+        if name in self._loaders:
+            with self._lock:
+                loader = self._loaders.get(name)
+                if loader is not None:
+                    slot.__set__(self, loader())
+                    self._loaders.pop(name, None)
+        return slot.__get__(self, type(self))
+
+    def set(self, value):
+        with self._lock:
+            self._loaders.pop(name, None)
+            slot.__set__(self, value)
+
+    return property(get, set)
+
+
+class LazyPart(Part):
+    # Sections are parsed from the retained page the first time they are accessed, then kept
+    __slots__ = ("_loaders", "_lock")
+
+    image_urls = lazy_field("image_urls")
+    cheapest_price = lazy_field("cheapest_price")
+    in_stock = lazy_field("in_stock")
+    vendors = lazy_field("vendors")
+    specs = lazy_field("specs")
+    reviews = lazy_field("reviews")
+
     def __init__(
         self,
         name: str,
-        type: str,
-        image_urls: Optional[list[str]],
+        type: Optional[str],
         url: Optional[str],
-        cheapest_price: Optional[Price],
-        in_stock: Optional[bool],
-        vendors: Optional[list[Vendor]] = None,
         rating: Optional[Rating] = None,
-        specs: Optional[dict[str, str]] = None,
-        reviews: Optional[list[Review]] = None,
+        loaders: Optional[dict[str, Callable[[], Any]]] = None,
     ):
-        self.name = name
-        self.type = type
-        self.image_urls = image_urls
-        self.url = url
-        self.cheapest_price = cheapest_price
-        self.in_stock = in_stock
-        self.vendors = vendors
-        self.rating = rating
-        self.specs = specs
-        self.reviews = reviews
+        self._loaders = {}
+        # Reentrant, as loaders such as cheapest_price read other lazy fields
+        self._lock = threading.RLock()
+        super().__init__(name, type, None, url, None, None, rating=rating)
+        self._loaders = dict(loaders or {})
 
-    def __repr__(self):
-        return f"<Part {self.name}>"
+    def add_loader(self, name: str, loader: Callable[[], Any]):
+        with self._lock:
+            self._loaders[name] = loader
+
+    def __reduce__(self):
+        # Loaders hold the parsed page, so pickle as a fully loaded Part instead
+        return (
+            Part,
+            (
+                self.name,
+                self.type,
+                self.image_urls,
+                self.url,
+                self.cheapest_price,
+                self.in_stock,
+                self.vendors,
+                self.rating,
+                self.specs,
+                self.reviews,
+            ),
+        )
 
 
 class PartList:
@@ -131,9 +322,43 @@ class PartList:
         self.total_price = total_price
         self.currency = currency
 
+    def to_dict(self) -> dict:
+        return {
+            "parts": [part.to_dict() for part in self.parts],
+            "url": self.url,
+            "estimated_wattage": self.estimated_wattage,
+            "total_price": self.total_price,
+            "currency": self.currency,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PartList":
+        return cls(
+            parts=[Part.from_dict(p) for p in data["parts"]],
+            url=data["url"],
+            estimated_wattage=data.get("estimated_wattage"),
+            total_price=data.get("total_price"),
+            currency=data.get("currency"),
+        )
+
 
 class PartSearchResult:
     def __init__(self, parts: list[Part], page: int, total_pages: int):
         self.parts = parts
         self.page = page
         self.total_pages = total_pages
+
+    def to_dict(self) -> dict:
+        return {
+            "parts": [part.to_dict() for part in self.parts],
+            "page": self.page,
+            "total_pages": self.total_pages,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PartSearchResult":
+        return cls(
+            parts=[Part.from_dict(p) for p in data["parts"]],
+            page=data["page"],
+            total_pages=data["total_pages"],
+        )
@@ -4,6 +4,32 @@ SEARCH_PATH = "/search/"
 PART_REVIEWS_PATH = "/reviews/"
 PRODUCTS_PATH = "/products/"
 
+REGIONS = (
+    "au",
+    "at",
+    "be",
+    "ca",
+    "cz",
+    "dk",
+    "fi",
+    "fr",
+    "de",
+    "hu",
+    "ie",
+    "it",
+    "nl",
+    "nz",
+    "no",
+    "pt",
+    "ro",
+    "sa",
+    "sk",
+    "es",
+    "se",
+    "uk",
+    "us",
+)
+
 
 PRODUCT_KEYBOARD_PATH = "keyboard"
 PRODUCT_SPEAKERS_PATH = "speakers"
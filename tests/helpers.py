@@ -0,0 +1,129 @@
+from pypartpicker.renderer import Renderer, RenderResult
+from pypartpicker.replay import Archive, ReplayAdapter
+from pypartpicker.responses import build_response
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests_html import HTMLResponse, HTMLSession
+import json
+import os
+import threading
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "fixtures"
+)
+
+session = HTMLSession()
+
+RENDERER_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) HeadlessChrome/120.0"
+
+
+def load_index() -> dict:
+    with open(os.path.join(FIXTURES_DIR, "index.json")) as f:
+        return json.load(f)
+
+
+def read_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def fixture_names(kind: str) -> list[str]:
+    return sorted(
+        name for name, fixture in load_index().items() if fixture["kind"] == kind
+    )
+
+
+def fixture_response(name: str, url: str = None) -> HTMLResponse:
+    # A fresh response each time, so no parsed tree is shared between parses
+    return build_response(
+        url or load_index()[name]["url"], 200, {}, read_fixture(name), session
+    )
+
+
+class StubAdapter(BaseAdapter):
+    # Answers requests in order from a list of (status code, body, optional headers) tuples or exceptions to raise
+    def __init__(self, responses: list):
+        super().__init__()
+        self.responses = list(responses)
+        self.requests = []
+
+    @property
+    def urls(self) -> list[str]:
+        return [request.url for request in self.requests]
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+
+        status_code, content, headers = (*response, {})[:3]
+        res = Response()
+        res.url = request.url
+        res.request = request
+        res.status_code = status_code
+        res.headers = CaseInsensitiveDict(
+            {"Content-Type": "text/html; charset=utf-8", **headers}
+        )
+        res._content = content
+        res.encoding = "utf-8"
+        return res
+
+    def close(self):
+        pass
+
+
+def product_archive(ids: list[str], region: str = "uk") -> Archive:
+    # Product pages under distinct URLs, alternating between the two product fixtures
+    archive = Archive()
+    for i, id in enumerate(ids):
+        archive.add(
+            f"https://{region}.pcpartpicker.com/product/{id}",
+            200,
+            {"Content-Type": "text/html; charset=utf-8"},
+            read_fixture(f"product-{i % 2}.html"),
+        )
+    return archive
+
+
+class TrackingAdapter(ReplayAdapter):
+    # Replays an archive, recording the requested URLs and the most requests in flight at once
+    def __init__(self, archive: Archive, latency: float = 0):
+        super().__init__(archive, latency)
+        self.urls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.__lock = threading.Lock()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        with self.__lock:
+            self.urls.append(request.url)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            with self.__lock:
+                self.in_flight -= 1
+
+
+class StubRenderer(Renderer):
+    # Returns the given pages in order instead of launching a browser
+    def __init__(self, pages: list[bytes]):
+        super().__init__()
+        self.pages = list(pages)
+        self.calls = []
+
+    def render(self, url, cookies=None) -> RenderResult:
+        self.calls.append(url)
+        return RenderResult(
+            url=url,
+            content=self.pages.pop(0).decode("utf-8"),
+            cookies=[{"name": "cf_clearance", "value": "token"}],
+            user_agent=RENDERER_USER_AGENT,
+        )
+
+    async def arender(self, url, cookies=None) -> RenderResult:
+        return self.render(url, cookies)
@@ -0,0 +1,74 @@
+from .helpers import TrackingAdapter, product_archive
+from pypartpicker import AsyncClient, Client
+import asyncio
+
+IDS = ["aaaaa1", "aaaaa2", "aaaaa3", "aaaaa4", "aaaaa5", "aaaaa6"]
+MISSING_ID = "zzzzzz"
+
+
+def test_async_get_parts_many():
+    adapter = TrackingAdapter(product_archive(IDS), latency=0.02)
+
+    async def run():
+        async with AsyncClient(adapter=adapter) as pcpp:
+            return await pcpp.get_parts_many(
+                IDS[:3] + [MISSING_ID] + IDS[3:], region="uk", concurrency=2
+            )
+
+    parts = asyncio.run(run())
+    assert len(parts) == len(IDS) + 1
+    assert isinstance(parts[3], LookupError)
+
+    parts = parts[:3] + parts[4:]
+    assert [part.url for part in parts] == [
+        f"https://uk.pcpartpicker.com/product/{id}" for id in IDS
+    ]
+    assert [part.type for part in parts[:2]] == ["Memory", "CPU Cooler"]
+    assert adapter.max_in_flight <= 2
+
+
+def test_async_iter_parts_many():
+    adapter = TrackingAdapter(product_archive(IDS))
+
+    async def run():
+        async with AsyncClient(adapter=adapter) as pcpp:
+            return [
+                result
+                async for result in pcpp.iter_parts_many(
+                    IDS + [MISSING_ID], region="uk", concurrency=3
+                )
+            ]
+
+    results = dict(asyncio.run(run()))
+    assert sorted(results) == list(range(len(IDS) + 1))
+    assert isinstance(results[len(IDS)], LookupError)
+    for index, id in enumerate(IDS):
+        assert results[index].url == f"https://uk.pcpartpicker.com/product/{id}"
+    assert adapter.max_in_flight <= 3
+
+
+def test_get_parts_many():
+    adapter = TrackingAdapter(product_archive(IDS), latency=0.02)
+    pcpp = Client(adapter=adapter)
+
+    parts = pcpp.get_parts_many([MISSING_ID] + IDS, region="uk", max_workers=2)
+    assert isinstance(parts[0], LookupError)
+    assert [part.url for part in parts[1:]] == [
+        f"https://uk.pcpartpicker.com/product/{id}" for id in IDS
+    ]
+    assert [part.type for part in parts[1:3]] == ["Memory", "CPU Cooler"]
+    assert adapter.max_in_flight <= 2
+
+
+def test_iter_parts_many():
+    adapter = TrackingAdapter(product_archive(IDS))
+    pcpp = Client(adapter=adapter)
+
+    results = dict(pcpp.iter_parts_many(IDS + [MISSING_ID], region="uk", max_workers=3))
+    assert sorted(results) == list(range(len(IDS) + 1))
+    assert isinstance(results[len(IDS)], LookupError)
+    for index, id in enumerate(IDS):
+        assert results[index].url == f"https://uk.pcpartpicker.com/product/{id}"
+    assert sorted(adapter.urls) == sorted(
+        f"https://uk.pcpartpicker.com/product/{id}" for id in IDS + [MISSING_ID]
+    )
@@ -0,0 +1,54 @@
+from .helpers import FIXTURES_DIR, load_index
+from pypartpicker.parsers import PARSERS
+import importlib.util
+import json
+import os
+
+BENCH_PATH = os.path.join(FIXTURES_DIR, "..", "bench_parsers.py")
+
+spec = importlib.util.spec_from_file_location("bench_parsers", BENCH_PATH)
+bench_parsers = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bench_parsers)
+
+
+def test_fixtures_exist():
+    index = load_index()
+    assert len(index) > 0
+    for name, fixture in index.items():
+        assert os.path.exists(os.path.join(FIXTURES_DIR, name))
+        assert fixture["kind"] in bench_parsers.PARSE_METHODS
+
+
+def test_baseline_covers_every_fixture():
+    with open(bench_parsers.BASELINE_PATH) as f:
+        baseline = json.load(f)
+
+    for name in load_index():
+        for parser in PARSERS:
+            assert f"{parser}:{name}" in baseline
+
+
+def test_compare_flags_regressions():
+    baseline = {"lxml:a.html": {"median_ms": 10, "peak_kib": 100}}
+
+    assert (
+        bench_parsers.compare(
+            {"lxml:a.html": {"median_ms": 12, "peak_kib": 100}}, baseline, 0.25
+        )
+        == []
+    )
+    assert (
+        len(
+            bench_parsers.compare(
+                {"lxml:a.html": {"median_ms": 13, "peak_kib": 100}}, baseline, 0.25
+            )
+        )
+        == 1
+    )
+
+
+def test_compare_fails_without_baseline():
+    regressions = bench_parsers.compare(
+        {"lxml:b.html": {"median_ms": 1, "peak_kib": 1}}, {}, 0.25
+    )
+    assert regressions == ["lxml:b.html: no baseline, run with --update-baseline"]
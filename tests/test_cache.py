@@ -0,0 +1,144 @@
+from .helpers import StubAdapter, read_fixture
+from pypartpicker import AsyncClient, Client, ResponseCache
+from pypartpicker.cache import get_endpoint
+import asyncio
+import sqlite3
+import threading
+
+PART_URL = "https://uk.pcpartpicker.com/product/Yg3mP6"
+PAGE = read_fixture("product-0.html")
+
+
+def test_endpoints():
+    assert get_endpoint(PART_URL) == "product"
+    assert get_endpoint(PART_URL + "/reviews/?page=2") == "reviews"
+    assert get_endpoint("https://pcpartpicker.com/list/Xy7bQk") == "part_list"
+    assert get_endpoint("https://pcpartpicker.com/search/?q=ram") == "search"
+    assert get_endpoint("https://pcpartpicker.com/products/cpu/") == "products"
+    assert get_endpoint("https://pcpartpicker.com/") == "other"
+
+
+def test_ttls():
+    cache = ResponseCache(ttls={"product": 0})
+    assert not cache.set(PART_URL, 200, {}, b"page").fresh
+    assert cache.get(PART_URL).content == b"page"
+    assert cache.set("https://pcpartpicker.com/list/a", 200, {}, b"list").fresh
+
+
+def test_memory_eviction():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.set("https://pcpartpicker.com/1", 200, {}, b"1234")
+    cache.set("https://pcpartpicker.com/2", 200, {}, b"1234")
+    cache.get("https://pcpartpicker.com/1")
+    cache.set("https://pcpartpicker.com/3", 200, {}, b"1234")
+    assert len(cache) == 2
+    assert cache.get("https://pcpartpicker.com/2") is None
+
+    # Too large to hold at all
+    cache.set("https://pcpartpicker.com/4", 200, {}, b"12345678901")
+    assert cache.get("https://pcpartpicker.com/4") is None
+
+
+def test_persistence(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(path, max_disk_bytes=8)
+    cache.set("https://pcpartpicker.com/1", 200, {"ETag": '"a"'}, b"1234")
+    cache.set("https://pcpartpicker.com/2", 200, {}, b"1234")
+    cache.set("https://pcpartpicker.com/3", 200, {}, b"1234")
+    cache.close()
+
+    cache = ResponseCache(path)
+    assert cache.get("https://pcpartpicker.com/1") is None
+    entry = cache.get("https://pcpartpicker.com/3")
+    assert entry.content == b"1234"
+    assert cache.get("https://pcpartpicker.com/2").validators() == {}
+
+    cache.invalidate("https://pcpartpicker.com/3")
+    cache.close()
+    assert ResponseCache(path).get("https://pcpartpicker.com/3") is None
+
+
+def test_reads_are_written_with_next_write(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(path, max_disk_bytes=8)
+    cache.set("https://pcpartpicker.com/1", 200, {}, b"1234")
+    cache.set("https://pcpartpicker.com/2", 200, {}, b"1234")
+    cache.close()
+
+    def accessed_at(url: str) -> float:
+        with sqlite3.connect(path) as db:
+            return db.execute(
+                "SELECT accessed_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()[0]
+
+    cache = ResponseCache(path, max_disk_bytes=8)
+    before = accessed_at("https://pcpartpicker.com/1")
+    assert cache.get("https://pcpartpicker.com/1") is not None
+    # Reading doesn't write to the store
+    assert accessed_at("https://pcpartpicker.com/1") == before
+
+    # But the read still counts when the next write evicts
+    cache.set("https://pcpartpicker.com/3", 200, {}, b"1234")
+    cache.close()
+    cache = ResponseCache(path)
+    assert cache.get("https://pcpartpicker.com/1") is not None
+    assert cache.get("https://pcpartpicker.com/2") is None
+
+
+class ThreadRecordingCache(ResponseCache):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = set()
+
+    def get(self, url):
+        self.threads.add(threading.get_ident())
+        return super().get(url)
+
+    def set(self, *args):
+        self.threads.add(threading.get_ident())
+        return super().set(*args)
+
+
+def test_async_client_uses_disk_cache_off_the_event_loop(tmp_path):
+    cache = ThreadRecordingCache(str(tmp_path / "cache.db"))
+
+    async def run():
+        async with AsyncClient(adapter=StubAdapter([(200, PAGE)]), cache=cache) as pcpp:
+            first = await pcpp.get_part(PART_URL)
+            assert await pcpp.get_part(PART_URL) == first
+            return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert len(cache.threads) > 0
+    assert loop_thread not in cache.threads
+
+
+def test_client_fresh_hit():
+    adapter = StubAdapter([(200, PAGE)])
+    pcpp = Client(adapter=adapter, cache=ResponseCache())
+    assert pcpp.get_part(PART_URL) == pcpp.get_part(PART_URL)
+    assert len(adapter.requests) == 1
+
+
+def test_client_revalidates_stale_entries():
+    headers = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Oct 2025 00:00:00 GMT"}
+    adapter = StubAdapter([(200, PAGE, headers), (304, b"")])
+    cache = ResponseCache(ttls={"product": 0})
+    pcpp = Client(adapter=adapter, cache=cache)
+
+    part = pcpp.get_part(PART_URL)
+    assert pcpp.get_part(PART_URL) == part
+
+    revalidation = adapter.requests[1].headers
+    assert revalidation["If-None-Match"] == '"v1"'
+    assert revalidation["If-Modified-Since"] == headers["Last-Modified"]
+
+
+def test_client_refetches_stale_entries_without_validators():
+    adapter = StubAdapter([(200, PAGE), (200, read_fixture("product-1.html"))])
+    pcpp = Client(adapter=adapter, cache=ResponseCache(ttls={"product": 0}))
+
+    first = pcpp.get_part(PART_URL)
+    second = pcpp.get_part(PART_URL)
+    assert "If-None-Match" not in adapter.requests[1].headers
+    assert first.name != second.name
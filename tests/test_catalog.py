@@ -0,0 +1,103 @@
+from .helpers import fixture_response
+from pypartpicker import PartCatalog
+from pypartpicker.scraper import Scraper
+from pypartpicker.types import Part, Price
+
+scraper = Scraper()
+
+
+def search_parts() -> list[Part]:
+    return scraper.parse_part_search(fixture_response("search-0.html")).parts
+
+
+def listing_parts() -> list[Part]:
+    return scraper.parse_parts(fixture_response("parts-0.html")).parts
+
+
+def memory(name: str, speed: str, total: float) -> Part:
+    return Part(
+        name=name,
+        type="Memory",
+        image_urls=None,
+        url=f"https://pcpartpicker.com/product/{name}",
+        cheapest_price=Price(total=total, currency="$"),
+        in_stock=True,
+        specs={"Speed": speed, "Modules": "2 x 16GB"},
+    )
+
+
+def test_search_results():
+    parts = search_parts()
+    catalog = PartCatalog()
+    assert catalog.add_all(parts) == len(parts)
+
+    results = catalog.query()
+    priced = [part for part in parts if part.cheapest_price is not None]
+    assert [part.cheapest_price.total for part in results[: len(priced)]] == sorted(
+        part.cheapest_price.total for part in priced
+    )
+    assert all(part.cheapest_price is None for part in results[len(priced) :])
+
+    results = catalog.query(min_price=50, max_price=100)
+    assert [part.cheapest_price.total for part in results] == [70.35, 93.8]
+    assert all(isinstance(type, str) for type in catalog.types())
+
+
+def test_listing_specs():
+    catalog = PartCatalog()
+    catalog.add_all(listing_parts())
+
+    results = catalog.query(type="CPU", specs={"Core Count": (">=", "14")})
+    assert [part.name for part in results] == [
+        "Intel Core i5-14600K",
+        "Intel Core Ultra 7 265K",
+        "AMD Ryzen 9 9950X",
+    ]
+    assert catalog.query(type="CPU", specs={"TDP": "125 w"}, limit=1)[0].name == (
+        "Intel Core i5-14600K"
+    )
+    assert catalog.query(type="CPU", max_price=200, in_stock=True)[0].name == (
+        "AMD Ryzen 5 7600X"
+    )
+
+
+def test_spec_ranges():
+    catalog = PartCatalog()
+    catalog.add_all(
+        [
+            memory("a", "DDR5-5600", 90),
+            memory("b", "DDR5-6000", 110),
+            memory("c", "DDR5-6400", 130),
+            memory("d", "DDR4-3600", 60),
+        ]
+    )
+
+    results = catalog.query(specs={"Speed": ("<=", "DDR5-6000")})
+    assert [part.name for part in results] == ["a", "b"]
+    results = catalog.query(specs={"Speed": (">", "DDR4-3200")})
+    assert [part.name for part in results] == ["d"]
+
+    # Replacing a part moves it in every index
+    catalog.add(memory("a", "DDR5-7200", 200))
+    results = catalog.query(specs={"Speed": ("<=", "DDR5-6000")})
+    assert [part.name for part in results] == ["b"]
+    assert [part.name for part in catalog.query(min_price=150)] == ["a"]
+
+
+def test_persistence(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    parts = search_parts() + listing_parts()
+
+    catalog = PartCatalog(path)
+    catalog.add_all(parts)
+    catalog.close()
+
+    catalog = PartCatalog(path)
+    assert len(catalog) == len(parts)
+    results = catalog.query(min_price=50, max_price=100)
+    assert [part.cheapest_price.total for part in results] == [70.35, 93.8]
+    assert catalog.get(parts[0].url) == parts[0]
+
+    catalog.remove(parts[0].url)
+    catalog.close()
+    assert parts[0].url not in PartCatalog(path)
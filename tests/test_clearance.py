@@ -0,0 +1,102 @@
+from .helpers import RENDERER_USER_AGENT, StubAdapter, StubRenderer, read_fixture
+from pypartpicker import ClearanceStore, Client, CloudflareException
+from pypartpicker.replay import CLOUDFLARE_PAGE
+import pytest
+import time
+
+HOST = "uk.pcpartpicker.com"
+PART_URL = f"https://{HOST}/product/Yg3mP6"
+PRODUCT = (200, read_fixture("product-0.html"))
+
+
+def test_store_expiry():
+    store = ClearanceStore()
+    store.set(HOST, {"cf_clearance": "token"}, "agent", expires_at=time.time() + 60)
+    assert store.get(HOST).cookies == {"cf_clearance": "token"}
+
+    store.set(HOST, {"cf_clearance": "token"}, "agent", expires_at=time.time() - 1)
+    assert store.get(HOST) is None
+    assert len(store) == 0
+
+
+def test_store_file(tmp_path):
+    path = str(tmp_path / "clearance.db")
+    store = ClearanceStore(path)
+    store.set(HOST, {"cf_clearance": "token"}, "agent")
+    store.close()
+
+    store = ClearanceStore(path)
+    assert store.get(HOST).user_agent == "agent"
+
+    store.invalidate(HOST)
+    store.close()
+    assert ClearanceStore(path).get(HOST) is None
+
+
+def test_store_remembers_missing_hosts(tmp_path):
+    store = ClearanceStore(str(tmp_path / "clearance.db"))
+    queries = []
+    store._ClearanceStore__db.set_trace_callback(queries.append)
+
+    assert store.get(HOST) is None
+    assert store.get(HOST) is None
+    assert len([query for query in queries if query.startswith("SELECT")]) == 1
+
+    store.set(HOST, {"cf_clearance": "token"}, "agent")
+    assert store.get(HOST).user_agent == "agent"
+    store.invalidate(HOST)
+    assert store.get(HOST) is None
+
+
+def test_set_from_browser():
+    store = ClearanceStore(default_ttl=60)
+    assert (
+        store.set_from_browser(HOST, [{"name": "other", "value": "1"}], "agent") is None
+    )
+
+    expires = time.time() + 10
+    clearance = store.set_from_browser(
+        HOST,
+        [
+            {"name": "cf_clearance", "value": "token", "expires": expires},
+            {"name": "other", "value": "1"},
+        ],
+        "agent",
+    )
+    assert clearance.cookies == {"cf_clearance": "token", "other": "1"}
+    assert clearance.expires_at == expires
+
+    # Session cookies fall back to the default TTL
+    clearance = store.set_from_browser(
+        HOST, [{"name": "cf_clearance", "value": "token", "expires": -1}], "agent"
+    )
+    assert time.time() < clearance.expires_at <= time.time() + 60
+
+
+def test_client_reuses_clearance():
+    store = ClearanceStore()
+    renderer = StubRenderer([read_fixture("product-0.html")])
+    adapter = StubAdapter([(200, CLOUDFLARE_PAGE), PRODUCT])
+    pcpp = Client(renderer=renderer, clearance_store=store, adapter=adapter)
+
+    pcpp.get_part(PART_URL)
+    assert store.get(HOST).user_agent == RENDERER_USER_AGENT
+
+    # The second request carries the stored clearance and needs no render
+    pcpp.get_part(PART_URL)
+    assert len(renderer.calls) == 1
+    request = adapter.requests[1]
+    assert "cf_clearance=token" in request.headers["Cookie"]
+    assert request.headers["User-Agent"] == RENDERER_USER_AGENT
+
+
+def test_client_invalidates_revoked_clearance():
+    store = ClearanceStore()
+    store.set(HOST, {"cf_clearance": "revoked"}, "agent")
+    adapter = StubAdapter([(200, CLOUDFLARE_PAGE)])
+    pcpp = Client(no_js=True, max_retries=1, clearance_store=store, adapter=adapter)
+
+    with pytest.raises(CloudflareException):
+        pcpp.get_part(PART_URL)
+    assert "cf_clearance=revoked" in adapter.requests[0].headers["Cookie"]
+    assert store.get(HOST) is None
@@ -0,0 +1,70 @@
+from .helpers import TrackingAdapter, product_archive
+from pypartpicker import AsyncClient
+import asyncio
+import pytest
+
+IDS = ["aaaaa1"]
+PART_URL = "https://uk.pcpartpicker.com/product/aaaaa1"
+MISSING_URL = "https://uk.pcpartpicker.com/product/zzzzzz"
+
+
+def fetch_together(coalesce: bool, *calls) -> tuple[TrackingAdapter, list]:
+    adapter = TrackingAdapter(product_archive(IDS), latency=0.05)
+
+    async def run():
+        async with AsyncClient(coalesce=coalesce, adapter=adapter) as pcpp:
+            return await asyncio.gather(
+                *(pcpp.get_part(url, **kwargs) for url, kwargs in calls),
+                return_exceptions=True,
+            )
+
+    return adapter, asyncio.run(run())
+
+
+def test_identical_requests_share_one_fetch():
+    adapter, parts = fetch_together(True, *[(PART_URL, {})] * 5)
+    assert adapter.urls == [PART_URL]
+    assert all(part is parts[0] for part in parts)
+
+
+def test_without_coalesce():
+    adapter, parts = fetch_together(False, *[(PART_URL, {})] * 3)
+    assert adapter.urls == [PART_URL] * 3
+
+
+def test_different_arguments_fetch_separately():
+    adapter, parts = fetch_together(
+        True,
+        (PART_URL, {"fields": ["vendors"]}),
+        (PART_URL, {"fields": {"vendors"}}),
+        (PART_URL, {}),
+    )
+    assert len(adapter.urls) == 2
+    assert parts[0] is parts[1]
+    assert parts[0].reviews is None
+    assert len(parts[2].reviews) == 30
+
+
+def test_errors_are_shared():
+    adapter, results = fetch_together(True, *[(MISSING_URL, {})] * 3)
+    assert adapter.urls == [MISSING_URL]
+    assert all(isinstance(result, LookupError) for result in results)
+    assert results[0] is results[1]
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    adapter = TrackingAdapter(product_archive(IDS), latency=0.05)
+
+    async def run():
+        async with AsyncClient(coalesce=True, adapter=adapter) as pcpp:
+            first = asyncio.ensure_future(pcpp.get_part(PART_URL))
+            second = asyncio.ensure_future(pcpp.get_part(PART_URL))
+            await asyncio.sleep(0.01)
+            first.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+    assert asyncio.run(run()).type == "Memory"
+    assert adapter.urls == [PART_URL]
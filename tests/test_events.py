@@ -0,0 +1,95 @@
+from .helpers import StubAdapter, read_fixture
+from pypartpicker import (
+    AsyncClient,
+    Client,
+    Event,
+    MetricsCollector,
+    RetryPolicy,
+    RetryRule,
+)
+from pypartpicker.events import EventEmitter
+from pypartpicker.replay import RATE_LIMIT_PAGE
+import asyncio
+import pytest
+
+PART_URL = "https://uk.pcpartpicker.com/product/Yg3mP6"
+PRODUCT = (200, read_fixture("product-0.html"))
+POLICY = RetryPolicy(rate_limit=RetryRule(2, delay=0))
+
+EXPECTED_EVENTS = [
+    "request",
+    "cloudflare_check",
+    "rate_limit",
+    "retry",
+    "request",
+    "cloudflare_check",
+    "parse",
+]
+
+
+def test_client_events():
+    events = []
+    pcpp = Client(
+        retry_policy=POLICY,
+        event_hooks=[events.append],
+        adapter=StubAdapter([(200, RATE_LIMIT_PAGE), PRODUCT]),
+    )
+    pcpp.get_part(PART_URL)
+
+    assert [event.name for event in events] == EXPECTED_EVENTS
+    assert all(event.url == PART_URL for event in events)
+    assert events[-1].data["method"] == "parse_part"
+    assert events[-3].data == {
+        "retries": 1,
+        "status_code": 200,
+        "size": len(PRODUCT[1]),
+    }
+    assert all(
+        event.duration is not None
+        for event in events
+        if event.name in ("request", "cloudflare_check", "parse")
+    )
+
+
+def test_async_client_events():
+    events = []
+
+    async def run():
+        async with AsyncClient(
+            retry_policy=POLICY,
+            event_hooks=[events.append],
+            adapter=StubAdapter([(200, RATE_LIMIT_PAGE), PRODUCT]),
+        ) as pcpp:
+            await pcpp.get_part(PART_URL)
+
+    asyncio.run(run())
+    assert [event.name for event in events] == EXPECTED_EVENTS
+
+
+def test_timed_records_errors():
+    events = []
+    emitter = EventEmitter([events.append])
+    with pytest.raises(ValueError):
+        with emitter.timed("parse", PART_URL, method="parse_part"):
+            raise ValueError()
+
+    assert events[0].data == {"method": "parse_part", "error": "ValueError"}
+    assert events[0].duration >= 0
+
+
+def test_metrics_collector():
+    metrics = MetricsCollector(buckets=(0.1, 1), prefix="test")
+    metrics(Event("request", PART_URL, 0.05, size=100))
+    metrics(Event("request", PART_URL, 0.5, size=50, error="Timeout"))
+    metrics(Event("retry", PART_URL))
+
+    lines = metrics.render().splitlines()
+    assert 'test_events_total{event="request",error=""} 1' in lines
+    assert 'test_events_total{event="request",error="Timeout"} 1' in lines
+    assert 'test_events_total{event="retry",error=""} 1' in lines
+    assert 'test_duration_seconds_bucket{event="request",le="0.1"} 1' in lines
+    assert 'test_duration_seconds_bucket{event="request",le="1"} 2' in lines
+    assert 'test_duration_seconds_bucket{event="request",le="+Inf"} 2' in lines
+    assert 'test_duration_seconds_count{event="request"} 2' in lines
+    assert "test_response_bytes_total 150" in lines
+    assert not any('event="retry",le=' in line for line in lines)
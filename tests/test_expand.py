@@ -0,0 +1,57 @@
+from .helpers import TrackingAdapter, product_archive, read_fixture
+from pypartpicker import AsyncClient, Client
+import asyncio
+import pytest
+
+LIST_URL = "https://uk.pcpartpicker.com/list/Xy7bQk"
+PRODUCT_IDS = ["p3ckbv", "hYxRsY", "8mTrxr", "Yg3mP6", "34ytt6", "xyz123", "QbJkcf"]
+
+
+def archive(ids: list[str] = PRODUCT_IDS):
+    archive = product_archive(ids)
+    archive.add(
+        LIST_URL,
+        200,
+        {"Content-Type": "text/html; charset=utf-8"},
+        read_fixture("part_list-0.html"),
+    )
+    return archive
+
+
+def check_expanded(thin, part_list):
+    assert len(part_list.parts) == len(thin.parts)
+    assert part_list.url == thin.url
+    for part in part_list.parts[:-1]:
+        assert part.reviews is not None
+    # Custom parts have no product page and are kept as they were
+    assert part_list.parts[-1] == thin.parts[-1]
+
+
+def test_expand_part_list():
+    adapter = TrackingAdapter(archive())
+    pcpp = Client(adapter=adapter)
+    thin = pcpp.get_part_list(LIST_URL)
+    assert thin.parts[0].reviews is None
+
+    part_list = pcpp.get_part_list(LIST_URL, expand=True, max_workers=3)
+    check_expanded(thin, part_list)
+    assert adapter.max_in_flight <= 3
+    # The list once for each call, then each product page once
+    assert len(adapter.urls) == 2 + len(PRODUCT_IDS)
+
+
+def test_async_expand_part_list():
+    async def run():
+        async with AsyncClient(adapter=TrackingAdapter(archive())) as pcpp:
+            return (
+                await pcpp.get_part_list(LIST_URL),
+                await pcpp.get_part_list(LIST_URL, expand=True, concurrency=3),
+            )
+
+    check_expanded(*asyncio.run(run()))
+
+
+def test_expand_fails_with_missing_product():
+    pcpp = Client(adapter=TrackingAdapter(archive(PRODUCT_IDS[:-1])))
+    with pytest.raises(LookupError, match=PRODUCT_IDS[-1]):
+        pcpp.get_part_list(LIST_URL, expand=True)
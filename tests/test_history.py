@@ -0,0 +1,109 @@
+from .helpers import fixture_response
+from pypartpicker import PriceHistory
+from pypartpicker.scraper import Scraper
+from pypartpicker.types import Part
+import dataclasses
+import pytest
+
+REGION = "uk"
+
+
+def product() -> Part:
+    return Scraper().parse_part(fixture_response("product-1.html"))
+
+
+def reprice(part: Part, index: int, total: float) -> Part:
+    vendors = list(part.vendors)
+    vendor = vendors[index]
+    vendors[index] = dataclasses.replace(
+        vendor, price=dataclasses.replace(vendor.price, total=total)
+    )
+    return dataclasses.replace(part, vendors=vendors)
+
+
+def test_only_changes_are_stored():
+    history = PriceHistory()
+    part = product()
+    assert history.record(part, REGION, observed_at=1) == 3
+    assert history.record(part, REGION, observed_at=2) == 0
+
+    changed = reprice(part, 0, 89.99)
+    assert history.record(changed, REGION, observed_at=3) == 1
+
+    points = history.get_history(part.url, REGION, vendor=part.vendors[0].name)
+    assert [(point.observed_at, point.price.total) for point in points] == [
+        (1, 95.99),
+        (3, 89.99),
+    ]
+
+
+def test_vendor_delisted():
+    history = PriceHistory()
+    part = product()
+    history.record(part, REGION, observed_at=1)
+    history.record(
+        dataclasses.replace(part, vendors=part.vendors[1:]), REGION, observed_at=2
+    )
+
+    last = history.get_history(part.url, REGION, vendor=part.vendors[0].name)[-1]
+    assert last.price is None
+    assert not last.in_stock
+
+
+def test_stats():
+    history = PriceHistory()
+    part = product()
+    history.record(part, REGION, observed_at=1)
+    part = reprice(part, 2, 150)
+    history.record(part, REGION, observed_at=5)
+    history.record(reprice(part, 0, 80), REGION, observed_at=10)
+
+    stats = history.get_stats(part.url, REGION)
+    assert (stats.min, stats.max, stats.changes) == (80, 150, 5)
+    assert stats.last.price.total == 80
+
+    # The prices in force when the window opens count towards it
+    stats = history.get_stats(part.url, REGION, start=2, end=6)
+    assert (stats.min, stats.max, stats.changes) == (95.99, 150, 1)
+    assert stats.last.price.total == 95.99
+
+    stats = history.get_stats(part.url, "us")
+    assert (stats.min, stats.max, stats.last, stats.changes) == (None, None, None, 0)
+
+
+def test_history_file(tmp_path):
+    path = str(tmp_path / "prices.db")
+    part = product()
+    history = PriceHistory(path)
+    history.record(part, REGION, observed_at=1)
+    history.close()
+
+    # The latest state is read back, so unchanged prices still aren't stored again
+    history = PriceHistory(path)
+    assert history.record(part, REGION, observed_at=2) == 0
+    assert history.record(reprice(part, 1, 99), REGION, observed_at=3) == 1
+    assert len(history.get_history(part.url, REGION, start=2)) == 1
+
+
+def test_record_needs_url_and_vendors():
+    history = PriceHistory()
+    part = product()
+    with pytest.raises(ValueError):
+        history.record(dataclasses.replace(part, url=None))
+    with pytest.raises(ValueError):
+        history.record(dataclasses.replace(part, vendors=None))
+
+
+def test_states_are_bounded():
+    history = PriceHistory(max_series=1)
+    first = product()
+    second = dataclasses.replace(first, url=first.url + "other/")
+    history.record(first, REGION, observed_at=1)
+    history.record(second, REGION, observed_at=1)
+    assert len(history._PriceHistory__states) == 1
+
+    # The evicted part's latest prices are read back, so unchanged prices still aren't stored again
+    assert history.record(first, REGION, observed_at=2) == 0
+    assert history.record(reprice(first, 0, 80), REGION, observed_at=3) == 1
+    assert history.record(second, REGION, observed_at=3) == 0
+    assert len(history._PriceHistory__states) == 1
@@ -0,0 +1,78 @@
+from .helpers import fixture_response
+from concurrent.futures import ThreadPoolExecutor
+from pypartpicker.parsers import PARSERS
+from pypartpicker.types import LazyPart, Part
+import copy
+import pickle
+import pytest
+import threading
+import time
+
+
+@pytest.mark.parametrize("parser", list(PARSERS))
+def test_lazy_part_equals_part(parser):
+    scraper = PARSERS[parser]()
+    part = scraper.parse_part(fixture_response("product-0.html"))
+    lazy = scraper.parse_part(fixture_response("product-0.html"), lazy=True)
+
+    assert isinstance(lazy, LazyPart)
+    assert lazy == part
+    assert part == lazy
+    assert pickle.loads(pickle.dumps(lazy)) == part
+    assert copy.deepcopy(lazy) == part
+
+    other = scraper.parse_part(fixture_response("product-1.html"), lazy=True)
+    assert other != part
+
+
+@pytest.mark.parametrize("parser", list(PARSERS))
+def test_lazy_fields(parser):
+    scraper = PARSERS[parser]()
+    part = scraper.parse_part(
+        fixture_response("product-0.html"), lazy=True, fields=["vendors", "specs"]
+    )
+    assert part.reviews is None
+    assert len(part.vendors) == 40
+
+    part.specs = {}
+    assert part.specs == {}
+
+
+def test_loader_runs_once_across_threads():
+    calls = []
+    lock = threading.Lock()
+
+    def load_vendors():
+        with lock:
+            calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return ["vendor"]
+
+    part = LazyPart("name", "type", None, loaders={"vendors": load_vendors})
+    part.add_loader("in_stock", lambda: len(part.vendors) > 0)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: part.vendors, range(16)))
+        stock = list(executor.map(lambda _: part.in_stock, range(16)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert all(stock)
+
+
+def test_failed_loader_is_kept():
+    attempts = []
+
+    def load_specs():
+        attempts.append(None)
+        if len(attempts) == 1:
+            raise ValueError("bad page")
+        return {"Speed": "DDR5-6000"}
+
+    part = LazyPart("name", "type", None, loaders={"specs": load_specs})
+    with pytest.raises(ValueError):
+        part.specs
+    assert part.specs == {"Speed": "DDR5-6000"}
+    assert part == Part(
+        "name", "type", None, None, None, None, specs={"Speed": "DDR5-6000"}
+    )
@@ -0,0 +1,108 @@
+from .helpers import StubAdapter, StubRenderer, TrackingAdapter, read_fixture
+from pypartpicker import AsyncClient, CatalogCheckpoint, Client
+from pypartpicker.replay import Archive
+from itertools import islice
+import asyncio
+import re
+
+LISTING = read_fixture("parts-0.html")
+# The same listing before JavaScript has filled in its rows
+EMPTY_LISTING = re.sub(
+    rb"<tbody>.*</tbody>", b"<tbody></tbody>", LISTING, flags=re.DOTALL
+)
+PAGES = 12
+
+
+def listing_url(page: int) -> str:
+    return f"https://uk.pcpartpicker.com/products/cpu?page={page}"
+
+
+def listing_archive() -> Archive:
+    archive = Archive()
+    for page in range(1, PAGES + 1):
+        archive.add(
+            listing_url(page),
+            200,
+            {"Content-Type": "text/html; charset=utf-8"},
+            LISTING,
+        )
+    return archive
+
+
+def test_get_parts():
+    adapter = StubAdapter([(200, LISTING)])
+    result = Client(adapter=adapter).get_parts("cpu", 2, region="uk")
+    assert adapter.urls == [listing_url(2)]
+    assert len(result.parts) == 5
+    assert result.total_pages == PAGES
+
+
+def test_get_parts_renders_empty_listing():
+    renderer = StubRenderer([LISTING])
+    pcpp = Client(renderer=renderer, adapter=StubAdapter([(200, EMPTY_LISTING)]))
+    assert len(pcpp.get_parts("cpu", region="uk").parts) == 5
+    assert renderer.calls == [listing_url(1)]
+
+    pcpp = Client(no_js=True, adapter=StubAdapter([(200, EMPTY_LISTING)]))
+    assert pcpp.get_parts("cpu", region="uk").parts == []
+
+
+def test_iter_parts():
+    adapter = TrackingAdapter(listing_archive())
+    parts = list(Client(adapter=adapter).iter_parts("cpu", region="uk"))
+    assert len(parts) == PAGES * 5
+    assert sorted(adapter.urls) == sorted(
+        listing_url(page) for page in range(1, PAGES + 1)
+    )
+
+
+def test_crawl_catalog_resumes(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+
+    # Stopping part way through the third page leaves the first two recorded
+    pcpp = Client(adapter=TrackingAdapter(listing_archive()))
+    crawl = pcpp.crawl_catalog(path, ["cpu"], region="uk", prefetch=0)
+    assert len(list(islice(crawl, 11))) == 11
+    crawl.close()
+    assert CatalogCheckpoint(path).get_next_page("cpu") == 3
+
+    adapter = TrackingAdapter(listing_archive())
+    parts = list(Client(adapter=adapter).crawl_catalog(path, ["cpu"], region="uk"))
+    assert len(parts) == (PAGES - 2) * 5
+    assert listing_url(1) not in adapter.urls
+    assert listing_url(2) not in adapter.urls
+    assert CatalogCheckpoint(path).is_done("cpu")
+
+    # A finished category isn't requested again
+    adapter = TrackingAdapter(listing_archive())
+    assert list(Client(adapter=adapter).crawl_catalog(path, ["cpu"], region="uk")) == []
+    assert adapter.urls == []
+
+
+def test_async_crawl_catalog():
+    checkpoint = CatalogCheckpoint()
+    checkpoint.complete_page("cpu", 10, PAGES)
+
+    async def run():
+        async with AsyncClient(adapter=TrackingAdapter(listing_archive())) as pcpp:
+            return [
+                part
+                async for part in pcpp.crawl_catalog(checkpoint, ["cpu"], region="uk")
+            ]
+
+    assert len(asyncio.run(run())) == 2 * 5
+    assert checkpoint.is_done("cpu")
+
+
+def test_checkpoint_reset(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = CatalogCheckpoint(path)
+    checkpoint.complete_page("cpu", 1, 0)
+    checkpoint.complete_page("memory", 1, 3)
+    # A listing without pagination is done after its first page
+    assert checkpoint.is_done("cpu")
+    assert not checkpoint.is_done("memory")
+
+    checkpoint.reset("cpu")
+    assert CatalogCheckpoint(path).get_next_page("cpu") == 1
+    assert CatalogCheckpoint(path).get_next_page("memory") == 2
@@ -0,0 +1,60 @@
+from .helpers import StubAdapter, read_fixture
+from pypartpicker import AsyncClient, Client
+from urllib.parse import parse_qs, urlparse
+import asyncio
+import pytest
+
+PART_URL = "https://uk.pcpartpicker.com/product/Yg3mP6"
+
+
+def pages(adapter: StubAdapter) -> list[int]:
+    return sorted(int(parse_qs(urlparse(url).query)["page"][0]) for url in adapter.urls)
+
+
+def stub(name: str, count: int) -> StubAdapter:
+    return StubAdapter([(200, read_fixture(name))] * count)
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_iter_part_reviews(prefetch):
+    adapter = stub("reviews-0.html", 5)
+    pcpp = Client(adapter=adapter)
+
+    reviews = list(pcpp.iter_part_reviews(PART_URL, prefetch=prefetch))
+    assert len(reviews) == 5 * 20
+    assert pages(adapter) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_iter_part_search(prefetch):
+    adapter = stub("search-0.html", 4)
+    pcpp = Client(adapter=adapter)
+
+    parts = list(pcpp.iter_part_search("corsair", region="uk", prefetch=prefetch))
+    assert len(parts) == 4 * 20
+    assert pages(adapter) == [1, 2, 3, 4]
+
+
+def test_iter_stops_early():
+    adapter = stub("reviews-0.html", 5)
+    pcpp = Client(adapter=adapter)
+
+    for review in pcpp.iter_part_reviews(PART_URL, prefetch=1):
+        break
+    # Only the first page and the one being prefetched were requested
+    assert len(adapter.urls) <= 2
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_async_iter_part_reviews(prefetch):
+    adapter = stub("reviews-0.html", 5)
+
+    async def run():
+        async with AsyncClient(adapter=adapter) as pcpp:
+            return [
+                review
+                async for review in pcpp.iter_part_reviews(PART_URL, prefetch=prefetch)
+            ]
+
+    assert len(asyncio.run(run())) == 5 * 20
+    assert pages(adapter) == [1, 2, 3, 4, 5]
@@ -0,0 +1,109 @@
+from .helpers import StubAdapter, read_fixture
+from pypartpicker import AsyncClient, Client, ParseCache
+from pypartpicker.fingerprint import fingerprint
+from pypartpicker.types import LazyPart
+import asyncio
+import pytest
+
+PART_URL = "https://uk.pcpartpicker.com/product/Yg3mP6"
+
+PAGE = read_fixture("product-0.html")
+# Same data, different per request noise
+NOISY_PAGE = PAGE.replace(
+    b'<body class="product">',
+    b'<body class="product"><script nonce="abc">track()</script>',
+    1,
+)
+# The first vendor's base price goes up
+CHANGED_PAGE = PAGE.replace(b">\xc2\xa3100.99<", b">\xc2\xa3101.99<", 1)
+
+
+def test_fingerprint_ignores_noise():
+    assert fingerprint(PAGE) == fingerprint(NOISY_PAGE)
+    assert fingerprint(PAGE) != fingerprint(CHANGED_PAGE)
+
+
+def test_cache_eviction():
+    cache = ParseCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set((key,), key, key)
+    assert len(cache) == 2
+    assert cache.get(("a",), "a") is None
+    assert cache.get(("c",), "c").result == "c"
+    assert cache.get(("c",), "other") is None
+
+
+def test_get_part_if_changed():
+    adapter = StubAdapter([(200, page) for page in (PAGE, NOISY_PAGE, CHANGED_PAGE)])
+    events = []
+    pcpp = Client(
+        adapter=adapter,
+        parse_cache=ParseCache(),
+        event_hooks=[events.append],
+    )
+
+    assert pcpp.get_part_if_changed(PART_URL) is not None
+    assert pcpp.get_part_if_changed(PART_URL) is None
+    part = pcpp.get_part_if_changed(PART_URL)
+    assert part is not None
+    assert [e.data["changed"] for e in events if e.name == "parse"] == [
+        True,
+        False,
+        True,
+    ]
+
+    with pytest.raises(ValueError):
+        Client().get_part_if_changed(PART_URL)
+
+
+def test_reused_results_are_copies():
+    adapter = StubAdapter([(200, PAGE)] * 3)
+    pcpp = Client(adapter=adapter, parse_cache=ParseCache())
+
+    first = pcpp.get_part(PART_URL)
+    first.vendors.clear()
+    first.specs["Speed"] = "changed"
+
+    second = pcpp.get_part(PART_URL)
+    assert len(second.vendors) == 40
+    assert second.specs["Speed"] != "changed"
+    assert pcpp.get_part(PART_URL) is not second
+
+
+def test_lazy_results():
+    adapter = StubAdapter([(200, PAGE)] * 3)
+    pcpp = Client(adapter=adapter, parse_cache=ParseCache())
+
+    # Caching a lazy part mustn't run its loaders, and hits are still lazy
+    first = pcpp.get_part_if_changed(PART_URL, lazy=True)
+    assert isinstance(first, LazyPart)
+    assert len(first._loaders) > 0
+
+    assert pcpp.get_part_if_changed(PART_URL, lazy=True) is None
+    second = pcpp.get_part(PART_URL, lazy=True)
+    assert isinstance(second, LazyPart)
+    assert len(second._loaders) > 0
+    assert second == first
+
+
+def test_async_lazy_results():
+    async def run():
+        adapter = StubAdapter([(200, PAGE), (200, PAGE)])
+        async with AsyncClient(adapter=adapter, parse_cache=ParseCache()) as pcpp:
+            first = await pcpp.get_part_if_changed(PART_URL, lazy=True)
+            assert len(first._loaders) > 0
+            assert await pcpp.get_part_if_changed(PART_URL, lazy=True) is None
+
+    asyncio.run(run())
+
+
+def test_async_get_part_if_changed():
+    async def run():
+        adapter = StubAdapter([(200, PAGE), (200, PAGE), (200, CHANGED_PAGE)])
+        async with AsyncClient(adapter=adapter, parse_cache=ParseCache()) as pcpp:
+            first = await pcpp.get_part_if_changed(PART_URL)
+            assert first is not None
+            assert await pcpp.get_part_if_changed(PART_URL) is None
+            assert await pcpp.get_part_if_changed(PART_URL) != first
+
+    asyncio.run(run())
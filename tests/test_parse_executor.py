@@ -0,0 +1,40 @@
+from .helpers import fixture_response, product_archive, read_fixture
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pypartpicker import AsyncClient, ReplayAdapter
+from pypartpicker.parsers import PARSERS, parse_raw
+import asyncio
+import pytest
+
+IDS = ["aaaaa1", "aaaaa2"]
+
+
+@pytest.mark.parametrize("parser", list(PARSERS))
+@pytest.mark.parametrize(
+    "name, method",
+    [("product-0.html", "parse_part"), ("search-0.html", "parse_part_search")],
+)
+def test_parse_raw_matches_scraper(parser, name, method):
+    res = fixture_response(name)
+    expected = getattr(PARSERS[parser](), method)(fixture_response(name))
+    result = parse_raw(parser, method, res.url, read_fixture(name), "utf-8")
+    assert result.to_dict() == expected.to_dict()
+
+
+@pytest.mark.parametrize("executor", [ThreadPoolExecutor, ProcessPoolExecutor])
+@pytest.mark.parametrize("parser", list(PARSERS))
+def test_parse_executor(executor, parser):
+    archive = product_archive(IDS)
+
+    async def run(parse_executor):
+        async with AsyncClient(
+            parser=parser,
+            adapter=ReplayAdapter(archive),
+            parse_executor=parse_executor,
+        ) as pcpp:
+            return await pcpp.get_parts_many(IDS, region="uk")
+
+    inline = asyncio.run(run(None))
+    with executor(max_workers=2) as parse_executor:
+        offloaded = asyncio.run(run(parse_executor))
+
+    assert [part.to_dict() for part in offloaded] == [part.to_dict() for part in inline]
@@ -0,0 +1,121 @@
+from .helpers import fixture_response, load_index
+from pypartpicker.lxml_scraper import LxmlScraper
+from pypartpicker.parsers import PARSERS
+from pypartpicker.scraper import Scraper
+import pytest
+
+PARSE_METHODS = {
+    "product": "parse_part",
+    "part_list": "parse_part_list",
+    "search": "parse_part_search",
+    "reviews": "parse_reviews",
+    "parts": "parse_parts",
+}
+
+
+def parse(parser: str, name: str):
+    scraper = PARSERS[parser]()
+    method = PARSE_METHODS[load_index()[name]["kind"]]
+    return getattr(scraper, method)(fixture_response(name))
+
+
+@pytest.mark.parametrize("name", sorted(load_index()))
+def test_parsers_agree(name):
+    results = [parse(parser, name).to_dict() for parser in PARSERS]
+    for result in results[1:]:
+        assert result == results[0]
+
+
+@pytest.mark.parametrize("parser", list(PARSERS))
+def test_parse_part(parser):
+    part = parse(parser, "product-0.html")
+    assert part.name == "Corsair Vengeance 32 GB (2 x 16 GB) DDR5-6000 CL36 Memory"
+    assert part.type == "Memory"
+    assert part.rating.stars == 4.5
+    assert part.rating.count == 120
+    assert part.rating.average == 4.6
+    assert len(part.vendors) == 40
+    assert len(part.reviews) == 30
+    assert len(part.image_urls) == 4
+    assert part.in_stock
+    assert part.cheapest_price.total == min(
+        vendor.price.total for vendor in part.vendors if vendor.in_stock
+    )
+
+    part = parse(parser, "product-1.html")
+    assert part.type == "CPU Cooler"
+    assert part.rating is None
+    assert part.reviews == []
+    assert len(part.image_urls) == 1
+    assert [vendor.price.total for vendor in part.vendors] == [95.99, 108.98, 111.98]
+
+
+@pytest.mark.parametrize("parser", list(PARSERS))
+def test_parse_reviews(parser):
+    result = parse(parser, "reviews-0.html")
+    assert len(result.reviews) == 20
+    assert (result.page, result.total_pages) == (2, 5)
+
+    review = result.reviews[0]
+    assert review.author.username == "builder0"
+    assert review.author.profile_url == "https://uk.pcpartpicker.com/user/builder0/"
+    assert review.build_url == "https://uk.pcpartpicker.com/b/Xy0000"
+
+
+@pytest.mark.parametrize("parser", list(PARSERS))
+def test_parse_part_search(parser):
+    result = parse(parser, "search-0.html")
+    assert len(result.parts) == 20
+    assert (result.page, result.total_pages) == (1, 4)
+    assert result.parts[0].url.startswith("https://uk.pcpartpicker.com/product/")
+    assert result.parts[5].cheapest_price is None
+    assert not result.parts[5].in_stock
+
+
+@pytest.mark.parametrize("parser", list(PARSERS))
+def test_parse_parts(parser):
+    result = parse(parser, "parts-0.html")
+    assert len(result.parts) == 5
+    assert all(part.type == "CPU" for part in result.parts)
+    assert all(len(part.specs) > 0 for part in result.parts)
+    assert sum(part.cheapest_price is None for part in result.parts) == 1
+
+
+@pytest.mark.parametrize("parser", list(PARSERS))
+def test_parse_part_list(parser):
+    result = parse(parser, "part_list-0.html")
+    assert len(result.parts) == 8
+    assert result.parts[0].cheapest_price.total == 439.99
+    assert result.parts[5].cheapest_price is None
+    assert result.parts[-1].name == "Custom cable kit"
+    assert result.parts[-1].url is None
+
+
+@pytest.mark.parametrize("scraper", [Scraper, LxmlScraper])
+def test_page_checks(scraper):
+    res = fixture_response("product-0.html")
+    assert not scraper().is_cloudflare(res)
+    assert not scraper().is_rate_limit(res)
+
+
+@pytest.mark.parametrize("parser", list(PARSERS))
+@pytest.mark.parametrize("name", ["product-0.html", "product-1.html"])
+def test_prices_fields_match_full_parse(parser, name):
+    fields = ["rating", "vendors", "cheapest_price", "in_stock"]
+    scraper = PARSERS[parser]()
+    full = scraper.parse_part(fixture_response(name))
+    part = scraper.parse_part(fixture_response(name), fields=fields)
+
+    for field in fields + ["name", "type", "url"]:
+        assert getattr(part, field) == getattr(full, field)
+    assert part.specs is None
+    assert part.reviews is None
+
+
+@pytest.mark.parametrize("parser", list(PARSERS))
+def test_prices_fields_skip_rest_of_page(parser):
+    scraper = PARSERS[parser]()
+    res = fixture_response("product-0.html")
+    root = scraper.get_part_root(res, frozenset(["vendors"]))
+    assert scraper.find(root, ".partReviews") is None
+    assert scraper.find(root, "#prices") is not None
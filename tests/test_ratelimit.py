@@ -0,0 +1,75 @@
+from pypartpicker import RateLimiter
+import asyncio
+import sqlite3
+import threading
+import time
+
+HOST = "pcpartpicker.com"
+
+
+def timed(fn) -> float:
+    start = time.monotonic()
+    fn()
+    return time.monotonic() - start
+
+
+def test_burst_then_rate():
+    limiter = RateLimiter(rate=20, burst=2)
+    assert timed(lambda: limiter.acquire(HOST)) < 0.02
+    assert timed(lambda: limiter.acquire(HOST)) < 0.02
+    assert timed(lambda: limiter.acquire(HOST)) > 0.03
+
+
+def test_aimd():
+    limiter = RateLimiter(rate=1, min_rate=0.3, increase=0.1)
+    assert limiter.penalize(HOST) == 0.5
+    assert limiter.penalize(HOST) == 0.3
+    assert round(limiter.reward(HOST), 2) == 0.4
+    for _ in range(10):
+        limiter.reward(HOST)
+    assert limiter.get_rate(HOST) == 1
+
+    # Hosts have their own buckets
+    assert limiter.get_rate("uk.pcpartpicker.com") == 1
+
+
+def test_shared_buckets(tmp_path):
+    path = str(tmp_path / "rate.db")
+    first = RateLimiter(rate=1, path=path)
+    second = RateLimiter(rate=1, path=path)
+
+    first.penalize(HOST)
+    assert second.get_rate(HOST) == 0.5
+    first.close()
+    second.close()
+
+
+def test_async_shared_update_does_not_block_loop(tmp_path):
+    path = str(tmp_path / "rate.db")
+    limiter = RateLimiter(rate=10, path=path)
+    limiter.get_rate(HOST)
+
+    # Another process holding the write lock for a while
+    other = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.2, lambda: other.execute("COMMIT")).start()
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.ensure_future(tick())
+        await limiter.aacquire(HOST)
+        assert await limiter.apenalize(HOST) == 5
+        assert round(await limiter.areward(HOST), 2) == 5.05
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(run()) > 5
+    other.close()
+    limiter.close()
@@ -0,0 +1,64 @@
+from .helpers import TrackingAdapter, product_archive, read_fixture
+from pypartpicker import AsyncClient, Client
+import asyncio
+import time
+
+ID = "Yg3mP6"
+REGIONS = ["uk", "ca", "au"]
+
+
+def archive():
+    # au is left out of the archive, so its request fails
+    archive = product_archive([ID], "uk")
+    archive.add(
+        f"https://ca.pcpartpicker.com/product/{ID}",
+        200,
+        {"Content-Type": "text/html; charset=utf-8"},
+        read_fixture("product-1.html"),
+    )
+    return archive
+
+
+def check_results(results: dict):
+    assert list(results) == REGIONS
+    assert results["uk"].url == f"https://uk.pcpartpicker.com/product/{ID}"
+    assert results["ca"].url == f"https://ca.pcpartpicker.com/product/{ID}"
+    assert isinstance(results["au"], LookupError)
+
+    # Only the prices section is parsed
+    assert len(results["uk"].vendors) == 40
+    assert results["uk"].reviews is None
+    assert results["ca"].cheapest_price.total == 108.98
+
+
+def test_get_part_all_regions():
+    pcpp = Client(adapter=TrackingAdapter(archive()))
+    check_results(pcpp.get_part_all_regions(ID, regions=REGIONS))
+
+
+def test_async_get_part_all_regions():
+    async def run():
+        async with AsyncClient(adapter=TrackingAdapter(archive())) as pcpp:
+            return await pcpp.get_part_all_regions(ID, regions=REGIONS)
+
+    check_results(asyncio.run(run()))
+
+
+def test_deadline():
+    pcpp = Client(adapter=TrackingAdapter(archive(), latency=1))
+    start = time.perf_counter()
+    results = pcpp.get_part_all_regions(ID, regions=REGIONS, deadline=0.1)
+    assert time.perf_counter() - start < 0.9
+    assert all(isinstance(result, TimeoutError) for result in results.values())
+
+
+def test_async_deadline():
+    async def run():
+        async with AsyncClient(adapter=TrackingAdapter(archive(), latency=1)) as pcpp:
+            start = time.perf_counter()
+            results = await pcpp.get_part_all_regions(ID, regions=REGIONS, deadline=0.1)
+            assert time.perf_counter() - start < 0.9
+            return results
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, TimeoutError) for result in results.values())
@@ -0,0 +1,109 @@
+from .helpers import RENDERER_USER_AGENT, StubAdapter, StubRenderer, read_fixture
+from pypartpicker import AsyncClient, Client, CloudflareException, Renderer
+from pypartpicker.replay import CLOUDFLARE_PAGE
+import asyncio
+import pyppeteer
+import pytest
+
+PART_URL = "https://uk.pcpartpicker.com/product/Yg3mP6"
+
+
+def test_renderer_solves_challenge():
+    renderer = StubRenderer([read_fixture("product-0.html")])
+    pcpp = Client(renderer=renderer, adapter=StubAdapter([(200, CLOUDFLARE_PAGE)]))
+
+    assert pcpp.get_part(PART_URL).type == "Memory"
+    assert renderer.calls == [PART_URL]
+
+
+def test_renderer_still_challenged():
+    renderer = StubRenderer([CLOUDFLARE_PAGE, CLOUDFLARE_PAGE])
+    adapter = StubAdapter([(200, CLOUDFLARE_PAGE), (200, CLOUDFLARE_PAGE)])
+    pcpp = Client(renderer=renderer, max_retries=2, adapter=adapter)
+
+    with pytest.raises(CloudflareException):
+        pcpp.get_part(PART_URL)
+    assert len(renderer.calls) == 2
+
+
+def test_async_renderer_solves_challenge():
+    renderer = StubRenderer([read_fixture("product-1.html")])
+
+    async def run():
+        async with AsyncClient(
+            renderer=renderer, adapter=StubAdapter([(200, CLOUDFLARE_PAGE)])
+        ) as pcpp:
+            return await pcpp.get_part(PART_URL)
+
+    assert asyncio.run(run()).type == "CPU Cooler"
+    assert renderer.calls == [PART_URL]
+
+
+def test_close_before_use():
+    # Closing a renderer that never launched a browser is a no-op
+    with Renderer() as renderer:
+        pass
+    renderer.close()
+
+
+class FakePage:
+    async def setCookie(self, *cookies):
+        pass
+
+    async def goto(self, url, options=None):
+        await asyncio.sleep(0.01)
+
+    async def waitForFunction(self, expression, options=None):
+        pass
+
+    async def content(self) -> str:
+        return "<html></html>"
+
+    async def cookies(self) -> list[dict]:
+        return []
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closes = 0
+
+    async def newPage(self) -> FakePage:
+        return FakePage()
+
+    async def userAgent(self) -> str:
+        return RENDERER_USER_AGENT
+
+    async def close(self):
+        self.closes += 1
+
+
+def test_concurrent_first_renders_launch_one_browser(monkeypatch):
+    browsers = []
+
+    async def launch(**options):
+        # Slow enough that every first render is waiting on the launch
+        await asyncio.sleep(0.05)
+        browsers.append(FakeBrowser())
+        return browsers[-1]
+
+    monkeypatch.setattr(pyppeteer, "launch", launch)
+
+    async def run(renderer):
+        return await asyncio.gather(
+            *(renderer.arender(f"{PART_URL}?{i}") for i in range(4))
+        )
+
+    renderer = Renderer(max_pages=4)
+    assert len(asyncio.run(run(renderer))) == 4
+    renderer.close()
+
+    assert len(browsers) == 1
+    assert browsers[0].closes == 1
+
+    # A closed renderer launches a new browser on its next render
+    assert len(asyncio.run(run(renderer))) == 4
+    renderer.close()
+    assert [browser.closes for browser in browsers] == [1, 1]
@@ -0,0 +1,77 @@
+from .helpers import read_fixture
+from pypartpicker import (
+    Archive,
+    AsyncClient,
+    AsyncReplayRetriever,
+    Client,
+    ReplayAdapter,
+    ReplayRetriever,
+    ReplayServer,
+)
+from pypartpicker.errors import RateLimitException
+import asyncio
+import pytest
+
+PART_URL = "https://uk.pcpartpicker.com/product/Yg3mP6"
+MISSING_URL = "https://uk.pcpartpicker.com/product/zzzzzz"
+
+
+def archive(path=None) -> Archive:
+    archive = Archive(path)
+    archive.add(
+        PART_URL,
+        200,
+        {"Content-Type": "text/html; charset=utf-8", "Content-Encoding": "gzip"},
+        read_fixture("product-0.html"),
+    )
+    return archive
+
+
+def test_archive_file(tmp_path):
+    path = str(tmp_path / "traffic.jsonl.gz")
+    archive(path).add(PART_URL, 200, {}, b"re-recorded")
+
+    loaded = Archive(path)
+    assert loaded.urls() == [PART_URL]
+    assert loaded.get(PART_URL).content == b"re-recorded"
+
+
+def test_archive_drops_transfer_headers():
+    assert "Content-Encoding" not in archive().get(PART_URL).headers
+
+
+def test_replay_adapter():
+    pcpp = Client(adapter=ReplayAdapter(archive()))
+    assert pcpp.get_part(PART_URL).type == "Memory"
+
+    with pytest.raises(LookupError, match=MISSING_URL):
+        pcpp.get_part(MISSING_URL)
+
+
+def test_replay_retriever():
+    pcpp = Client(response_retriever=ReplayRetriever(archive()))
+    assert pcpp.get_part(PART_URL).type == "Memory"
+
+    with pytest.raises(LookupError, match=MISSING_URL):
+        pcpp.get_part(MISSING_URL)
+
+
+def test_async_replay_retriever():
+    async def run():
+        pcpp = AsyncClient(response_retriever=AsyncReplayRetriever(archive()))
+        assert (await pcpp.get_part(PART_URL)).type == "Memory"
+        with pytest.raises(LookupError, match=MISSING_URL):
+            await pcpp.get_part(MISSING_URL)
+
+    asyncio.run(run())
+
+
+def test_replay_server():
+    with ReplayServer(archive()) as server:
+        pcpp = Client(adapter=server.adapter())
+        assert pcpp.get_part(PART_URL).type == "Memory"
+
+    with ReplayServer(archive(), rate_limit_rate=1) as server:
+        pcpp = Client(adapter=server.adapter())
+        with pytest.raises(RateLimitException):
+            pcpp.get_part(PART_URL)
@@ -0,0 +1,139 @@
+from .helpers import StubAdapter, read_fixture
+from pypartpicker import (
+    AsyncClient,
+    CircuitBreaker,
+    CircuitOpenException,
+    Client,
+    CloudflareException,
+    RateLimitException,
+    RetryPolicy,
+    RetryRule,
+    ServerErrorException,
+)
+from pypartpicker.replay import CLOUDFLARE_PAGE, RATE_LIMIT_PAGE
+from requests.exceptions import ConnectionError
+import asyncio
+import pytest
+
+PART_URL = "https://uk.pcpartpicker.com/product/Yg3mP6"
+
+PRODUCT = (200, read_fixture("product-0.html"))
+CLOUDFLARE = (200, CLOUDFLARE_PAGE)
+RATE_LIMIT = (200, RATE_LIMIT_PAGE)
+SERVER_ERROR = (503, b"<html><head><title>Service Unavailable</title></head></html>")
+
+
+def policy(attempts: int = 3) -> RetryPolicy:
+    rule = RetryRule(attempts, delay=0)
+    return RetryPolicy(
+        cloudflare=rule, rate_limit=rule, server_error=rule, timeout=rule
+    )
+
+
+def test_no_js_challenge_is_retried():
+    adapter = StubAdapter([CLOUDFLARE, CLOUDFLARE, PRODUCT])
+    pcpp = Client(no_js=True, max_retries=3, adapter=adapter)
+    assert pcpp.get_part(PART_URL).type == "Memory"
+    assert len(adapter.urls) == 3
+
+    adapter = StubAdapter([CLOUDFLARE, CLOUDFLARE])
+    pcpp = Client(no_js=True, max_retries=2, adapter=adapter)
+    with pytest.raises(CloudflareException):
+        pcpp.get_part(PART_URL)
+    assert len(adapter.urls) == 2
+
+
+def test_no_js_challenge_opens_circuit():
+    adapter = StubAdapter([CLOUDFLARE] * 4)
+    pcpp = Client(
+        no_js=True,
+        adapter=adapter,
+        retry_policy=policy(2),
+        circuit_breaker=CircuitBreaker(failure_threshold=4),
+    )
+    for _ in range(2):
+        with pytest.raises(CloudflareException):
+            pcpp.get_part(PART_URL)
+
+    with pytest.raises(CircuitOpenException):
+        pcpp.get_part(PART_URL)
+    assert len(adapter.urls) == 4
+
+
+def test_server_error_raises_after_retries():
+    adapter = StubAdapter([SERVER_ERROR] * 3)
+    pcpp = Client(adapter=adapter, retry_policy=policy(3))
+    with pytest.raises(ServerErrorException):
+        pcpp.get_part(PART_URL)
+    assert len(adapter.urls) == 3
+
+    # The default policy doesn't retry server errors
+    adapter = StubAdapter([SERVER_ERROR])
+    with pytest.raises(ServerErrorException):
+        Client(adapter=adapter).get_part(PART_URL)
+
+
+def test_timeouts_reraise():
+    adapter = StubAdapter([ConnectionError("reset"), ConnectionError("reset")])
+    pcpp = Client(adapter=adapter, retry_policy=policy(2))
+    with pytest.raises(ConnectionError):
+        pcpp.get_part(PART_URL)
+    assert len(adapter.urls) == 2
+
+
+def test_attempts_are_counted_per_error():
+    responses = [SERVER_ERROR, RATE_LIMIT, SERVER_ERROR, RATE_LIMIT, PRODUCT]
+    adapter = StubAdapter(responses)
+    pcpp = Client(adapter=adapter, retry_policy=policy(3))
+    assert pcpp.get_part(PART_URL).type == "Memory"
+    assert len(adapter.urls) == 5
+
+    adapter = StubAdapter([RATE_LIMIT, SERVER_ERROR, RATE_LIMIT, RATE_LIMIT])
+    pcpp = Client(adapter=adapter, retry_policy=policy(3))
+    with pytest.raises(RateLimitException):
+        pcpp.get_part(PART_URL)
+    assert len(adapter.urls) == 4
+
+
+def test_async_client():
+    async def run():
+        adapter = StubAdapter([CLOUDFLARE, SERVER_ERROR, CLOUDFLARE, PRODUCT])
+        async with AsyncClient(
+            no_js=True, adapter=adapter, retry_policy=policy(3)
+        ) as pcpp:
+            assert (await pcpp.get_part(PART_URL)).type == "Memory"
+        assert len(adapter.urls) == 4
+
+        adapter = StubAdapter([SERVER_ERROR] * 2)
+        async with AsyncClient(adapter=adapter, retry_policy=policy(2)) as pcpp:
+            with pytest.raises(ServerErrorException):
+                await pcpp.get_part(PART_URL)
+
+        adapter = StubAdapter([CLOUDFLARE] * 2)
+        async with AsyncClient(
+            no_js=True,
+            adapter=adapter,
+            retry_policy=policy(1),
+            circuit_breaker=CircuitBreaker(failure_threshold=2),
+        ) as pcpp:
+            for _ in range(2):
+                with pytest.raises(CloudflareException):
+                    await pcpp.get_part(PART_URL)
+            with pytest.raises(CircuitOpenException):
+                await pcpp.get_part(PART_URL)
+
+    asyncio.run(run())
+
+
+def test_star_import_exports():
+    names = {}
+    exec("from pypartpicker import *", names)
+    for name in ("ConnectionError", "Timeout", "random", "time", "asyncio"):
+        assert name not in names
+    for name in (
+        "Client",
+        "AsyncClient",
+        "CloudflareException",
+        "ServerErrorException",
+    ):
+        assert name in names
@@ -0,0 +1,84 @@
+from .helpers import StubAdapter, fixture_response, read_fixture
+from pypartpicker import Client, SearchIndex
+from pypartpicker.scraper import Scraper
+from pypartpicker.search import trigrams
+from pypartpicker.types import Part
+import dataclasses
+
+CORSAIR_URLS = [
+    "https://uk.pcpartpicker.com/product/s0002x/",
+    "https://uk.pcpartpicker.com/product/s0004x/",
+    "https://uk.pcpartpicker.com/product/s0018x/",
+]
+
+
+def search_parts() -> list[Part]:
+    return Scraper().parse_part_search(fixture_response("search-0.html")).parts
+
+
+def index(**kwargs) -> SearchIndex:
+    index = SearchIndex(region="uk", **kwargs)
+    assert index.add_all(search_parts()) == 20
+    return index
+
+
+def test_search():
+    result = index().search("Corsair")
+    assert sorted(part.url for part in result.parts) == CORSAIR_URLS
+    assert (result.page, result.total_pages) == (1, 1)
+
+    # Shorter names rank first
+    lengths = [len(trigrams(part.name)) for part in result.parts]
+    assert lengths == sorted(lengths)
+
+
+def test_prefix_and_typos():
+    search_index = index()
+    assert [part.url for part in search_index.search("corsair veng").parts] == [
+        CORSAIR_URLS[0]
+    ]
+    assert search_index.search("corsiar vengance").parts[0].url == CORSAIR_URLS[0]
+    assert search_index.search("zzzzzz").parts == []
+    assert search_index.search("--").total_pages == 0
+
+
+def test_pages():
+    search_index = index(page_size=2)
+    first = search_index.search("corsair")
+    second = search_index.search("corsair", page=2)
+    assert (first.total_pages, len(first.parts), len(second.parts)) == (2, 2, 1)
+    assert sorted(part.url for part in first.parts + second.parts) == CORSAIR_URLS
+
+
+def test_replace_renamed_part():
+    search_index = index()
+    part = search_index.search("vengeance").parts[0]
+    search_index.add(dataclasses.replace(part, name="Corsair Dominator 32 GB"))
+
+    assert len(search_index) == 20
+    assert search_index.search("vengeance").parts == []
+    assert search_index.search("dominator").parts[0].url == part.url
+
+
+def test_results_are_copies():
+    search_index = index()
+    search_index.search("corsair").parts.clear()
+    assert len(search_index.search("corsair").parts) == 3
+
+
+def test_client_falls_back_to_live_search():
+    search_index = SearchIndex(region="uk")
+    adapter = StubAdapter([(200, read_fixture("search-0.html"))] * 2)
+    pcpp = Client(search_index=search_index, adapter=adapter)
+
+    # Misses go to the live search, whose results are indexed
+    assert len(pcpp.get_part_search("corsair", region="uk").parts) == 20
+    assert len(search_index) == 20
+
+    result = pcpp.get_part_search("corsair", region="uk")
+    assert len(result.parts) == 3
+    assert len(adapter.urls) == 1
+
+    # Other regions aren't answered from the index
+    pcpp.get_part_search("corsair", region="us")
+    assert len(adapter.urls) == 2
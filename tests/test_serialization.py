@@ -0,0 +1,87 @@
+from .helpers import fixture_response
+from pypartpicker import dumps, loads, ResultReader, ResultWriter
+from pypartpicker.scraper import Scraper
+from pypartpicker.types import Part, PartList, PartSearchResult
+import pytest
+
+scraper = Scraper()
+
+
+def listing_parts() -> list[Part]:
+    return scraper.parse_parts(fixture_response("parts-0.html")).parts
+
+
+def search_parts() -> list[Part]:
+    return scraper.parse_part_search(fixture_response("search-0.html")).parts
+
+
+def product_parts() -> list[Part]:
+    return [
+        scraper.parse_part(fixture_response("product-0.html")),
+        scraper.parse_part(fixture_response("product-1.html")),
+    ]
+
+
+@pytest.fixture(params=["json", "msgpack"])
+def format(request):
+    if request.param == "msgpack":
+        pytest.importorskip("msgpack")
+    return request.param
+
+
+@pytest.mark.parametrize("parts", [listing_parts, search_parts, product_parts])
+@pytest.mark.parametrize("omit_none", [False, True])
+def test_part_round_trip(parts, omit_none, format):
+    for part in parts():
+        data = dumps(part, format=format, omit_none=omit_none)
+        assert loads(data, format=format) == part
+
+
+def test_listing_rating_without_average(format):
+    part = listing_parts()[0]
+    assert part.rating.average is None
+
+    data = dumps(part, format=format, omit_none=True)
+    assert loads(data, format=format).rating == part.rating
+
+
+def test_search_part_without_type(format):
+    part = search_parts()[0]
+    assert part.type is None
+
+    data = dumps(part, format=format, omit_none=True)
+    assert loads(data, format=format).type is None
+
+
+@pytest.mark.parametrize("omit_none", [False, True])
+def test_result_round_trip(omit_none, format):
+    result = scraper.parse_part_search(fixture_response("search-0.html"))
+    data = dumps(result, format=format, omit_none=omit_none)
+    loaded = loads(data, cls=PartSearchResult, format=format)
+    assert loaded.to_dict() == result.to_dict()
+
+    part_list = scraper.parse_part_list(fixture_response("part_list-0.html"))
+    data = dumps(part_list, format=format, omit_none=omit_none)
+    loaded = loads(data, cls=PartList, format=format)
+    assert loaded.parts == part_list.parts
+
+
+def test_exclude(format):
+    part = product_parts()[0]
+    data = dumps(part, format=format, exclude=["reviews", "vendors"])
+    loaded = loads(data, format=format)
+    assert loaded.reviews is None
+    assert loaded.vendors is None
+    assert loaded.specs == part.specs
+
+    with pytest.raises(ValueError):
+        dumps(part, format=format, exclude=["name"])
+
+
+def test_result_files(tmp_path, format):
+    parts = listing_parts() + search_parts()
+    path = str(tmp_path / "parts.gz")
+    with ResultWriter(path, format=format, omit_none=True) as writer:
+        assert writer.write_all(parts) == len(parts)
+
+    assert list(ResultReader(path, format=format)) == parts
@@ -0,0 +1,60 @@
+from .helpers import fixture_response
+from pypartpicker.scraper import Scraper
+from pypartpicker.types import Part, PartList, Price, Rating, Review, User, Vendor
+import dataclasses
+import pickle
+import pytest
+
+scraper = Scraper()
+
+
+def product() -> Part:
+    return scraper.parse_part(fixture_response("product-0.html"))
+
+
+@pytest.mark.parametrize("cls", [Price, Vendor, Rating, User, Review, Part])
+def test_slotted(cls):
+    assert "__dict__" not in cls.__slots__
+
+
+def test_no_instance_dict():
+    part = product()
+    for value in [
+        part,
+        part.vendors[0],
+        part.vendors[0].price,
+        part.rating,
+        part.reviews[0],
+    ]:
+        assert not hasattr(value, "__dict__")
+
+
+def test_frozen_values():
+    vendor = product().vendors[0]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        vendor.price.total = 0
+
+    # Equal values hash the same, so they can be deduplicated in sets
+    copy = Vendor.from_dict(vendor.to_dict())
+    assert copy == vendor
+    assert len({copy, vendor}) == 1
+
+
+def test_part_equality():
+    part = product()
+    other = Part.from_dict(part.to_dict())
+    assert other == part
+
+    other.name = "Renamed"
+    assert other != part
+    with pytest.raises(TypeError):
+        hash(part)
+
+
+def test_round_trips():
+    part = product()
+    assert pickle.loads(pickle.dumps(part)) == part
+    assert Part.from_dict(part.to_dict()).to_dict() == part.to_dict()
+
+    part_list = scraper.parse_part_list(fixture_response("part_list-0.html"))
+    assert PartList.from_dict(part_list.to_dict()).parts == part_list.parts